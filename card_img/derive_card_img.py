@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+import mirror_card_img
+
+# ./img/ 의 원본 카드 이미지로 클라이언트용 이미지를 만든다
+# - 썸네일 : THUMB_SIZE 고정 크기 WebP, ./img_thumb/{category}/{year}/{ver}/{이름}.webp
+# - WebP : 원본 크기 WebP, ./img_webp/{category}/{year}/{ver}/{이름}.webp
+# - 세트 아틀라스 : card_data_product/{type}/{series}/{code}.json 의 카드 순서대로 썸네일을 한장에 모은 것
+#   ./img_atlas/{type}/{series}/{code}.webp 와 칸 위치를 적은 {code}.json
+# 변환은 프로세스 풀에서 돌린다
+# MANIFEST_FILE 에 원본의 크기/수정시각/sha256 과 아틀라스 구성을 기록해두고,
+# 새로 생기거나 바뀐 원본, 구성이 바뀐 아틀라스만 다시 만든다
+
+IMG_ROOT = mirror_card_img.IMG_ROOT
+CARD_DATA_ROOT = mirror_card_img.CARD_DATA_ROOT
+THUMB_ROOT = './img_thumb/'
+WEBP_ROOT = './img_webp/'
+ATLAS_ROOT = './img_atlas/'
+MANIFEST_FILE = './img_derived.json'
+
+# 카드 비율 (63:88)
+THUMB_SIZE = (200, 279)
+WEBP_QUALITY = 85
+THUMB_QUALITY = 75
+ATLAS_COLUMNS = 10
+IMG_EXTS = ('.jpg', '.jpeg', '.png')
+# None 이면 os.cpu_count()
+MAX_WORKERS = None
+
+def find_source_images(img_root):
+    sources = []
+    for root, dirs, files in os.walk(img_root):
+        for file in files:
+            if file.lower().endswith(IMG_EXTS):
+                sources.append(os.path.join(root, file).replace(os.sep, '/'))
+    return sorted(sources)
+
+def derived_path(src, img_root, out_root):
+    rel_path = os.path.relpath(src, img_root).replace(os.sep, '/')
+    return out_root + os.path.splitext(rel_path)[0] + '.webp'
+
+def load_rgb(path):
+    img = Image.open(path)
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+    return img
+
+def save_webp(img, path, quality):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.' + str(os.getpid()) + '.tmp'
+    img.save(tmp_path, 'WEBP', quality=quality, method=6)
+    os.replace(tmp_path, path)
+
+# 프로세스 풀에서 돈다
+def make_derivatives(args):
+    src, thumb_path, webp_path = args
+    try:
+        img = load_rgb(src)
+        save_webp(img, webp_path, WEBP_QUALITY)
+        save_webp(img.resize(THUMB_SIZE, Image.LANCZOS), thumb_path, THUMB_QUALITY)
+    except Exception as e:
+        return src, f'{type(e).__name__}: {e}'
+    return src, None
+
+# 프로세스 풀에서 돈다. cells : [(card id, 썸네일 경로)], 썸네일이 없는 칸은 비워둔다
+# 실패해도 예외를 올리지 않고 (아틀라스 경로, 에러) 로 돌려준다. 한 세트가 깨져도 나머지 아틀라스는 만든다
+def make_atlas(args):
+    atlas_path, cells = args
+    try:
+        rows = (len(cells) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS
+        width, height = THUMB_SIZE
+        atlas = Image.new('RGBA', (width * min(len(cells), ATLAS_COLUMNS), height * rows), (0, 0, 0, 0))
+
+        index = []
+        for i, (card_id, thumb_path) in enumerate(cells):
+            x = (i % ATLAS_COLUMNS) * width
+            y = (i // ATLAS_COLUMNS) * height
+            # 썸네일을 실제로 붙인 칸만 채워진 칸이다. 경로가 있어도 파일이 안 만들어졌으면 빈 칸
+            # 열리지 않는 썸네일은 아틀라스째 실패시켜 다음에 다시 만든다
+            pasted = False
+            if thumb_path and os.path.exists(thumb_path):
+                with Image.open(thumb_path) as thumb:
+                    atlas.paste(thumb.convert('RGBA'), (x, y))
+                pasted = True
+            index.append({'id' : card_id, 'x' : x, 'y' : y, 'w' : width, 'h' : height, 'empty' : not pasted})
+
+        save_webp(atlas, atlas_path, THUMB_QUALITY)
+        with open(os.path.splitext(atlas_path)[0] + '.json', 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=4)
+    except Exception as e:
+        return atlas_path, f'{type(e).__name__}: {e}'
+    return atlas_path, None
+
+def hash_text(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class DerivedManifest:
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = path
+        self.sources = {}
+        self.atlases = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.sources = data.get('sources', {})
+            self.atlases = data.get('atlases', {})
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'sources' : self.sources, 'atlases' : self.atlases}, f, ensure_ascii=False, indent=4, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    # 원본이 기록과 다르면 True. 크기/수정시각이 같으면 해시는 다시 재지 않는다
+    def is_changed(self, src):
+        stat = os.stat(src)
+        record = self.sources.get(src)
+        if record and record['size'] == stat.st_size and record['mtime'] == stat.st_mtime_ns:
+            return False
+        sha256 = mirror_card_img.hash_file(src)
+        changed = record is None or record['sha256'] != sha256
+        self.sources[src] = {'size' : stat.st_size, 'mtime' : stat.st_mtime_ns, 'sha256' : sha256}
+        return changed
+
+def derive_images(sources, manifest, img_root, thumb_root, webp_root, max_workers):
+    jobs = []
+    for src in sources:
+        thumb_path = derived_path(src, img_root, thumb_root)
+        webp_path = derived_path(src, img_root, webp_root)
+        changed = manifest.is_changed(src)
+        if changed or not os.path.exists(thumb_path) or not os.path.exists(webp_path):
+            jobs.append((src, thumb_path, webp_path))
+
+    print(f'{len(sources)} images, {len(jobs)} to convert')
+    failed = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for src, error in executor.map(make_derivatives, jobs, chunksize=16):
+            if error:
+                print(f'FAIL : {src} ({error})')
+                failed.append(src)
+                # 다음에 다시 시도
+                manifest.sources.pop(src, None)
+    return len(jobs) - len(failed), failed
+
+def derive_atlases(manifest, json_root, img_root, thumb_root, atlas_root, max_workers):
+    jobs = []
+    for json_file in mirror_card_img.find_json_files(json_root):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            cards = json.load(f)
+
+        cells = []
+        members = []
+        for card in cards:
+            src = None
+            if card.get('cardImgURL') and card.get('cardPageURL'):
+                src = mirror_card_img.img_path(img_root, card['cardPageURL'], card['cardImgURL'])
+            if src in manifest.sources:
+                cells.append((card['id'], derived_path(src, img_root, thumb_root)))
+                members.append((card['id'], manifest.sources[src]['sha256']))
+            else:
+                cells.append((card['id'], None))
+                members.append((card['id'], None))
+
+        # 칸 구성과 각 원본 해시가 같으면 다시 만들 필요 없다
+        rel_path = os.path.relpath(json_file, json_root).replace(os.sep, '/')
+        atlas_path = atlas_root + os.path.splitext(rel_path)[0] + '.webp'
+        key = hash_text(json.dumps(members, ensure_ascii=False))
+        if not cells or (manifest.atlases.get(rel_path) == key and os.path.exists(atlas_path)):
+            continue
+        jobs.append((rel_path, key, atlas_path, cells))
+
+    print(f'{len(jobs)} atlases to build')
+    failed = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(make_atlas, [(atlas_path, cells) for _, _, atlas_path, cells in jobs])
+        for (rel_path, key, _, _), (atlas_path, error) in zip(jobs, results):
+            if error:
+                print(f'FAIL : {atlas_path} ({error})')
+                failed.append(atlas_path)
+                # 다음에 다시 시도
+                manifest.atlases.pop(rel_path, None)
+            else:
+                manifest.atlases[rel_path] = key
+    return len(jobs) - len(failed), failed
+
+def derive_card_img(img_root=IMG_ROOT, json_root=CARD_DATA_ROOT, thumb_root=THUMB_ROOT, webp_root=WEBP_ROOT,
+                    atlas_root=ATLAS_ROOT, manifest_path=MANIFEST_FILE, max_workers=MAX_WORKERS):
+    manifest = DerivedManifest(manifest_path)
+
+    converted, failed = derive_images(find_source_images(img_root), manifest, img_root, thumb_root, webp_root, max_workers)
+    manifest.save()
+
+    atlases, failed_atlases = derive_atlases(manifest, json_root, img_root, thumb_root, atlas_root, max_workers)
+    manifest.save()
+
+    return converted, failed, atlases, failed_atlases
+
+if __name__ == "__main__":
+    start_time = time.time()
+    converted, failed, atlases, failed_atlases = derive_card_img()
+
+    print(f"Converted images : {converted}")
+    print(f"Failed images : {len(failed)}")
+    print(f"Built atlases : {atlases}")
+    print(f"Failed atlases : {len(failed_atlases)}")
+    print(f"Total time : {round(time.time() - start_time, 2)} secs")
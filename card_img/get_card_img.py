@@ -1,15 +1,20 @@
 import re
+import sys
+from pathlib import Path
 from urllib.parse import urlparse
-import requests
 import os
 from bs4 import BeautifulSoup # type: ignore
 
+# src/scraping 의 공용 HTTP 클라이언트를 쓴다
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src' / 'scraping'))
+import http_client
+
 # url : 카드페이지 url
 # 이미지 url이 아니다!!
 def get_card_img(url):
     # url 에서 파일 경로 생성
     pattern = r'/(\w+)(\d{4})(\d{3})(\d{3})'
-    res = requests.get(url)
+    res = http_client.get(url)
     soup = BeautifulSoup(res.text,'lxml')
         
     match = re.search(pattern, url)
@@ -24,7 +29,7 @@ def get_card_img(url):
     card_img_file_name = urlparse(card_img_url).path.split('/')[-1]
         
     # 이미지 저장
-    img_res = requests.get(card_img_url)
+    img_res = http_client.get(card_img_url)
     img_res.raise_for_status()  # 요청이 성공했는지 확인
         
     card_img_file_path = card_img_path + card_img_file_name
@@ -0,0 +1,185 @@
+import re
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+# src/scraping 의 공용 HTTP 클라이언트를 쓴다
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src' / 'scraping'))
+import http_client
+
+# card_data_product 의 cardImgURL 로 카드 이미지를 한번에 받는다 (카드페이지는 다시 받지 않는다)
+# 저장 위치는 get_card_img 와 같다 : ./img/{category}/{year}/{ver}/{이미지 파일명}
+# - MAX_WORKERS 개씩 동시에 받는다
+# - 받은 파일은 MANIFEST_FILE 에 한줄씩 기록한다 (url, 크기, sha256)
+#   기록과 크기/해시가 같은 파일은 건너뛰므로, 중간에 끊겨도 다시 돌리면 이어서 받는다
+# - 기록이 없는 기존 파일은 Content-Length 가 파일 크기와 같으면 받지 않고 기록만 한다
+# - 파일은 임시파일에 받은 뒤 이름을 바꾸므로, 끊긴 다운로드가 완성된 파일로 남지 않는다
+
+CARD_DATA_ROOT = '../card_data_product/'
+IMG_ROOT = './img/'
+MANIFEST_FILE = './img/mirror_manifest.jsonl'
+MAX_WORKERS = 16
+CHUNK_SIZE = 65536
+
+def find_json_files(json_root):
+    json_files = []
+    for root, dirs, files in os.walk(json_root):
+        for file in files:
+            if file.endswith('.json'):
+                json_files.append(os.path.join(root, file))
+    return sorted(json_files)
+
+# 카드페이지 url 에서 (category, year, ver)
+# BS2024008016 -> BS, 2024, 008
+# 숫자가 10자리가 안되는 url (BS201707100, SP000000077) 은 끝 6자리를 ver, num 으로 본다
+def split_page_url(url):
+    match = re.search(r'/(\w+)(\d{4})(\d{3})(\d{3})', url)
+    if match:
+        return match.group(1), match.group(2), match.group(3)
+
+    match = re.search(r'/([A-Za-z]+)(\d+)$', url)
+    category, digits = match.group(1), match.group(2)
+    if digits[:2] in ('19', '20'):
+        return category, digits[:4], digits[4:-3]
+    return category, digits[:-6], digits[-6:-3]
+
+def img_path(img_root, card_page_url, card_img_url):
+    category, year, ver = split_page_url(card_page_url)
+    card_img_file_name = urlparse(card_img_url).path.split('/')[-1]
+    return img_root + category + '/' + str(year) + '/' + str(ver) + '/' + card_img_file_name
+
+# {이미지 경로 : 이미지 url}, 같은 경로는 한번만
+def collect_images(json_root, img_root):
+    images = {}
+    for json_file in find_json_files(json_root):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            cards = json.load(f)
+        for card in cards:
+            card_img_url = card.get('cardImgURL')
+            card_page_url = card.get('cardPageURL')
+            if not card_img_url or not card_page_url:
+                continue
+            images.setdefault(img_path(img_root, card_page_url, card_img_url), card_img_url)
+    return images
+
+def hash_file(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+class ImageMirror:
+    def __init__(self, img_root=IMG_ROOT, manifest_path=MANIFEST_FILE, verify_hash=False):
+        self.img_root = img_root
+        self.manifest_path = manifest_path
+        # True 면 기록과 sha256 까지 비교한다. False 면 크기만
+        self.verify_hash = verify_hash
+        self.records = {}
+        self.lock = threading.Lock()
+        self.counts = {'downloaded' : 0, 'skipped' : 0, 'failed' : 0}
+
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 끊길 때 잘린 마지막 줄
+                        continue
+                    self.records[record['path']] = record
+
+        os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok=True)
+        self.file = open(manifest_path, 'a', encoding='utf-8')
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def record(self, path, url, size, sha256):
+        record = {'path' : path, 'url' : url, 'size' : size, 'sha256' : sha256}
+        with self.lock:
+            self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self.file.flush()
+            self.records[path] = record
+
+    # 기록과 같은 파일이 이미 있으면 True
+    def is_mirrored(self, path, url):
+        record = self.records.get(path)
+        if record is None or record['url'] != url or not os.path.exists(path):
+            return False
+        if os.path.getsize(path) != record['size']:
+            return False
+        if self.verify_hash and hash_file(path) != record['sha256']:
+            return False
+        return True
+
+    def download(self, path, url):
+        if self.is_mirrored(path, url):
+            self.count('skipped')
+            return
+
+        try:
+            res = http_client.get(url, stream=True)
+            res.raise_for_status()
+
+            # 기록 없이 있던 파일 (get_card_img 로 받은 것 등)
+            length = res.headers.get('Content-Length')
+            if os.path.exists(path) and length and int(length) == os.path.getsize(path):
+                res.close()
+                self.record(path, url, os.path.getsize(path), hash_file(path))
+                self.count('skipped')
+                return
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + '.' + str(os.getpid()) + '_' + str(threading.get_ident()) + '.tmp'
+            sha = hashlib.sha256()
+            size = 0
+            with open(tmp_path, 'wb') as f:
+                for chunk in res.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+                    sha.update(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f'FAIL : {url} ({type(e).__name__})')
+            self.count('failed')
+            return
+
+        self.record(path, url, size, sha.hexdigest())
+        self.count('downloaded')
+
+    def mirror(self, images, max_workers=MAX_WORKERS):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i, _ in enumerate(executor.map(lambda item: self.download(*item), sorted(images.items()))):
+                if (i + 1) % 500 == 0:
+                    print(f'{i + 1} / {len(images)}')
+        return self.counts
+
+    def close(self):
+        self.file.close()
+
+def mirror_card_img(json_root=CARD_DATA_ROOT, img_root=IMG_ROOT, manifest_path=MANIFEST_FILE,
+                    max_workers=MAX_WORKERS, verify_hash=False):
+    images = collect_images(json_root, img_root)
+    print(f'{len(images)} images')
+
+    mirror = ImageMirror(img_root, manifest_path, verify_hash)
+    counts = mirror.mirror(images, max_workers)
+    mirror.close()
+    return counts
+
+if __name__ == "__main__":
+    start_time = time.time()
+    counts = mirror_card_img()
+
+    print(f"Downloaded : {counts['downloaded']}")
+    print(f"Skipped : {counts['skipped']}")
+    print(f"Failed : {counts['failed']}")
+    print(f"Total time : {round(time.time() - start_time, 2)} secs")
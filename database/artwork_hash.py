@@ -0,0 +1,241 @@
+"""
+artwork_hash.py
+===============
+Perceptual hashes of card artwork, stored alongside card_prints, and a
+vectorized Hamming-distance search over them.
+
+Reprints share a card_id, but the artwork may or may not be reused. A 64-bit
+DCT perceptual hash (pHash) of each print's image makes that visible:
+  - prints of the same card_id with distant hashes are alt-arts
+  - prints of different card_ids with (near-)identical hashes share artwork,
+    which is either a legitimate reuse or a mis-linked cardImgURL
+
+Usage:
+    python artwork_hash.py [--db PATH] [--print PRINT_ID] [--max-distance N]
+
+    --print PRINT_ID   List prints whose artwork is near PRINT_ID
+    (no --print)       List artwork shared across different card_ids
+
+Hashes are written by import_data.py --phash. Images are read from the
+card_img mirror (card_img/mirror_card_img.py) when present, otherwise
+fetched from cardImgURL.
+"""
+
+import io
+import sys
+import sqlite3
+import hashlib
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "card_img"))
+sys.path.insert(0, str(REPO_ROOT / "src" / "scraping"))
+import http_client
+import mirror_card_img
+
+# ── settings ───────────────────────────────────────────────────────────────────
+IMG_ROOT             = str(REPO_ROOT / "card_img" / "img") + "/"
+DEFAULT_DB_PATH      = Path(__file__).resolve().parent / "ptcg_kr.db"
+HASH_SIZE            = 8    # 8x8 low-frequency DCT block → 64-bit hash
+HIGHFREQ_FACTOR      = 4    # image is reduced to 32x32 before the DCT
+DEFAULT_MAX_DISTANCE = 6    # Hamming distance still counted as the same artwork
+SEARCH_BLOCK         = 512  # query rows per block in all-pairs search
+
+# popcount of every byte value
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+# ── hashing ────────────────────────────────────────────────────────────────────
+
+def dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix, so that dct(x) = M @ x."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    m[0] /= np.sqrt(2)
+    return m
+
+
+DCT = dct_matrix(HASH_SIZE * HIGHFREQ_FACTOR)
+
+
+def phash(img: Image.Image) -> bytes:
+    """
+    64-bit perceptual hash of an image, packed into 8 bytes.
+    Each bit says whether a low-frequency DCT coefficient is above the median.
+    """
+    size = HASH_SIZE * HIGHFREQ_FACTOR
+    pixels = np.asarray(img.convert("L").resize((size, size), Image.LANCZOS), dtype=np.float64)
+    low = (DCT @ pixels @ DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    bits = low > np.median(low.ravel()[1:])  # the DC term only says how bright the image is
+    return np.packbits(bits.ravel()).tobytes()
+
+
+def read_card_img(card_img_url: str, card_page_url: str, img_root: str = IMG_ROOT) -> bytes:
+    """Image bytes from the local mirror if present, otherwise downloaded from cardImgURL."""
+    if card_page_url:
+        path = Path(mirror_card_img.img_path(img_root, card_page_url, card_img_url))
+        if path.exists():
+            return path.read_bytes()
+    res = http_client.get(card_img_url)
+    res.raise_for_status()
+    return res.content
+
+
+def hash_card_img(card_img_url: str, card_page_url: str, img_root: str = IMG_ROOT) -> "tuple[bytes, str]":
+    """(phash, sha256 of the image bytes) for one print's image."""
+    data = read_card_img(card_img_url, card_page_url, img_root)
+    with Image.open(io.BytesIO(data)) as img:
+        return phash(img), hashlib.sha256(data).hexdigest()
+
+
+def import_print_hashes(conn: sqlite3.Connection, img_root: str = IMG_ROOT) -> "tuple[int, int]":
+    """
+    Hash every print image not yet in card_print_hashes (or whose cardImgURL
+    changed since it was hashed). Returns (hashed, failed).
+    """
+    cur = conn.cursor()
+    rows = cur.execute("""
+        SELECT p.print_id, p.card_img_url, p.card_page_url
+        FROM card_prints p
+        LEFT JOIN card_print_hashes h ON h.print_id = p.print_id
+        WHERE p.card_img_url IS NOT NULL
+          AND (h.print_id IS NULL OR h.card_img_url != p.card_img_url)
+    """).fetchall()
+
+    hashed = failed = 0
+    for print_id, card_img_url, card_page_url in rows:
+        try:
+            hash_bytes, img_sha256 = hash_card_img(card_img_url, card_page_url, img_root)
+        except Exception as e:
+            print(f"  hash failed: {print_id} {card_img_url} ({type(e).__name__})")
+            failed += 1
+            continue
+        cur.execute("""
+            INSERT OR REPLACE INTO card_print_hashes (print_id, card_img_url, phash, img_sha256)
+            VALUES (?, ?, ?, ?)
+        """, (print_id, card_img_url, hash_bytes, img_sha256))
+        hashed += 1
+        if hashed % 500 == 0:
+            conn.commit()
+            print(f"  {hashed} / {len(rows)}")
+
+    conn.commit()
+    return hashed, failed
+
+
+# ── search ─────────────────────────────────────────────────────────────────────
+
+def hamming(query: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+    """
+    Hamming distances between uint64 hash arrays, broadcasting like query ^ hashes.
+    Uses np.bitwise_count (NumPy 2.0+); older NumPy views the XOR as bytes
+    and counts them with a 256-entry popcount table.
+    """
+    diff = np.ascontiguousarray(query ^ hashes)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(diff)
+    return POPCOUNT[diff.view(np.uint8)].reshape(diff.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+class ArtworkIndex:
+    """All print hashes packed into one uint64 array, with card_ids alongside."""
+
+    def __init__(self, print_ids: list, card_ids: list, hashes: np.ndarray):
+        self.print_ids = print_ids
+        self.card_ids = np.array(card_ids, dtype=object)
+        self.hashes = hashes
+        self.positions = {print_id: i for i, print_id in enumerate(print_ids)}
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection) -> "ArtworkIndex":
+        rows = conn.execute("""
+            SELECT h.print_id, p.card_id, h.phash
+            FROM card_print_hashes h
+            JOIN card_prints p ON p.print_id = h.print_id
+            ORDER BY h.print_id
+        """).fetchall()
+        hashes = np.frombuffer(b"".join(row[2] for row in rows), dtype=">u8").astype(np.uint64)
+        return cls([row[0] for row in rows], [row[1] for row in rows], hashes)
+
+    def __len__(self) -> int:
+        return len(self.print_ids)
+
+    def near(self, print_id: str, max_distance: int = DEFAULT_MAX_DISTANCE) -> "list[tuple[str, str, int]]":
+        """(print_id, card_id, distance) of every other print within max_distance, nearest first."""
+        i = self.positions[print_id]
+        dist = hamming(self.hashes[i], self.hashes)
+        hits = np.flatnonzero(dist <= max_distance)
+        hits = hits[hits != i]
+        hits = hits[np.argsort(dist[hits], kind="stable")]
+        return [(self.print_ids[j], self.card_ids[j], int(dist[j])) for j in hits]
+
+    def pairs(self, max_distance: int = DEFAULT_MAX_DISTANCE) -> "list[tuple[int, int, int]]":
+        """(i, j, distance) with i < j for every pair of prints within max_distance."""
+        found = []
+        for start in range(0, len(self), SEARCH_BLOCK):
+            # only columns from start on: pairs with earlier rows were found by earlier blocks
+            block = self.hashes[start:start + SEARCH_BLOCK]
+            dist = hamming(block[:, None], self.hashes[None, start:])
+            rows, cols = np.nonzero(dist <= max_distance)
+            keep = rows < cols
+            for i, j in zip(rows[keep], cols[keep]):
+                found.append((int(i) + start, int(j) + start, int(dist[i, j])))
+        return found
+
+    def shared_across_cards(self, max_distance: int = DEFAULT_MAX_DISTANCE) -> "list[tuple[str, str, str, str, int]]":
+        """
+        Near-duplicate artwork on prints of different card_ids:
+        (print_id, card_id, other print_id, other card_id, distance).
+        These are either reused artwork or mis-linked cardImgURLs.
+        """
+        return [
+            (self.print_ids[i], self.card_ids[i], self.print_ids[j], self.card_ids[j], d)
+            for i, j, d in self.pairs(max_distance)
+            if self.card_ids[i] != self.card_ids[j]
+        ]
+
+
+# ── main ───────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search card prints with near-duplicate artwork."
+    )
+    parser.add_argument(
+        "--db",
+        default=str(DEFAULT_DB_PATH),
+        help=f"Path to the SQLite database file (default: {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--print",
+        dest="print_id",
+        help="List prints whose artwork is near this print ID",
+    )
+    parser.add_argument(
+        "--max-distance",
+        type=int,
+        default=DEFAULT_MAX_DISTANCE,
+        help=f"Largest Hamming distance counted as the same artwork (default: {DEFAULT_MAX_DISTANCE})",
+    )
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    index = ArtworkIndex.load(conn)
+    conn.close()
+    print(f"{len(index)} hashed prints")
+
+    if args.print_id:
+        for print_id, card_id, distance in index.near(args.print_id, args.max_distance):
+            print(f"  {distance:2d}  {print_id}  {card_id}")
+    else:
+        for print_id, card_id, other_id, other_card_id, distance in index.shared_across_cards(args.max_distance):
+            print(f"  {distance:2d}  {print_id} ({card_id})  {other_id} ({other_card_id})")
+
+
+if __name__ == "__main__":
+    main()
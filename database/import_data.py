@@ -4,10 +4,12 @@ import_data.py
 Imports all existing Korean PTCG JSON data into a SQLite database.
 
 Usage:
-    python import_data.py [--db PATH] [--reset]
+    python import_data.py [--db PATH] [--reset] [--phash]
 
     --db PATH   Path to the SQLite database file (default: ptcg_kr.db)
     --reset     Drop and recreate all tables before importing
+    --phash     Also hash each print's artwork into card_print_hashes
+                (needs numpy and Pillow; see artwork_hash.py)
 
 Data sources read:
     ../product_data/           - Set/product metadata (release dates, prices, etc.)
@@ -340,11 +342,19 @@ def import_card(conn: sqlite3.Connection, card: dict, set_code: str) -> None:
     if isinstance(regu_mark_single, list):
         regu_mark_single = regu_mark_single[0] if regu_mark_single else None
 
+    # A re-import refreshes the image/page URLs of a print already in the table,
+    # so artwork_hash.import_print_hashes sees the new cardImgURL and re-hashes it.
+    # Only rows from the same set file are updated: the first set a print appears in
+    # still owns the row, as with the plain INSERT OR IGNORE.
     cur.execute("""
-        INSERT OR IGNORE INTO card_prints
+        INSERT INTO card_prints
             (print_id, card_id, set_code, number, prod_number, artist,
              rarity, regulation_mark, card_img_url, card_page_url, prod_symbol_url)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(print_id) DO UPDATE SET
+            card_img_url  = excluded.card_img_url,
+            card_page_url = excluded.card_page_url
+        WHERE card_prints.set_code IS excluded.set_code
     """, (
         print_id,
         card_id,
@@ -424,6 +434,11 @@ def main():
         action="store_true",
         help="Drop and recreate all tables before importing",
     )
+    parser.add_argument(
+        "--phash",
+        action="store_true",
+        help="Hash each print's artwork into card_print_hashes",
+    )
     args = parser.parse_args()
 
     db_path = Path(args.db)
@@ -445,6 +460,13 @@ def main():
     n_cards = import_cards(conn)
     print(f"  → {n_cards} card prints imported")
 
+    if args.phash:
+        # Imported here so the plain import does not need numpy / Pillow
+        from artwork_hash import import_print_hashes
+        print("Hashing card artwork...")
+        n_hashed, n_failed = import_print_hashes(conn)
+        print(f"  → {n_hashed} prints hashed, {n_failed} failed")
+
     # Summary
     cur = conn.cursor()
     cur.execute("SELECT COUNT(*) FROM sets;")
@@ -454,6 +476,8 @@ def main():
     print(f"  unique cards:     {cur.fetchone()[0]}")
     cur.execute("SELECT COUNT(*) FROM card_prints;")
     print(f"  card prints:      {cur.fetchone()[0]}")
+    cur.execute("SELECT COUNT(*) FROM card_print_hashes;")
+    print(f"  artwork hashes:   {cur.fetchone()[0]}")
     cur.execute("SELECT COUNT(*) FROM card_attacks;")
     print(f"  attacks:          {cur.fetchone()[0]}")
     cur.execute("SELECT COUNT(*) FROM card_abilities;")
@@ -138,6 +138,21 @@ CREATE TABLE IF NOT EXISTS card_prints (
     prod_symbol_url TEXT                      -- Set symbol image URL for this print
 );
 
+-- ============================================================
+-- CARD_PRINT_HASHES
+-- Perceptual hash (64-bit DCT pHash) of each print's artwork,
+-- computed from card_img_url. Written by import_data.py --phash
+-- and searched by artwork_hash.py.
+-- Rows whose card_img_url differs from card_prints are stale
+-- and get re-hashed on the next import.
+-- ============================================================
+CREATE TABLE IF NOT EXISTS card_print_hashes (
+    print_id        TEXT    PRIMARY KEY REFERENCES card_prints(print_id) ON DELETE CASCADE,
+    card_img_url    TEXT    NOT NULL,         -- Image URL the hash was computed from
+    phash           BLOB    NOT NULL,         -- 8-byte big-endian perceptual hash
+    img_sha256      TEXT                      -- sha256 of the image bytes (exact-duplicate check)
+);
+
 -- ============================================================
 -- SET_CARDS  (many-to-many join for ordered card list)
 -- Associates cards with sets in order, linking the abstract
@@ -172,6 +187,7 @@ CREATE TABLE IF NOT EXISTS supply_products (
 CREATE INDEX IF NOT EXISTS idx_cards_supertype       ON cards(supertype);
 CREATE INDEX IF NOT EXISTS idx_card_prints_set_code  ON card_prints(set_code);
 CREATE INDEX IF NOT EXISTS idx_card_prints_card_id   ON card_prints(card_id);
+CREATE INDEX IF NOT EXISTS idx_card_print_hashes_sha ON card_print_hashes(img_sha256);
 CREATE INDEX IF NOT EXISTS idx_card_pokemons_card_id ON card_pokemons(card_id);
 CREATE INDEX IF NOT EXISTS idx_card_attacks_card_id  ON card_attacks(card_id);
 CREATE INDEX IF NOT EXISTS idx_card_abilities_card_id ON card_abilities(card_id);
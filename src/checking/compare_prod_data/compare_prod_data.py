@@ -4,8 +4,14 @@
 # 3. ../../product_info_1_647_edit.json : 상품정보 페이지 기반으로 생성된 상품리스트
 # 이들을 병합하고 싶다!!
 # 우선, 1,2,3 이 가지는 상품명의 상관관계를 조사하자
+import sys
 import json
 import csv
+from pathlib import Path
+
+# 상품정보 카탈로그(product_catalog)는 ptcg_kr_re_classify 폴더에 있다
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'ptcg_kr_re_classify'))
+from product_catalog import ProductCatalog
 
 FILE_ONE = '../check_products/every_prodname.csv'
 FILE_TWO = '../../raw_datas/product_list_edit.csv'
@@ -30,16 +36,8 @@ def read_two():
     return set_rst
 
 def read_three():
-    set_rst = set()
-    with open(FILE_THREE, mode='r', encoding='utf-8') as file:
-        data = json.load(file)
-    for item in data:
-        if 'name' in item:
-            if item['type'] == 'special':
-                set_rst.add(item['name'].strip())
-            else:
-                set_rst.add(item['name'].strip())
-    return set_rst
+    catalog = ProductCatalog.load(FILE_THREE)
+    return set(name.strip() for name in catalog.names())
 
 if __name__ == "__main__":
     # 세가지 파일의 상품명 정보를 집합으로 반환
@@ -1,11 +1,53 @@
 # C 상품정보 이어서
 #  11. 홈페이지의 상세 제품 페이지 스크래핑
 #  이것으로 한국 발매일을 알수 있다!
+#
+# scrape_product_info() 로 부른다
+# - 상품 페이지는 MAX_WORKERS 개씩 동시에 받는다 (http_client 의 연결 풀을 같이 쓴다)
+# - 받은 페이지는 CACHE_DIR 에 id(url) 별로 저장해두고 다시 받지 않는다
+#   refresh=True 면 저장된 페이지도 ETag/Last-Modified 로 재검증한다
+#   단, 상품이 없는 빈 페이지는 저장돼 있어도 믿지 않고 매번 새로 받는다
+#   (마지막 상품 뒤의 id 들이라 다음 실행 전에 새 상품이 올라올 수 있다)
+# - last_id 를 주지 않으면 가장 큰 상품 id 를 찾는다
+#   기존 파일의 가장 큰 id 다음부터 discover_sets 의 galloping/binary search 로 찾고,
+#   빈 id 가 끼어 있을 수 있으므로 끝에서 PROBE_LOOKAHEAD 개를 더 본다
+# - 결과는 product_info_cards.json / supply_data/product_info_supp.json 에 합친다
+#   이미 있는 id 의 이름과 type 은 손으로 고친 것이므로 그대로 두고,
+#   refresh=True 면 발매일, 가격, 구성물, 주의, 이미지만 새로 받은 것으로 바꾼다
+#   새 id 는 split_product_info 의 이름 수정표를 적용하고 type 을 guess_type 으로 정해서 추가한다 (확인 필요)
+#   이벤트 페이지(상세정보 없음)와 빈 페이지는 넣지 않는다
 
 import os
-from bs4 import BeautifulSoup # type: ignore
-import requests
+import sys
 import json
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup # type: ignore
+
+# src/scraping 의 공용 HTTP 클라이언트, HTML 캐시, 경계 찾기를 쓴다
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scraping'))
+import html_cache
+import discover_sets
+
+import split_product_info
+
+url_head = "https://pokemoncard.co.kr/card/"
+
+DIR_CARD = './product_info_cards.json'
+DIR_SUPP = '../../supply_data/product_info_supp.json'
+CACHE_DIR = './product_html_cache/'
+MAX_WORKERS = 8
+PROBE_LOOKAHEAD = 10
+
+# 새 상품의 type 추정. 위에서부터 먼저 맞는 것
+TYPE_KEYWORDS = [
+    ('supply', ['카드 실드', '덱 케이스', '플레이매트', '플레이 매트', '카드 박스', '슬리브']),
+    ('pack', ['확장팩']),
+    ('deck', ['덱', '스타터 세트', '스타터세트']),
+]
+# 재수집할 때 새 값으로 바꾸는 항목
+REFRESH_KEYS = ['cover_url', 'releaseDate', 'price', 'contents', 'caution']
 
 #상품 상세정보에서 키워드 지우는데 사용
 def remove_first_occurrence(A, B):
@@ -16,38 +58,23 @@ def remove_first_occurrence(A, B):
         A = A[:index] + A[index + len(B):]
     return A
 
-url_head = "https://pokemoncard.co.kr/card/"
-FIRST_PROD_ID = 1
-LAST_PROD_ID = 647
-
-FIRST_PROD_ID = 640
-LAST_PROD_ID = 670
-prod_data = []
-
-for prod_id in range(FIRST_PROD_ID,LAST_PROD_ID+1):
+def parse_product(prod_id, html):
     url_prod = url_head + str(prod_id)
-    res = requests.get(url_prod)
-    
     data = {}
-    
+
     data['id'] = prod_id
-    
-    soup = BeautifulSoup(res.text,'lxml')
-    
+
+    soup = BeautifulSoup(html,'lxml')
+
     #응답 확인
     if not soup.select('h3.medium-title'):
         data['name'] = "Null"
-        print(f'id : {prod_id}  name : Null')
-        
-        prod_data.append(data)
-        continue
-    
+        return data
+
     # 상품명
     prod_name = soup.select('h3.medium-title')[0].text
     data['name'] = prod_name
-    
-    print(f'id : {prod_id}  name : {prod_name}')
-    
+
     # 제품 URL
     prod_cover_url = soup.find('div', class_='poster_wrap post_shadw').find('img')['src']
     data['cover_url'] = prod_cover_url
@@ -64,11 +91,11 @@ for prod_id in range(FIRST_PROD_ID,LAST_PROD_ID+1):
         data['type'] = "event"
     elif len(prod_info) == 4:
         keywords = ['발매일','가격','구성물','주의']
-        
+
         for i in range(4):
             prod_info[i] = remove_first_occurrence(prod_info[i],keywords[i])
             prod_info[i] = remove_first_occurrence(prod_info[i],'\n')
-        
+
         data['releaseDate'] = prod_info[0]
         data['price'] = prod_info[1]
         data['contents'] = prod_info[2]
@@ -76,11 +103,148 @@ for prod_id in range(FIRST_PROD_ID,LAST_PROD_ID+1):
     else:
         data['type'] = "unknown"
         data['info'] = prod_info
-    
+
     data['url'] = url_prod
-    prod_data.append(data)
+    return data
+
+def guess_type(name):
+    for prod_type, keywords in TYPE_KEYWORDS:
+        if any(keyword in name for keyword in keywords):
+            return prod_type
+    return 'special'
+
+def load_json(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, mode='r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_json(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent =4)
+    os.replace(tmp_path, path)
+
+class ProductScraper:
+    def __init__(self, cache_dir=CACHE_DIR, max_workers=MAX_WORKERS, refresh=False):
+        self.cache = html_cache.HtmlCache(cache_dir)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.refresh = refresh
+        # id -> Future, 경계 찾기와 본 수집에서 같은 id 를 두번 받지 않는다
+        self.futures = {}
+
+    def fetch(self, prod_id):
+        url_prod = url_head + str(prod_id)
+        cached = self.cache.get(url_prod)
+        if cached is not None:
+            data = parse_product(prod_id, cached)
+            # 빈 페이지는 믿지 않는다. 마지막 상품 뒤의 id 에는 그 사이 새 상품이 올라왔을 수 있으므로
+            # 조건부 요청 없이 항상 새로 받는다
+            if data['name'] == "Null":
+                return parse_product(prod_id, self.cache.fetch(url_prod, conditional=False))
+            if not self.refresh:
+                self.cache.count('hits')
+                return data
+        return parse_product(prod_id, self.cache.fetch(url_prod))
+
+    def submit(self, prod_id):
+        if prod_id not in self.futures:
+            self.futures[prod_id] = self.executor.submit(self.fetch, prod_id)
+        return self.futures[prod_id]
+
+    def get(self, prod_id):
+        return self.submit(prod_id).result()
+
+    def is_valid(self, prod_id):
+        return self.get(prod_id)['name'] != "Null"
+
+    # start 이후 가장 큰 상품 id. 앞의 PROBE_LOOKAHEAD 개는 미리 같이 받아둔다
+    def find_last_id(self, start):
+        for prod_id in range(start + 1, start + 1 + PROBE_LOOKAHEAD):
+            self.submit(prod_id)
+        last, gaps = discover_sets.find_ver_range(lambda n: self.is_valid(start + n), PROBE_LOOKAHEAD)
+        return start + last
+
+    def scrape(self, prod_ids):
+        for prod_id in prod_ids:
+            self.submit(prod_id)
+        prod_data = []
+        for prod_id in prod_ids:
+            try:
+                data = self.get(prod_id)
+            except Exception as e:
+                print(f'id : {prod_id}  FAIL ({type(e).__name__})')
+                continue
+            print(f'id : {prod_id}  name : {data["name"]}')
+            prod_data.append(data)
+        return prod_data
+
+    def close(self):
+        self.executor.shutdown()
+
+# 수집한 상품을 cards / supp 에 합친다. (추가된 상품, 갱신된 상품) 수
+def merge_products(prod_data, cards, supp, refresh=False):
+    known = {}
+    for item in cards + supp:
+        known.setdefault(item['id'], []).append(item)
+
+    added = []
+    updated = 0
+    for data in prod_data:
+        if data['name'] == "Null" or data.get('type') in ('event', 'unknown'):
+            continue
+        if data['id'] in known:
+            if not refresh:
+                continue
+            # 나눈 상품은 id 가 같은 항목이 여러개
+            for item in known[data['id']]:
+                changed = False
+                for key in REFRESH_KEYS:
+                    if key in data and item.get(key) != data[key]:
+                        item[key] = data[key]
+                        changed = True
+                updated += changed
+            continue
+        added.append(data)
+
+    for data in split_product_info.rename_products(added):
+        data['type'] = guess_type(data['name'])
+        print(f'new : {data["id"]} {data["type"]} {data["name"]}')
+        if data['type'] == 'supply':
+            supp.append(data)
+        else:
+            cards.append(data)
+
+    return len(added), updated
+
+def scrape_product_info(first_id=None, last_id=None, refresh=False, dir_card=DIR_CARD, dir_supp=DIR_SUPP,
+                        cache_dir=CACHE_DIR, max_workers=MAX_WORKERS):
+    cards = load_json(dir_card)
+    supp = load_json(dir_supp)
+    max_known_id = max([item['id'] for item in cards + supp], default=0)
+
+    scraper = ProductScraper(cache_dir, max_workers, refresh)
+    if last_id is None:
+        last_id = scraper.find_last_id(max_known_id)
+        print(f'last product id : {last_id}')
+    if first_id is None:
+        # 새로 받기만 할 때는 기존 파일에 없는 id 부터
+        first_id = 1 if refresh else max_known_id + 1
+
+    prod_data = scraper.scrape(list(range(first_id, last_id + 1)))
+    scraper.close()
+
+    # 기존 순서는 손으로 정리한 것이므로 새 상품은 뒤에 붙이기만 한다
+    added, updated = merge_products(prod_data, cards, supp, refresh)
+    save_json(dir_card, cards)
+    save_json(dir_supp, supp)
+
+    print(f'fetched : {scraper.cache.misses}, not modified : {scraper.cache.not_modified}, cached : {scraper.cache.hits}')
+    return added, updated
 
-# json으로 저장
-json_file_name = "product_info_ori_240926.json"
-with open(json_file_name, 'w', encoding='utf-8') as f:
-    json.dump(prod_data, f, ensure_ascii=False, indent =4)
\ No newline at end of file
+if __name__ == "__main__":
+    start_time = time.time()
+    added, updated = scrape_product_info()
+    print(f"Added products : {added}")
+    print(f"Updated products : {updated}")
+    print(f"Total time : {round(time.time() - start_time, 2)} secs")
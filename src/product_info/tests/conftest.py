@@ -0,0 +1,5 @@
+import os
+import sys
+
+# scrape_product_info is a script in the folder above, imported as a top-level module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
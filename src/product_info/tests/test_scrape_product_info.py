@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+# Puts src/scraping on sys.path for html_cache
+import scrape_product_info
+import html_cache
+
+EMPTY_PAGE = '<html><body><div class="container"></div></body></html>'
+
+def product_page(prod_id):
+    return f"""<html><body>
+<h3 class="medium-title">스칼렛&바이올렛 확장팩 「테스트 {prod_id}」</h3>
+<div class="poster_wrap post_shadw"><img src="https://pokemoncard.co.kr/uploads/{prod_id}.png"></div>
+<div class="col-md-8 margin-top-30 margin-bottom-30"><ul>
+<li><b>발매일</b> 2024-01-{prod_id:02d}</li>
+<li><b>가격</b> 5,000원</li>
+<li><b>구성물</b> 카드 5장</li>
+<li><b>주의</b> 주의사항</li>
+</ul></div>
+</body></html>"""
+
+class FakeResponse:
+    def __init__(self, text):
+        self.status_code = 200
+        self.text = text
+        self.headers = {}
+
+    def close(self):
+        pass
+
+# Stand-in for the site: ids up to last_id are products, the rest are empty pages
+class FakeSite:
+    def __init__(self, last_id):
+        self.last_id = last_id
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        prod_id = int(url[len(scrape_product_info.url_head):])
+        self.requests.append(prod_id)
+        return FakeResponse(product_page(prod_id) if prod_id <= self.last_id else EMPTY_PAGE)
+
+@pytest.fixture
+def site(monkeypatch):
+    site = FakeSite(5)
+    monkeypatch.setattr(html_cache.http_client, 'get', site.get)
+    return site
+
+def run(tmp_path):
+    dir_card = str(tmp_path / 'product_info_cards.json')
+    dir_supp = str(tmp_path / 'product_info_supp.json')
+    added, updated = scrape_product_info.scrape_product_info(
+        dir_card=dir_card, dir_supp=dir_supp, cache_dir=str(tmp_path / 'cache'), max_workers=2)
+    with open(dir_card, 'r', encoding='utf-8') as f:
+        return added, sorted(item['id'] for item in json.load(f))
+
+def test_products_released_between_two_runs_are_added(tmp_path, site):
+    added, ids = run(tmp_path)
+    assert (added, ids) == (5, [1, 2, 3, 4, 5])
+    # The empty pages past the last product were probed and are in the cache now
+    assert max(site.requests) > 5
+
+    site.last_id = 8
+    site.requests = []
+    added, ids = run(tmp_path)
+    assert (added, ids) == (3, [1, 2, 3, 4, 5, 6, 7, 8])
+    # Known products come from the cache; only the ids past them are asked again
+    assert min(site.requests) == 6
+
+def test_a_run_without_new_products_adds_nothing(tmp_path, site):
+    run(tmp_path)
+    site.requests = []
+    assert run(tmp_path) == (0, [1, 2, 3, 4, 5])
+    assert min(site.requests) == 6
@@ -0,0 +1,108 @@
+import os
+import json
+import hashlib
+
+# Incremental writer for the card_data/ files (see gen_card_data_* in classify_by_type.py).
+# Each file is serialized exactly as before, hashed, and only written if the hash differs
+# from the last run, so adding one set only touches the files that set's prints feed.
+#
+# The manifest keeps, per output file, the content hash and the prints it was built from
+# (keyed by cardPageURL), so a run can report what each rewritten file gained or lost and
+# files_fed_by() can answer which files a print ends up in.
+# It also keeps the file's size and mtime: the recorded hash is only trusted while they match,
+# otherwise the file was touched since (git checkout, hand edit) and is hashed from disk again.
+#
+#   writer = CardDataWriter()
+#   writer.write(file_path, json_data)
+#   ...
+#   writer.finish()   # saves the manifest and prints the changed files
+
+MANIFEST_FILE = './card_data_manifest.json'
+
+def serialize(json_data):
+    return json.dumps(json_data, ensure_ascii=False, indent=4)
+
+def content_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def print_key(version_info):
+    return version_info['cardPageURL']
+
+# (size, mtime in ns) of a file, None if there is none
+def file_stat(file_path):
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+# Hash of a file already on disk, None if there is none
+def file_hash(file_path):
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return content_hash(f.read())
+
+class CardDataWriter:
+    def __init__(self, manifest_path=MANIFEST_FILE):
+        self.manifest_path = manifest_path
+        self.manifest = {}
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    self.manifest = json.load(f)
+            except Exception as e:
+                # Every file is hashed from disk instead
+                print(f"Error reading {manifest_path}: {e}")
+
+        # [(file_path, added prints, removed prints)] of the files written this run
+        self.changed = []
+        self.unchanged = 0
+
+    # Returns True if the file was (re)written
+    def write(self, file_path, json_data):
+        text = serialize(json_data)
+        digest = content_hash(text)
+        prints = sorted(print_key(info) for card in json_data for info in card['version_infos'])
+
+        old = self.manifest.get(file_path)
+        old_prints = old['prints'] if old is not None else []
+        stat = file_stat(file_path)
+        if old is not None and stat is not None and [old.get('size'), old.get('mtime')] == list(stat):
+            old_hash = old['hash']
+        else:
+            # No record of it, or the file changed since it was recorded: compare with what's on disk
+            old_hash = file_hash(file_path)
+
+        if digest == old_hash:
+            self.manifest[file_path] = {'hash': digest, 'prints': prints, 'size': stat[0], 'mtime': stat[1]}
+            self.unchanged += 1
+            return False
+
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        stat = file_stat(file_path)
+        self.manifest[file_path] = {'hash': digest, 'prints': prints, 'size': stat[0], 'mtime': stat[1]}
+
+        old_set, new_set = set(old_prints), set(prints)
+        self.changed.append((file_path, sorted(new_set - old_set), sorted(old_set - new_set)))
+        return True
+
+    # Output files a print (cardPageURL) feeds, according to the manifest
+    def files_fed_by(self, key):
+        return [path for path, entry in self.manifest.items() if key in entry['prints']]
+
+    def save(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def report(self):
+        for file_path, added, removed in self.changed:
+            print(f"updated {file_path} (+{len(added)} / -{len(removed)} prints)")
+        print(f"card_data: {len(self.changed)} files updated, {self.unchanged} unchanged")
+
+    def finish(self):
+        self.save()
+        self.report()
@@ -0,0 +1,57 @@
+import io
+import os
+import json
+
+# Combined card corpus as NDJSON: one card per line, in the order combine_all.py read them.
+# Written and read one card at a time, so neither side holds the whole corpus in memory
+# and readers can start on the first card at once.
+# A path ending in '.zst' is zstd-compressed (needs the zstandard package).
+#
+#   for item in read_cards(ALL_CARD_FILE):
+#       ...
+# read_cards() also finds 'all_card_data.ndjson.zst' when given 'all_card_data.ndjson'.
+
+ALL_CARD_FILE = 'all_card_data.ndjson'
+ZSTD_SUFFIX = '.zst'
+ZSTD_LEVEL = 10
+
+def open_text(path, mode='r'):
+    if not path.endswith(ZSTD_SUFFIX):
+        return open(path, mode, encoding='utf-8')
+
+    # Only needed for compressed corpora
+    import zstandard
+
+    if mode == 'r':
+        stream = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    else:
+        stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(path, 'wb'), closefd=True)
+    return io.TextIOWrapper(stream, encoding='utf-8')
+
+# The corpus file: path itself, or its compressed version if only that exists
+def find_card_file(path=ALL_CARD_FILE):
+    if not os.path.exists(path) and os.path.exists(path + ZSTD_SUFFIX):
+        return path + ZSTD_SUFFIX
+    return path
+
+# cards: any iterable of card dicts. Written to a temporary file first, so readers never see half a corpus.
+# Returns the number of cards written
+def write_cards(path, cards):
+    tmp_path = path + '.tmp'
+    if path.endswith(ZSTD_SUFFIX):
+        tmp_path = path[:-len(ZSTD_SUFFIX)] + '.tmp' + ZSTD_SUFFIX
+
+    count = 0
+    with open_text(tmp_path, 'w') as f:
+        for card in cards:
+            f.write(json.dumps(card, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+def read_cards(path=ALL_CARD_FILE):
+    with open_text(find_card_file(path), 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,52 @@
+import time
+
+import card_stream
+import classify_by_type
+import classify_by_product
+from product_catalog import ProductCatalog
+from card_data_writer import CardDataWriter
+
+# One entry point for classify_by_type.py and classify_by_product.py:
+# the combined corpus and product_info_cards.json are read once, and every card is fed to
+# both the per-type grouper and the per-product grouper in the same pass.
+# Outputs are the same as running the two scripts:
+# 1. card_data/[pokemon,trainers,energy]
+# 2. card_data_product/[pack,deck,special,promo]
+# 3. product_data/[pack,deck,special,promo]
+
+ALL_CARD_DIR = './' + card_stream.ALL_CARD_FILE
+
+def classify_all(all_card_dir=ALL_CARD_DIR):
+    catalog = ProductCatalog.load(classify_by_type.PRODUCT_INFO_DIR)
+
+    pokemon_data, trainers_data, energy_data = {}, {}, {}
+    product_info_extended = {}
+    product_cards = {}
+
+    for index, item in enumerate(card_stream.read_cards(all_card_dir)):
+        classify_by_type.add_card_by_type(item, pokemon_data, trainers_data, energy_data)
+        classify_by_product.add_card_by_product(index, item, catalog, product_info_extended, product_cards)
+
+    classify_by_type.sort_version_infos(pokemon_data, trainers_data, energy_data, catalog)
+    print('object generation done')
+
+    return (pokemon_data, trainers_data, energy_data), (product_cards, product_info_extended), catalog
+
+if __name__ == "__main__":
+    start_time = time.time()
+
+    # Build every data object in one pass
+    (pokemon_data, trainers_data, energy_data), (product_cards, product_info_extended), catalog = classify_all()
+
+    # Populate card_data, rewriting only the files whose content changed
+    writer = CardDataWriter()
+    classify_by_type.gen_card_data_pokemon(pokemon_data, catalog, writer)
+    classify_by_type.gen_card_data_trainers(trainers_data, catalog, writer)
+    classify_by_type.gen_card_data_energy(energy_data, catalog, writer)
+    writer.finish()
+
+    # Populate card_data_product and product_data
+    classify_by_product.gen_card_data_product(product_cards, product_info_extended)
+    classify_by_product.gen_product_data(product_cards, product_info_extended)
+
+    print(f"Total time : {round(time.time() - start_time, 2)} secs")
@@ -4,6 +4,9 @@ from datetime import datetime
 import pprint
 import re
 
+import card_stream
+from product_catalog import ProductCatalog, date_ordinal
+
 # Goals of this script:
 # 1. Split products into pack, deck, and special categories based on product_info_cards.json,
 #    and collect the cards contained in each product.
@@ -28,31 +31,12 @@ import re
 # 3. Split card files by Pokémon -> handled in a separate file
 #       product_info/[gen]/[dexnum_pokemon].json
 
-ALL_CARD_DIR = './all_card_data.json'
+ALL_CARD_DIR = './' + card_stream.ALL_CARD_FILE
 PRODUCT_INFO_DIR = '../product_info/product_info_cards.json'
 
-# From dict_list, return item[target_key] where item[search_key] == search_ele
-EXCEPTION_PRODNAME_DICT = {
-    'BW 「플라스마단 덱」' : '포켓몬 카드 게임 BW 「플라스마단 스페셜 세트」',
-    'BW 「케르디오 덱」' : '포켓몬 카드 게임 BW 트레이너 세트 「케르디오」'
-}
-
-def search_in_dict_list(dict_list, search_key, search_ele, target_key):
-    if search_ele in EXCEPTION_PRODNAME_DICT:
-        search_ele = EXCEPTION_PRODNAME_DICT[search_ele]
-
-    result = [item[target_key] for item in dict_list if item.get(search_key) == search_ele]
-
-    if result:
-        return result[0]
-    else:
-        if 'DP' not in search_ele:
-            print(search_key, search_ele, target_key)
-        return target_key + " not found"
-
 # DP products have no product info
-def get_type(product_info, item):
-    type_ = search_in_dict_list(product_info, 'name', item['prodName'].strip(), 'type')
+def get_type(catalog, item):
+    type_ = catalog.lookup(item['prodName'].strip(), 'type')
     if "not found" in type_:
         if "DP" in item['prodName']:
             if "확장팩" in item['prodName']:
@@ -149,130 +133,139 @@ def set_regu_list(item, empty=False, regu_list=[]):
             return regu_list
 
 
-def classify_cards_by_product():
-    product_info_extended = {}
+# Fields per product:
+# code : product code
+# name : product name
+# type : product type
+
+# printed_total : number of card types (printed total)
+# total : total card types including high-rarity variants
+
+# series : series info for cards in this product
+# regulations : regulation marks for cards in this product
+# in_standard_regu : whether product contains any F/G/H regulation cards
+
+# release_date : release date
+# update_date : last updated date
+
+# price : pricing info
+# contents : product contents description
+# caution : purchase caution notes
+
+# prod_url : product page URL
+# image_symbol_url : product symbol image URL
+# image_cover_url : product cover image URL
+
+# card_list_index = [indexes] - indices of cards in the combined corpus (all_card_data.ndjson)
+# card_list_detail = [objs] - summary of cards included in this product
+#   num : card number
+#   prod_num : number of card types in product
+#   name : card name
+#   supertype : card category
+#   subtypes : card sub-categories
+#   type : (for Pokémon) type
+#   pokemons : (for Pokémon) list of Pokémon
+#   rarity : rarity
+#   regulation : regulation mark
+def add_card_by_product(index, item, catalog, product_info_extended, product_cards):
+    code = item['prodCode']
+    if is_promo(item):
+        code = get_promo_code(item)
+        if code not in product_info_extended:
+            product_item = {}
+            product_item['code'] = code
+            product_item['name'] = item['prodName']
+            product_item['type'] = 'promo'
+
+            product_item['printed_total'] = item['prodNumber']
+            product_item['total'] = 1
+
+            product_item['series'] = get_series(item)
+            product_item['regulations'] = set_regu_list(item, empty=True)
+            product_item['in_standard_regu'] = is_stan_regu(item)
+
+            product_item['release_date'] = ''
+            product_item['update_date'] = datetime.now().strftime("%Y-%m-%d")
+
+            product_item['image_symbol_url'] = item["prodSymbolURL"]
+
+            product_item['card_list_index'] = [index]
+            product_item['card_list_detail'] = [summary_card_data(item)]
 
-    # Load data
-    with open(ALL_CARD_DIR, mode='r', encoding='utf-8') as file:
-        all_card_data = json.load(file)
-    with open(PRODUCT_INFO_DIR, mode='r', encoding='utf-8') as file:
-        product_info = json.load(file)
-
-    # Fields per product:
-    # code : product code
-    # name : product name
-    # type : product type
-
-    # printed_total : number of card types (printed total)
-    # total : total card types including high-rarity variants
-
-    # series : series info for cards in this product
-    # regulations : regulation marks for cards in this product
-    # in_standard_regu : whether product contains any F/G/H regulation cards
-
-    # release_date : release date
-    # update_date : last updated date
-
-    # price : pricing info
-    # contents : product contents description
-    # caution : purchase caution notes
-
-    # prod_url : product page URL
-    # image_symbol_url : product symbol image URL
-    # image_cover_url : product cover image URL
-
-    # card_list_index = [indexes] - indices of cards in all_card_data.json
-    # card_list_detail = [objs] - summary of cards included in this product
-    #   num : card number
-    #   prod_num : number of card types in product
-    #   name : card name
-    #   supertype : card category
-    #   subtypes : card sub-categories
-    #   type : (for Pokémon) type
-    #   pokemons : (for Pokémon) list of Pokémon
-    #   rarity : rarity
-    #   regulation : regulation mark
-
-    for index in range(len(all_card_data)):
-        item = all_card_data[index]
-        code = item['prodCode']
-        if is_promo(item):
-            code = get_promo_code(item)
-            if code not in product_info_extended:
-                product_item = {}
-                product_item['code'] = code
-                product_item['name'] = item['prodName']
-                product_item['type'] = 'promo'
-
-                product_item['printed_total'] = item['prodNumber']
-                product_item['total'] = 1
-
-                product_item['series'] = get_series(item)
-                product_item['regulations'] = set_regu_list(item, empty=True)
-                product_item['in_standard_regu'] = is_stan_regu(item)
-
-                product_item['release_date'] = ''
-                product_item['update_date'] = datetime.now().strftime("%Y-%m-%d")
-
-                product_item['image_symbol_url'] = item["prodSymbolURL"]
-
-                product_item['card_list_index'] = [index]
-                product_item['card_list_detail'] = [summary_card_data(item)]
-
-                product_info_extended[code] = product_item
-            else:
-                product_info_extended[code]['total'] += 1
-
-                product_info_extended[code]['series'] = list(set(product_info_extended[code]['series']) | set(get_series(item)))
-                product_info_extended[code]['regulations'] = set_regu_list(item, regu_list=product_info_extended[code]['regulations'])
-                product_info_extended[code]['in_standard_regu'] = product_info_extended[code]['in_standard_regu'] or is_stan_regu(item)
-
-                product_info_extended[code]['card_list_index'].append(index)
-                product_info_extended[code]['card_list_detail'].append(summary_card_data(item))
+            product_info_extended[code] = product_item
+            product_cards[code] = [item]
         else:
-            if code not in product_info_extended:
-                product_item = {}
-                product_item['code'] = code
-                product_item['name'] = item['prodName']
-                product_item['type'] = get_type(product_info, item)
+            product_info_extended[code]['total'] += 1
 
-                product_item['printed_total'] = item['prodNumber']
-                product_item['total'] = 1
+            product_info_extended[code]['series'] = list(set(product_info_extended[code]['series']) | set(get_series(item)))
+            product_info_extended[code]['regulations'] = set_regu_list(item, regu_list=product_info_extended[code]['regulations'])
+            product_info_extended[code]['in_standard_regu'] = product_info_extended[code]['in_standard_regu'] or is_stan_regu(item)
 
-                product_item['series'] = get_series(item)
-                product_item['regulations'] = set_regu_list(item, empty=True)
-                product_item['in_standard_regu'] = is_stan_regu(item)
+            product_info_extended[code]['card_list_index'].append(index)
+            product_info_extended[code]['card_list_detail'].append(summary_card_data(item))
+            product_cards[code].append(item)
+    else:
+        if code not in product_info_extended:
+            product_item = {}
+            product_item['code'] = code
+            product_item['name'] = item['prodName']
+            product_item['type'] = get_type(catalog, item)
+            catalog.add_code(code, item['prodName'])
+
+            product_item['printed_total'] = item['prodNumber']
+            product_item['total'] = 1
 
-                product_item['release_date'] = search_in_dict_list(product_info, 'name', item['prodName'], 'releaseDate')
-                product_item['update_date'] = datetime.now().strftime("%Y-%m-%d")
+            product_item['series'] = get_series(item)
+            product_item['regulations'] = set_regu_list(item, empty=True)
+            product_item['in_standard_regu'] = is_stan_regu(item)
 
-                product_item['price'] = search_in_dict_list(product_info, 'name', item['prodName'], 'price')
-                product_item['contents'] = search_in_dict_list(product_info, 'name', item['prodName'], 'contents')
-                product_item['caution'] = search_in_dict_list(product_info, 'name', item['prodName'], 'caution')
+            product_item['release_date'] = catalog.lookup(item['prodName'], 'releaseDate')
+            product_item['update_date'] = datetime.now().strftime("%Y-%m-%d")
 
-                product_item['prod_url'] = search_in_dict_list(product_info, 'name', item['prodName'], 'url')
-                product_item['image_symbol_url'] = item["prodSymbolURL"]
-                product_item['image_cover_url'] = search_in_dict_list(product_info, 'name', item['prodName'], "cover_url")
+            product_item['price'] = catalog.lookup(item['prodName'], 'price')
+            product_item['contents'] = catalog.lookup(item['prodName'], 'contents')
+            product_item['caution'] = catalog.lookup(item['prodName'], 'caution')
 
-                product_item['card_list_index'] = [index]
-                product_item['card_list_detail'] = [summary_card_data(item)]
+            product_item['prod_url'] = catalog.lookup(item['prodName'], 'url')
+            product_item['image_symbol_url'] = item["prodSymbolURL"]
+            product_item['image_cover_url'] = catalog.lookup(item['prodName'], 'cover_url')
 
-                product_info_extended[code] = product_item
-            else:
-                product_info_extended[code]['total'] += 1
+            product_item['card_list_index'] = [index]
+            product_item['card_list_detail'] = [summary_card_data(item)]
 
-                product_info_extended[code]['series'] = list(set(product_info_extended[code]['series']) | set(get_series(item)))
-                product_info_extended[code]['regulations'] = set_regu_list(item, regu_list=product_info_extended[code]['regulations'])
-                product_info_extended[code]['in_standard_regu'] = product_info_extended[code]['in_standard_regu'] or is_stan_regu(item)
+            product_info_extended[code] = product_item
+            product_cards[code] = [item]
+        else:
+            product_info_extended[code]['total'] += 1
 
-                product_info_extended[code]['card_list_index'].append(index)
-                product_info_extended[code]['card_list_detail'].append(summary_card_data(item))
+            product_info_extended[code]['series'] = list(set(product_info_extended[code]['series']) | set(get_series(item)))
+            product_info_extended[code]['regulations'] = set_regu_list(item, regu_list=product_info_extended[code]['regulations'])
+            product_info_extended[code]['in_standard_regu'] = product_info_extended[code]['in_standard_regu'] or is_stan_regu(item)
 
-    return all_card_data, product_info_extended
+            product_info_extended[code]['card_list_index'].append(index)
+            product_info_extended[code]['card_list_detail'].append(summary_card_data(item))
+            product_cards[code].append(item)
+
+# cards: iterable of card records, the combined corpus if None (see classify_all.py for a shared pass)
+def classify_cards_by_product(cards=None, catalog=None):
+    product_info_extended = {}
+    # Cards of each product code, in corpus order, for gen_card_data_product
+    product_cards = {}
+
+    if catalog is None:
+        catalog = ProductCatalog.load(PRODUCT_INFO_DIR)
+    if cards is None:
+        # Cards are read one at a time from the combined corpus
+        cards = card_stream.read_cards(ALL_CARD_DIR)
+
+    for index, item in enumerate(cards):
+        add_card_by_product(index, item, catalog, product_info_extended, product_cards)
+
+    return product_cards, product_info_extended
 
 # Verify card counts are correct
-def count_card_num(all_card_data, product_info):
-    all_card_num = len(all_card_data)
+def count_card_num(product_cards, product_info):
+    all_card_num = sum(len(cards) for cards in product_cards.values())
     promo_num = 0
 
     pack_num = 0
@@ -327,7 +320,7 @@ def get_product_series(series_list):
 
 CARD_DATA_PRODUCT_DIR = '../../card_data_product/'
 
-def gen_card_data_product(all_card_data, product_info):
+def gen_card_data_product(product_cards, product_info):
     json_data_all = {}
     file_write_flag = True  # If False, skip file writing
 
@@ -346,11 +339,7 @@ def gen_card_data_product(all_card_data, product_info):
             os.makedirs(file_dir)
 
         # Build file contents
-        json_data = []
-        indexs = product_info[key]['card_list_index']
-
-        for i in indexs:
-            json_data.append(all_card_data[i])
+        json_data = list(product_cards[key])
 
         json_data.sort(key=lambda x: int(x['number']))
 
@@ -378,7 +367,7 @@ def is_valid_date_format(date_str):
 
     return bool(re.match(date_pattern, date_str))
 
-def gen_product_data(all_card_data, product_info):
+def gen_product_data(product_cards, product_info):
     json_data_all = {}
     file_write_flag = True  # If False, skip file writing
 
@@ -407,7 +396,7 @@ def gen_product_data(all_card_data, product_info):
                 item['release_date'] = '1970-01-01'
 
         # Sort by release date
-        json_data = sorted(json_data, key=lambda x: datetime.strptime(x.get('release_date', '1970-01-01'), "%Y-%m-%d"))
+        json_data = sorted(json_data, key=lambda x: date_ordinal(x.get('release_date', '1970-01-01')))
 
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(json_data, f, ensure_ascii=False, indent=4)
@@ -416,11 +405,11 @@ def gen_product_data(all_card_data, product_info):
 
 if __name__ == "__main__":
     # Build the product info object
-    all_card_data, product_info = classify_cards_by_product()
-    #count_card_num(all_card_data, product_info)
+    product_cards, product_info = classify_cards_by_product()
+    #count_card_num(product_cards, product_info)
 
     # Populate card_data_product from the object
-    gen_card_data_product(all_card_data, product_info)
+    gen_card_data_product(product_cards, product_info)
 
     # Populate product_data from the object
-    gen_product_data(all_card_data, product_info)
+    gen_product_data(product_cards, product_info)
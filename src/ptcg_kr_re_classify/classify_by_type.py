@@ -1,12 +1,14 @@
 import os
-import json
-from datetime import datetime
 import pprint
 import re
 import difflib
 import bisect
 
-ALL_CARD_DIR = './all_card_data.json'
+import card_stream
+from product_catalog import ProductCatalog
+from card_data_writer import CardDataWriter
+
+ALL_CARD_DIR = './' + card_stream.ALL_CARD_FILE
 PRODUCT_INFO_DIR = '../product_info/product_info_cards.json'
 
 def to_four_digit(x):
@@ -277,132 +279,128 @@ def add_in_regu_list(regu_list, new_regu):
         # Insert new_regu at that position
         regu_list.insert(position, new_regu)
 
-def classify_cards_by_type():
-    pokemon_data, trainers_data, energy_data = {}, {}, {}
-    tmp_diff_poke = 0
-    multi_pokes = 0
-
-    # Load data
-    with open(ALL_CARD_DIR, mode='r', encoding='utf-8') as file:
-        all_card_data = json.load(file)
-
-    for item in all_card_data:
-        supertype = item['supertype']
-        card_id = item['cardID']
-        if supertype == '포켓몬':
-            poke_codes = get_poke_codes(item)
-            for poke_code in poke_codes:
-                # Is this Pokémon already stored?
-                if poke_code not in pokemon_data:
-                    pokemon_item = {}
-
-                    # Common card data
-                    pokemon_item[card_id] = get_pokemon_common(item)
-
-                    # Version-specific data; the same card effect may exist in multiple prints (reprints, etc.)
-                    # Distinguished by cardID
-                    pokemon_item[card_id]['version_infos'] = [get_pokemon_version(item)]
-
-                    pokemon_data[poke_code] = pokemon_item
-                else:
-                    # Is this cardID already stored for this Pokémon?
-                    if card_id not in pokemon_data[poke_code]:
-                        # First time seeing this cardID for this Pokémon
-                        card_data = get_pokemon_common(item)
-                        card_data['version_infos'] = [get_pokemon_version(item, debug=1)]
-
-                        pokemon_data[poke_code][card_id] = card_data
-
-                    else:
-                        # Both this Pokémon and cardID have been seen before
-                        if pokemon_data[poke_code][card_id]['flavorText'] == "" and item['flavorText'] != "":
-                            pokemon_data[poke_code][card_id]['flavorText'] = item['flavorText']
-
-                        # Add new regulation mark if it's new
-                        add_in_regu_list(pokemon_data[poke_code][card_id]['regulationMark'], item['regulationMark'])
-
-                        pokemon_data[poke_code][card_id]['version_infos'].append(get_pokemon_version(item, debug=2))
-
-        elif supertype == '트레이너스':
-            trainers_type = get_trainers_type(item)
-            if trainers_type not in trainers_data:
-                trainers_item = {}
+def add_card_by_type(item, pokemon_data, trainers_data, energy_data):
+    supertype = item['supertype']
+    card_id = item['cardID']
+    if supertype == '포켓몬':
+        poke_codes = get_poke_codes(item)
+        for poke_code in poke_codes:
+            # Is this Pokémon already stored?
+            if poke_code not in pokemon_data:
+                pokemon_item = {}
 
                 # Common card data
-                trainers_item[card_id] = get_trainers_common(item)
+                pokemon_item[card_id] = get_pokemon_common(item)
 
-                # Version-specific data; the same card effect may exist in multiple prints
+                # Version-specific data; the same card effect may exist in multiple prints (reprints, etc.)
                 # Distinguished by cardID
-                trainers_item[card_id]['version_infos'] = [get_trainers_version(item)]
+                pokemon_item[card_id]['version_infos'] = [get_pokemon_version(item)]
 
-                trainers_data[trainers_type] = trainers_item
+                pokemon_data[poke_code] = pokemon_item
             else:
-                if card_id not in trainers_data[trainers_type]:
-                    card_data = get_trainers_common(item)
-                    card_data['version_infos'] = [get_trainers_version(item)]
+                # Is this cardID already stored for this Pokémon?
+                if card_id not in pokemon_data[poke_code]:
+                    # First time seeing this cardID for this Pokémon
+                    card_data = get_pokemon_common(item)
+                    card_data['version_infos'] = [get_pokemon_version(item, debug=1)]
+
+                    pokemon_data[poke_code][card_id] = card_data
 
-                    trainers_data[trainers_type][card_id] = card_data
                 else:
-                    trainers_data[trainers_type][card_id]['version_infos'].append(get_trainers_version(item))
+                    # Both this Pokémon and cardID have been seen before
+                    if pokemon_data[poke_code][card_id]['flavorText'] == "" and item['flavorText'] != "":
+                        pokemon_data[poke_code][card_id]['flavorText'] = item['flavorText']
+
                     # Add new regulation mark if it's new
-                    add_in_regu_list(trainers_data[trainers_type][card_id]['regulationMark'], item['regulationMark'])
+                    add_in_regu_list(pokemon_data[poke_code][card_id]['regulationMark'], item['regulationMark'])
 
-        elif supertype == '에너지':
-            energy_type = get_energy_type(item)
-            if energy_type not in energy_data:
-                energy_item = {}
+                    pokemon_data[poke_code][card_id]['version_infos'].append(get_pokemon_version(item, debug=2))
 
-                # Common card data
-                energy_item[card_id] = get_energy_common(item)
+    elif supertype == '트레이너스':
+        trainers_type = get_trainers_type(item)
+        if trainers_type not in trainers_data:
+            trainers_item = {}
 
-                # Version-specific data; the same card effect may exist in multiple prints
-                # Distinguished by cardID
-                energy_item[card_id]['version_infos'] = [get_energy_version(item)]
+            # Common card data
+            trainers_item[card_id] = get_trainers_common(item)
+
+            # Version-specific data; the same card effect may exist in multiple prints
+            # Distinguished by cardID
+            trainers_item[card_id]['version_infos'] = [get_trainers_version(item)]
 
-                energy_data[energy_type] = energy_item
+            trainers_data[trainers_type] = trainers_item
+        else:
+            if card_id not in trainers_data[trainers_type]:
+                card_data = get_trainers_common(item)
+                card_data['version_infos'] = [get_trainers_version(item)]
+
+                trainers_data[trainers_type][card_id] = card_data
             else:
-                if card_id not in energy_data[energy_type]:
-                    card_data = get_energy_common(item)
-                    card_data['version_infos'] = [get_energy_version(item)]
+                trainers_data[trainers_type][card_id]['version_infos'].append(get_trainers_version(item))
+                # Add new regulation mark if it's new
+                add_in_regu_list(trainers_data[trainers_type][card_id]['regulationMark'], item['regulationMark'])
 
-                    energy_data[energy_type][card_id] = card_data
-                else:
-                    energy_data[energy_type][card_id]['version_infos'].append(get_energy_version(item))
-                    # Add new regulation mark if it's new
-                    add_in_regu_list(energy_data[energy_type][card_id]['regulationMark'], item['regulationMark'])
+    elif supertype == '에너지':
+        energy_type = get_energy_type(item)
+        if energy_type not in energy_data:
+            energy_item = {}
 
-        else:
-            print('unknown supertype')
+            # Common card data
+            energy_item[card_id] = get_energy_common(item)
+
+            # Version-specific data; the same card effect may exist in multiple prints
+            # Distinguished by cardID
+            energy_item[card_id]['version_infos'] = [get_energy_version(item)]
 
-    # Sort version_infos for each cardID by card number and release date
-    # e.g. [[num,date]] = [[3,10],[6,5],[1,10]] -> [[6,5],[1,10],[3,10]]
+            energy_data[energy_type] = energy_item
+        else:
+            if card_id not in energy_data[energy_type]:
+                card_data = get_energy_common(item)
+                card_data['version_infos'] = [get_energy_version(item)]
 
-    # Load release date info from product info
-    PRODUCT_INFO_DIR = '../product_info/product_info_cards.json'
-    with open(PRODUCT_INFO_DIR, mode='r', encoding='utf-8') as file:
-        product_info = json.load(file)
+                energy_data[energy_type][card_id] = card_data
+            else:
+                energy_data[energy_type][card_id]['version_infos'].append(get_energy_version(item))
+                # Add new regulation mark if it's new
+                add_in_regu_list(energy_data[energy_type][card_id]['regulationMark'], item['regulationMark'])
 
-    release_date_dict = {}
-    for product_item in product_info:
-        release_date_dict[product_item['name']] = product_item['releaseDate']
+    else:
+        print('unknown supertype')
 
+# Sort version_infos for each cardID by card number and release date
+# e.g. [[num,date]] = [[3,10],[6,5],[1,10]] -> [[6,5],[1,10],[3,10]]
+def sort_version_infos(pokemon_data, trainers_data, energy_data, catalog):
     # Sort Pokémon version_infos
     # pokemon_data[poke_code][card_id]['version_infos']
     for poke_code in pokemon_data:
         for card_id in pokemon_data[poke_code]:
-            pokemon_data[poke_code][card_id]['version_infos'] = sorted(pokemon_data[poke_code][card_id]['version_infos'], key=lambda x: datetime.strptime(release_date_dict.get(x['prodName'], '2099-12-31'), "%Y-%m-%d"))
+            pokemon_data[poke_code][card_id]['version_infos'] = sorted(pokemon_data[poke_code][card_id]['version_infos'], key=lambda x: catalog.release_ordinal(x['prodName']))
 
     # Sort Trainer version_infos
     # trainers_data[trainers_type][card_id]['version_infos']
     for trainers_type in trainers_data:
         for card_id in trainers_data[trainers_type]:
-            trainers_data[trainers_type][card_id]['version_infos'] = sorted(trainers_data[trainers_type][card_id]['version_infos'], key=lambda x: datetime.strptime(release_date_dict.get(x['prodName'], '2099-12-31'), "%Y-%m-%d"))
+            trainers_data[trainers_type][card_id]['version_infos'] = sorted(trainers_data[trainers_type][card_id]['version_infos'], key=lambda x: catalog.release_ordinal(x['prodName']))
 
     # Sort Energy version_infos
     # energy_data[energy_type][card_id]['version_infos']
     for energy_type in energy_data:
         for card_id in energy_data[energy_type]:
-            energy_data[energy_type][card_id]['version_infos'] = sorted(energy_data[energy_type][card_id]['version_infos'], key=lambda x: datetime.strptime(release_date_dict.get(x['prodName'], '2099-12-31'), "%Y-%m-%d"))
+            energy_data[energy_type][card_id]['version_infos'] = sorted(energy_data[energy_type][card_id]['version_infos'], key=lambda x: catalog.release_ordinal(x['prodName']))
+
+# cards: iterable of card records, the combined corpus if None (see classify_all.py for a shared pass)
+def classify_cards_by_type(cards=None, catalog=None):
+    pokemon_data, trainers_data, energy_data = {}, {}, {}
+
+    if cards is None:
+        # Cards are read one at a time from the combined corpus
+        cards = card_stream.read_cards(ALL_CARD_DIR)
+    for item in cards:
+        add_card_by_type(item, pokemon_data, trainers_data, energy_data)
+
+    if catalog is None:
+        catalog = ProductCatalog.load(PRODUCT_INFO_DIR)
+    sort_version_infos(pokemon_data, trainers_data, energy_data, catalog)
 
     print('object generation done')
     return pokemon_data, trainers_data, energy_data
@@ -428,14 +426,14 @@ def get_pokedex_gen(num):
 
 # Populate card_data/pokemon
 POKEMON_DIR = '../../card_data/pokemon/'
-def gen_card_data_pokemon(data):
+def gen_card_data_pokemon(data, catalog=None, writer=None):
     # Path: POKEMON_DIR/{generation}/{pokedex_number}_{pokemon_name}.json
-    with open(PRODUCT_INFO_DIR, mode='r', encoding='utf-8') as file:
-        product_info = json.load(file)
-
-    release_date_dict = {}
-    for product_item in product_info:
-        release_date_dict[product_item['name']] = product_item['releaseDate']
+    if catalog is None:
+        catalog = ProductCatalog.load(PRODUCT_INFO_DIR)
+    # With a shared writer the caller saves the manifest and reports once
+    own_writer = writer is None
+    if own_writer:
+        writer = CardDataWriter()
 
     for poke_code in data:
         # Build file path
@@ -443,87 +441,89 @@ def gen_card_data_pokemon(data):
         pokedex_gen = get_pokedex_gen(pokedex_num)
         file_path = POKEMON_DIR + 'gen' + str(pokedex_gen) + '/' + poke_code + '.json'
 
-        # Save as list in JSON; track first release date for each cardID
-        json_data = []
-        cid_date_dict = {}
-        for card_id in data[poke_code]:
-            json_data.append(data[poke_code][card_id])
-            cid_date_dict[data[poke_code][card_id]['cardID']] = release_date_dict.get(data[poke_code][card_id]['version_infos'][0]['prodName'], '2099-12-31')
+        # Save as list in JSON
+        json_data = list(data[poke_code].values())
 
         # Sort by first release date
-        json_data = sorted(json_data, key=lambda x: datetime.strptime(release_date_dict.get(x['version_infos'][0]['prodName'], '2099-12-31'), "%Y-%m-%d"))
+        json_data = sorted(json_data, key=lambda x: catalog.release_ordinal(x['version_infos'][0]['prodName']))
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=4)
+        # Only rewritten if the serialized content changed
+        writer.write(file_path, json_data)
+
+    if own_writer:
+        writer.finish()
     print('pokemon data done')
 
 # Populate card_data/trainers
 TRAINERS_DIR = '../../card_data/trainers/'
-def gen_card_data_trainers(data):
+def gen_card_data_trainers(data, catalog=None, writer=None):
     # Path: TRAINERS_DIR/{type}.json
-    with open(PRODUCT_INFO_DIR, mode='r', encoding='utf-8') as file:
-        product_info = json.load(file)
-
-    release_date_dict = {}
-    for product_item in product_info:
-        release_date_dict[product_item['name']] = product_item['releaseDate']
+    if catalog is None:
+        catalog = ProductCatalog.load(PRODUCT_INFO_DIR)
+    # With a shared writer the caller saves the manifest and reports once
+    own_writer = writer is None
+    if own_writer:
+        writer = CardDataWriter()
 
     for trainers_type in data:
         # Build file path
         file_path = TRAINERS_DIR + trainers_type + '.json'
 
-        # Save as list in JSON; track first release date for each cardID
-        json_data = []
-        cid_date_dict = {}
-        for card_id in data[trainers_type]:
-            json_data.append(data[trainers_type][card_id])
-            cid_date_dict[data[trainers_type][card_id]['cardID']] = release_date_dict.get(data[trainers_type][card_id]['version_infos'][0]['prodName'], '2099-12-31')
+        # Save as list in JSON
+        json_data = list(data[trainers_type].values())
 
         # Sort by first release date
-        json_data = sorted(json_data, key=lambda x: datetime.strptime(release_date_dict.get(x['version_infos'][0]['prodName'], '2099-12-31'), "%Y-%m-%d"))
+        json_data = sorted(json_data, key=lambda x: catalog.release_ordinal(x['version_infos'][0]['prodName']))
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=4)
+        # Only rewritten if the serialized content changed
+        writer.write(file_path, json_data)
+
+    if own_writer:
+        writer.finish()
     print('trainers done')
 
 # Populate card_data/energy
 ENERGY_DIR = '../../card_data/energy/'
-def gen_card_data_energy(data):
+def gen_card_data_energy(data, catalog=None, writer=None):
     # Path: ENERGY_DIR/{type}.json
-    with open(PRODUCT_INFO_DIR, mode='r', encoding='utf-8') as file:
-        product_info = json.load(file)
-
-    release_date_dict = {}
-    for product_item in product_info:
-        release_date_dict[product_item['name']] = product_item['releaseDate']
+    if catalog is None:
+        catalog = ProductCatalog.load(PRODUCT_INFO_DIR)
+    # With a shared writer the caller saves the manifest and reports once
+    own_writer = writer is None
+    if own_writer:
+        writer = CardDataWriter()
 
     for energy_type in data:
         # Build file path
         file_path = ENERGY_DIR + energy_type + '.json'
 
-        # Save as list in JSON; track first release date for each cardID
-        json_data = []
-        cid_date_dict = {}
-        for card_id in data[energy_type]:
-            json_data.append(data[energy_type][card_id])
-            cid_date_dict[data[energy_type][card_id]['cardID']] = release_date_dict.get(data[energy_type][card_id]['version_infos'][0]['prodName'], '2099-12-31')
+        # Save as list in JSON
+        json_data = list(data[energy_type].values())
 
         # Sort by first release date
-        json_data = sorted(json_data, key=lambda x: datetime.strptime(release_date_dict.get(x['version_infos'][0]['prodName'], '2099-12-31'), "%Y-%m-%d"))
+        json_data = sorted(json_data, key=lambda x: catalog.release_ordinal(x['version_infos'][0]['prodName']))
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=4)
+        # Only rewritten if the serialized content changed
+        writer.write(file_path, json_data)
+
+    if own_writer:
+        writer.finish()
     print('energy done')
 
 if __name__ == "__main__":
     # Build data objects
     pokemon_data, trainers_data, energy_data = classify_cards_by_type()
+    catalog = ProductCatalog.load(PRODUCT_INFO_DIR)
+    writer = CardDataWriter()
 
     # Populate card_data/pokemon
-    gen_card_data_pokemon(pokemon_data)
+    gen_card_data_pokemon(pokemon_data, catalog, writer)
 
     # Populate card_data/trainers
-    gen_card_data_trainers(trainers_data)
+    gen_card_data_trainers(trainers_data, catalog, writer)
 
     # Populate card_data/energy
-    gen_card_data_energy(energy_data)
+    gen_card_data_energy(energy_data, catalog, writer)
+
+    # Save the manifest and list the files that changed
+    writer.finish()
@@ -1,13 +1,15 @@
 import os
 import json
 
-CARDDATA_ROOT = '../ptcg_kr_card_data/'
-OUTPUT_FILE = 'all_card_data.json'
+import card_stream
 
-def combine_json_files():
-    base_directory = CARDDATA_ROOT
-    all_data = []
+CARDDATA_ROOT = '../ptcg_kr_card_data/'
+# One card per line (see card_stream). COMPRESS = True writes all_card_data.ndjson.zst instead
+OUTPUT_FILE = card_stream.ALL_CARD_FILE
+COMPRESS = False
 
+# Every card of every per-ver file, one file in memory at a time
+def iter_card_data(base_directory=CARDDATA_ROOT):
     # Walk all subdirectories and load every JSON file
     for root, dirs, files in os.walk(base_directory):
         for file in files:
@@ -16,14 +18,22 @@ def combine_json_files():
                 try:
                     with open(file_path, 'r', encoding='utf-8') as json_file:
                         data = json.load(json_file)
-                        all_data.extend(data)
                 except Exception as e:
                     print(f"Error processing {file_path}: {e}")
+                    continue
+                yield from data
+
+def combine_json_files():
+    output_file = OUTPUT_FILE + card_stream.ZSTD_SUFFIX if COMPRESS else OUTPUT_FILE
+
+    # Stream all combined data to a single NDJSON file
+    card_count = card_stream.write_cards(output_file, iter_card_data())
+    print(f"Total number of Korean PTCG cards released so far: {card_count}")
 
-    # Save all combined data to a single JSON file
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as out_file:
-        json.dump(all_data, out_file, ensure_ascii=False, indent=4)
-    print(f"Total number of Korean PTCG cards released so far: {len(all_data)}")
+    # Don't leave the other format behind for the readers to pick up
+    other_file = OUTPUT_FILE if COMPRESS else OUTPUT_FILE + card_stream.ZSTD_SUFFIX
+    if os.path.exists(other_file):
+        os.remove(other_file)
 
 if __name__ == "__main__":
     combine_json_files()
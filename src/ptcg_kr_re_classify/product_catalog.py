@@ -0,0 +1,117 @@
+import sys
+import json
+from datetime import datetime
+from pathlib import Path
+
+# split_product_info.py (CHANGE_PROD_NAME) lives in the product_info folder next to this one
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'product_info'))
+import split_product_info
+
+# product_info_cards.json, loaded once and indexed for the classifiers and checkers:
+#
+#   catalog = ProductCatalog.load()
+#   catalog.get(item['prodName'])               # product dict or None
+#   catalog.lookup(item['prodName'], 'price')   # value or 'price not found'
+#   catalog.release_date(item['prodName'])      # 'YYYY-MM-DD', NO_RELEASE_DATE if unknown
+#   catalog.release_ordinal(item['prodName'])   # the same date as an int, for sort keys
+#
+# Names are looked up as written first, then through ALIASES.
+# Product codes (prodCode) only exist on cards, so the code index is filled
+# with add_code() while the cards are classified.
+
+PRODUCT_INFO_DIR = '../product_info/product_info_cards.json'
+NO_RELEASE_DATE = '2099-12-31'
+
+# 'YYYY-MM-DD' -> proleptic Gregorian ordinal; orders exactly like the dates do
+def date_ordinal(date_str):
+    return datetime.strptime(date_str, "%Y-%m-%d").toordinal()
+
+NO_RELEASE_ORDINAL = date_ordinal(NO_RELEASE_DATE)
+
+# prodName on the cards -> name in product_info_cards.json
+EXCEPTION_PRODNAME_DICT = {
+    'BW 「플라스마단 덱」' : '포켓몬 카드 게임 BW 「플라스마단 스페셜 세트」',
+    'BW 「케르디오 덱」' : '포켓몬 카드 게임 BW 트레이너 세트 「케르디오」'
+}
+
+# Every other name a product is known by -> name in product_info_cards.json
+# Site names that were split into several products have no single target and are left out
+def build_aliases():
+    aliases = {}
+    for before, after in split_product_info.CHANGE_PROD_NAME:
+        if isinstance(after, str):
+            aliases[before] = after
+    aliases.update(EXCEPTION_PRODNAME_DICT)
+    return aliases
+
+ALIASES = build_aliases()
+
+class ProductCatalog:
+    def __init__(self, products, aliases=ALIASES):
+        self.products = products
+        self.aliases = aliases
+
+        # First product of each name wins, as with the old linear search
+        self.by_name = {}
+        for product in products:
+            self.by_name.setdefault(product['name'], product)
+
+        # Release dates are parsed once here; every name and alias maps straight to its ordinal
+        self.release_ordinals = {}
+        for name, product in self.by_name.items():
+            self.release_ordinals[name] = date_ordinal(product['releaseDate'])
+        for alias, name in aliases.items():
+            if alias not in self.by_name and name in self.by_name:
+                self.release_ordinals[alias] = self.release_ordinals[name]
+
+        self.by_code = {}
+
+    @classmethod
+    def load(cls, path=PRODUCT_INFO_DIR):
+        with open(path, mode='r', encoding='utf-8') as file:
+            return cls(json.load(file))
+
+    def __len__(self):
+        return len(self.products)
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def names(self):
+        return self.by_name.keys()
+
+    def get(self, name):
+        product = self.by_name.get(name)
+        if product is None and name in self.aliases:
+            product = self.by_name.get(self.aliases[name])
+        return product
+
+    # product[key] for the named product, or key + " not found" (printed unless it's a DP product,
+    # which have no product info)
+    def lookup(self, name, key):
+        product = self.get(name)
+        if product is not None:
+            return product[key]
+
+        if 'DP' not in name:
+            print('name', name, key)
+        return key + " not found"
+
+    def release_date(self, name, default=NO_RELEASE_DATE):
+        product = self.get(name)
+        if product is None:
+            return default
+        return product['releaseDate']
+
+    def release_ordinal(self, name, default=NO_RELEASE_ORDINAL):
+        return self.release_ordinals.get(name, default)
+
+    # Remember which product a card's prodCode belongs to; returns the product or None
+    def add_code(self, code, name):
+        product = self.get(name)
+        if product is not None:
+            self.by_code.setdefault(code, product)
+        return product
+
+    def get_by_code(self, code):
+        return self.by_code.get(code)
@@ -1,16 +1,18 @@
-import json
+import sys
+from pathlib import Path
 import pprint
 
-ALL_CARD_DIR = '../all_card_data.json'
+# The corpus reader lives in ptcg_kr_re_classify
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import card_stream
+
+ALL_CARD_DIR = '../' + card_stream.ALL_CARD_FILE
 
 if __name__ == "__main__":
-    with open(ALL_CARD_DIR, mode='r', encoding='utf-8') as file:
-        all_card_data = json.load(file)
-        
     subtypes_set_poke = set()
     subtypes_set_nopk = set()
     
-    for item in all_card_data:
+    for item in card_stream.read_cards(ALL_CARD_DIR):
         if item['supertype'] == '포켓몬':
             #for subtype in item['subtypes']:
             subtypes_set_poke.add(', '.join(item['subtypes']))
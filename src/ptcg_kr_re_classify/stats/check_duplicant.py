@@ -1,17 +1,19 @@
 # 같은 카드id에서 얼마나 중복이 있는지 가늠잡는 코드
 
-import json
+import sys
+from pathlib import Path
 import pprint
 
-ALL_CARD_DIR = '../all_card_data.json'
+# 카드 모음 reader(card_stream)는 상위 폴더에 있다
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import card_stream
+
+ALL_CARD_DIR = '../' + card_stream.ALL_CARD_FILE
 
 if __name__ == "__main__":
-    with open(ALL_CARD_DIR, mode='r', encoding='utf-8') as file:
-        all_card_data = json.load(file)
-        
     dup_dict = {}
     card_count = 0
-    for item in all_card_data:
+    for item in card_stream.read_cards(ALL_CARD_DIR):
         cardID = item['cardID']
         if cardID not in dup_dict:
             dup_dict[cardID] = 1
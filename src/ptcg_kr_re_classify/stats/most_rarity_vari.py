@@ -1,16 +1,18 @@
 # 가장 많은 종류의 레어리티를 가지는 포켓몬은?
 
-import json
+import sys
+from pathlib import Path
 import pprint
 
-ALL_CARD_DIR = '../all_card_data.json'
+# 카드 모음 reader(card_stream)는 상위 폴더에 있다
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import card_stream
+
+ALL_CARD_DIR = '../' + card_stream.ALL_CARD_FILE
 
 if __name__ == "__main__":
-    with open(ALL_CARD_DIR, mode='r', encoding='utf-8') as file:
-        all_card_data = json.load(file)
-        
     rare_dict = {}
-    for item in all_card_data:
+    for item in card_stream.read_cards(ALL_CARD_DIR):
         if item['supertype'] != '포켓몬':
             continue
         else:
@@ -48,7 +50,7 @@ if __name__ == "__main__":
     print(sorted(list(rare_dict['뮤'])))
     
     # U 레어인 뮤 찾기
-    for item in all_card_data:
+    for item in card_stream.read_cards(ALL_CARD_DIR):
         if item['supertype'] != '포켓몬':
             continue
         else:
@@ -60,7 +62,7 @@ if __name__ == "__main__":
     
     # CSR 카운트
     csr_count = 0
-    for item in all_card_data:
+    for item in card_stream.read_cards(ALL_CARD_DIR):
         if item['supertype'] != '포켓몬':
             continue
         else:
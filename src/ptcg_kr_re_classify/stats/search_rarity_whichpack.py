@@ -1,16 +1,18 @@
 # 어떤 레어리티가 존재하는지 확인하고 싶다.
-import json
+import sys
+from pathlib import Path
 import pprint
 
-ALL_CARD_DIR = '../all_card_data.json'
+# 카드 모음 reader(card_stream)는 상위 폴더에 있다
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import card_stream
+
+ALL_CARD_DIR = '../' + card_stream.ALL_CARD_FILE
 
 if __name__ == "__main__":
-    with open(ALL_CARD_DIR, mode='r', encoding='utf-8') as file:
-        all_card_data = json.load(file)
-        
     rarity_dict = {}
         
-    for item in all_card_data:
+    for item in card_stream.read_cards(ALL_CARD_DIR):
         rarity = item['rarity']
         prod = item['prodName']
         if rarity not in rarity_dict:
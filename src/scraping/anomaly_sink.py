@@ -0,0 +1,190 @@
+import os
+import re
+import json
+import time
+import atexit
+import threading
+from datetime import datetime
+from collections import Counter
+from multiprocessing import util
+
+from lxml import etree
+
+# Parse anomalies of the card parsers (missing artist, attack tool without attack, unknown card type, ...)
+# One record per anomaly:
+#   {"time", "pid", "stage", "code", "url", "snippet"}
+#   stage   : parser that noticed it ('do_scraping', 'pokemon', 'trainers', 'energy')
+#   code    : what is wrong ('prod_name', 'artist info', 'attack tool', ...)
+#   snippet : the DOM node it was noticed on, serialized and cut to SNIPPET_LENGTH ('' if none)
+#
+# Records are buffered in memory and appended to {anomaly_dir}/anomalies_{pid}.jsonl
+# every BUFFER_SIZE records, every FLUSH_SECS seconds and when the process exits.
+# The buffer is shared by the crawler's threads under a lock, and every process (process pool workers
+# included) has its own file, so nothing is opened per record and no two processes write the same file.
+#
+# aggregate() / write_report() turn every file of a crawl into one report:
+# counts per (stage, code) with their URLs, and which URLs are already known issues.
+
+ANOMALY_DIR = './data_cleansing/error/anomalies/'
+REPORT_FILE = './data_cleansing/error/anomaly_report.json'
+BUFFER_SIZE = 100
+FLUSH_SECS = 5
+SNIPPET_LENGTH = 500
+
+# bs4 Tag, lxml element or string -> one-line snippet
+def make_snippet(node, length=SNIPPET_LENGTH):
+    if node is None:
+        return ''
+    if isinstance(node, str):
+        text = node
+    elif isinstance(node, etree._Element):
+        text = etree.tostring(node, encoding='unicode', with_tail=False)
+    else:
+        text = str(node)
+    return re.sub(r'\s+', ' ', text).strip()[:length]
+
+class AnomalySink:
+    def __init__(self, anomaly_dir=ANOMALY_DIR, buffer_size=BUFFER_SIZE, flush_secs=FLUSH_SECS, echo=True):
+        self.anomaly_dir = anomaly_dir
+        self.buffer_size = buffer_size
+        self.flush_secs = flush_secs
+        # Print every anomaly like the old log_error_message
+        self.echo = echo
+        self.lock = threading.Lock()
+        self.reset()
+
+    # A forked child starts with a copy of the parent's buffer; it writes its own file instead
+    def reset(self):
+        self.pid = os.getpid()
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.path = os.path.join(self.anomaly_dir, f'anomalies_{self.pid}.jsonl')
+
+    def log(self, stage, code, url, node=None):
+        if self.echo:
+            print(f'ERROR! {code}')
+            print(f'URL : {url}')
+
+        record = {
+            'time' : datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'pid' : os.getpid(),
+            'stage' : stage,
+            'code' : code,
+            'url' : url,
+            'snippet' : make_snippet(node)
+        }
+        with self.lock:
+            if self.pid != os.getpid():
+                self.reset()
+            self.buffer.append(record)
+            if len(self.buffer) >= self.buffer_size or time.monotonic() - self.last_flush >= self.flush_secs:
+                self.flush_locked()
+
+    def flush_locked(self):
+        self.last_flush = time.monotonic()
+        if not self.buffer or self.pid != os.getpid():
+            return
+        lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in self.buffer)
+        os.makedirs(self.anomaly_dir, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+        self.buffer = []
+
+    def flush(self):
+        with self.lock:
+            self.flush_locked()
+
+# One sink per process, flushed at exit.
+# multiprocessing workers skip atexit and clear inherited finalizers, so every process
+# also registers a flush with multiprocessing's own exit hook
+_sink = None
+_sink_pid = None
+_sink_lock = threading.Lock()
+# Benchmarks re-parse the same pages many times; disable() keeps those runs out of the anomaly files
+_disabled = False
+
+def get_sink():
+    global _sink, _sink_pid
+    with _sink_lock:
+        if _sink is None:
+            _sink = AnomalySink()
+            atexit.register(flush)
+        if _sink_pid != os.getpid():
+            _sink_pid = os.getpid()
+            util.Finalize(None, flush, exitpriority=10)
+        return _sink
+
+def log(stage, code, url, node=None):
+    if _disabled:
+        return
+    get_sink().log(stage, code, url, node)
+
+def disable():
+    global _disabled
+    _disabled = True
+
+def flush():
+    if _sink is not None:
+        _sink.flush()
+
+# Every record of every process, file by file
+def load_anomalies(anomaly_dir=ANOMALY_DIR):
+    if not os.path.isdir(anomaly_dir):
+        return
+    for file in sorted(os.listdir(anomaly_dir)):
+        if not file.endswith('.jsonl'):
+            continue
+        with open(os.path.join(anomaly_dir, file), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line of a process that was killed
+                    continue
+
+# known : {url : reason} of issues that cannot be fixed in the parser (error_smart.ERROR_URLS)
+def aggregate(anomalies, known=None):
+    known = known or {}
+    counts = Counter()
+    urls = {}
+    snippets = {}
+    for record in anomalies:
+        key = (record['stage'], record['code'])
+        counts[key] += 1
+        urls.setdefault(key, set()).add(record['url'])
+        if record.get('snippet') and key not in snippets:
+            snippets[key] = record['snippet']
+
+    groups = []
+    for (stage, code), count in counts.most_common():
+        key_urls = sorted(urls[(stage, code)])
+        groups.append({
+            'stage' : stage,
+            'code' : code,
+            'count' : count,
+            'urls' : key_urls,
+            'known' : {url : known[url] for url in key_urls if url in known},
+            'snippet' : snippets.get((stage, code), '')
+        })
+
+    all_urls = set(url for key_urls in urls.values() for url in key_urls)
+    return {
+        'total' : sum(counts.values()),
+        'urls' : len(all_urls),
+        'unknown_urls' : len(all_urls - set(known)),
+        'groups' : groups
+    }
+
+def write_report(anomaly_dir=ANOMALY_DIR, report_path=REPORT_FILE, known=None):
+    report = aggregate(load_anomalies(anomaly_dir), known)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    return report
+
+def print_report(report):
+    print(f"Anomalies : {report['total']} on {report['urls']} pages ({report['unknown_urls']} not known)")
+    for group in report['groups']:
+        print(f"{group['stage']:>12} | {group['code']:<20} | {group['count']:>5} | {len(group['urls'])} pages, {len(group['known'])} known")
+
+if __name__ == "__main__":
+    print_report(write_report())
@@ -0,0 +1,223 @@
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import do_scraping
+import do_scraping_async
+import html_cache
+import crawl_telemetry
+import replay_server
+
+# End-to-end crawler benchmark against replay_server, without touching the site.
+# The vers recorded in the HTML cache are crawled to their end (the first not-found page) in three modes:
+# - serial   : one page after another, like do_scraping.py
+# - threaded : vers at the same time in a thread pool, NUM_WINDOW pages of a ver at once
+# - async    : do_scraping_async.AsyncCrawler.crawl_ver for every ver at once
+# Every mode fetches with http_client and parses with do_scraping.parse_ptcg_kr, without the HTML cache.
+# Reported per mode: cards/sec, p50/p99 page latency (fetch + parse), CPU ms per card of the crawler process.
+# The server runs in its own process, so its CPU is not counted.
+#
+# --save-baseline stores the results; later runs are compared with it and a mode whose cards/sec
+# dropped (or CPU per card rose) by more than TOLERANCE is reported as a regression, with exit code 1.
+#   python bench_crawl.py --cache-dir ./html_cache/ --save-baseline
+#   python bench_crawl.py --cache-dir ./html_cache/ --error-rate 0.02 --slow-rate 0.05 --slow-secs 0.2
+
+MODES = ['serial', 'threaded', 'async']
+PORT = 8765
+MAX_WORKERS = 16
+NUM_WINDOW = do_scraping_async.NUM_WINDOW
+BASELINE_FILE = './bench_crawl_baseline.json'
+TOLERANCE = 0.15
+
+# (category, year, ver) of every 10-digit card URL in the cache
+def find_vers(cache_dir, url_head=do_scraping.URL_HEAD):
+    vers = set()
+    for url in html_cache.HtmlCache(cache_dir).urls():
+        match = re.fullmatch(re.escape(url_head) + r'([A-Z]+)(\d{4})(\d{3})(\d{3})', url)
+        if match:
+            vers.add((match.group(1), int(match.group(2)), int(match.group(3))))
+    return sorted(vers)
+
+# Telemetry that also keeps every page's fetch and parse time, for percentiles
+class PageTimer(crawl_telemetry.Telemetry):
+    def __init__(self):
+        super().__init__(do_scraping.fetch_ptcg_kr, do_scraping.parse_ptcg_kr, path=None, prom_path=None)
+        self.fetch_times = {}
+        self.parse_times = {}
+
+    def fetch(self, url, cache=None):
+        start = time.perf_counter()
+        html = super().fetch(url, cache)
+        self.fetch_times[url] = time.perf_counter() - start
+        return html
+
+    def parse(self, html, url, backend=None):
+        start = time.perf_counter()
+        result = super().parse(html, url, backend)
+        self.parse_times[url] = time.perf_counter() - start
+        return result
+
+    def page_secs(self):
+        return [secs + self.parse_times.get(url, 0) for url, secs in self.fetch_times.items()]
+
+def crawl_serial(url_head, vers, timer, max_workers, num_window):
+    cards = 0
+    for category, year, ver in vers:
+        num = 1
+        while True:
+            url = do_scraping.build_url(url_head, category, year, ver, num)
+            card_data, state = do_scraping.scrape_ptcg_kr(url, None, timer)
+            if state == "fail":
+                break
+            cards += 1
+            num += 1
+    return cards
+
+def crawl_threaded(url_head, vers, timer, max_workers, num_window):
+    # Separate pools for vers and pages, so a ver waiting on its pages never holds a page worker
+    page_executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def crawl_ver(ver_key):
+        category, year, ver = ver_key
+        cards = 0
+        num = 1
+        while True:
+            urls = [do_scraping.build_url(url_head, category, year, ver, num + i) for i in range(num_window)]
+            for card_data, state in page_executor.map(lambda url: do_scraping.scrape_ptcg_kr(url, None, timer), urls):
+                if state == "fail":
+                    return cards
+                cards += 1
+            num += num_window
+
+    with ThreadPoolExecutor(max_workers=max(1, len(vers))) as ver_executor:
+        cards = sum(ver_executor.map(crawl_ver, vers))
+    page_executor.shutdown()
+    return cards
+
+def crawl_async(url_head, vers, timer, max_workers, num_window):
+    async def crawl():
+        crawler = do_scraping_async.AsyncCrawler(url_head=url_head, max_concurrency=max_workers,
+                                                 per_host_concurrency=max_workers, per_host_interval=0,
+                                                 num_window=num_window, telemetry=timer)
+        try:
+            results = await asyncio.gather(*(crawler.crawl_ver(category, year, ver) for category, year, ver in vers))
+        finally:
+            crawler.executor.shutdown(wait=False)
+        return sum(len(data_json) for data_json in results)
+
+    return asyncio.run(crawl())
+
+CRAWLERS = {
+    'serial' : crawl_serial,
+    'threaded' : crawl_threaded,
+    'async' : crawl_async,
+}
+
+def percentile(values, q):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+def run_mode(mode, url_head, vers, max_workers=MAX_WORKERS, num_window=NUM_WINDOW):
+    timer = PageTimer()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    cards = CRAWLERS[mode](url_head, vers, timer, max_workers, num_window)
+    cpu_secs = time.process_time() - cpu_start
+    wall_secs = time.perf_counter() - wall_start
+
+    page_secs = timer.page_secs()
+    return {
+        'mode' : mode,
+        'cards' : cards,
+        'pages' : len(page_secs),
+        'secs' : round(wall_secs, 3),
+        'cards_per_sec' : round(cards / wall_secs, 2) if wall_secs > 0 else 0,
+        'p50_ms' : round(percentile(page_secs, 50) * 1000, 2),
+        'p99_ms' : round(percentile(page_secs, 99) * 1000, 2),
+        'cpu_ms_per_card' : round(cpu_secs / cards * 1000, 3) if cards else 0
+    }
+
+# Modes slower than the baseline by more than tolerance, as messages
+def find_regressions(results, baseline, tolerance=TOLERANCE):
+    regressions = []
+    for result in results:
+        base = baseline.get(result['mode'])
+        if base is None:
+            continue
+        if result['cards_per_sec'] < base['cards_per_sec'] * (1 - tolerance):
+            regressions.append(f"{result['mode']} : {result['cards_per_sec']} cards/sec, baseline {base['cards_per_sec']}")
+        if result['cpu_ms_per_card'] > base['cpu_ms_per_card'] * (1 + tolerance):
+            regressions.append(f"{result['mode']} : {result['cpu_ms_per_card']} CPU ms/card, baseline {base['cpu_ms_per_card']}")
+    return regressions
+
+def start_server(cache_dir, port, slow_rate, slow_secs, error_rate, seed=0):
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(
+        target=replay_server.serve,
+        args=(cache_dir, '127.0.0.1', port, slow_rate, slow_secs, error_rate, seed, ready),
+        daemon=True
+    )
+    server.start()
+    if not ready.wait(timeout=60):
+        server.terminate()
+        raise RuntimeError('replay server did not start')
+    return server
+
+def print_results(results):
+    print(f"{'mode':>10} | {'cards':>6} | {'pages':>6} | {'secs':>8} | {'cards/s':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'CPU ms/card':>11}")
+    for r in results:
+        print(f"{r['mode']:>10} | {r['cards']:>6} | {r['pages']:>6} | {r['secs']:>8} | {r['cards_per_sec']:>8} | "
+              f"{r['p50_ms']:>8} | {r['p99_ms']:>8} | {r['cpu_ms_per_card']:>11}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the crawler against a local replay of the HTML cache.')
+    parser.add_argument('--cache-dir', default=do_scraping.HTML_CACHE_DIR)
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    parser.add_argument('--window', type=int, default=NUM_WINDOW)
+    parser.add_argument('--slow-rate', type=float, default=0.0)
+    parser.add_argument('--slow-secs', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    vers = find_vers(args.cache_dir)
+    print(f'{len(vers)} vers in {args.cache_dir}')
+
+    server = start_server(args.cache_dir, args.port, args.slow_rate, args.slow_secs, args.error_rate)
+    url_head = replay_server.replay_url_head(args.port)
+    try:
+        results = [run_mode(mode, url_head, vers, args.workers, args.window) for mode in args.modes]
+    finally:
+        server.terminate()
+
+    print_results(results)
+    if len(set(r['cards'] for r in results)) > 1:
+        print('Card counts differ between modes')
+        sys.exit(1)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({r['mode'] : r for r in results}, f, ensure_ascii=False, indent=4)
+        print(f'Baseline saved to {args.baseline}')
+    else:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            baseline = {}
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f'REGRESSION {message}')
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,304 @@
+import re
+import gc
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tracemalloc
+from bs4 import BeautifulSoup # type: ignore
+
+import do_scraping
+import html_cache
+import fixture_pages
+import card_page
+import anomaly_sink
+import pokemon_ptcg_kr
+import trainers_ptcg_kr
+import energy_ptcg_kr
+import card_rules
+
+# Micro-benchmark of the card page parser functions over a fixed corpus of saved pages.
+# The corpus is a list of card URLs (CORPUS_FILE) whose pages are read from the HTML cache,
+# or with --fixtures every committed fixture page (fixture_pages.py), which needs no cache.
+# --make-corpus picks up to PER_GROUP pages of every (year, era, supertype, layout) in the cache,
+# era being DP, BW, XY, SM, S or SV (from the regulation mark) and layout 'V-UNION', 'prism star',
+# 'attack tool' or 'regular'; the groups are printed, and missing eras and layouts are reported.
+# --capture-fixtures picks FIXTURE_PER_GROUP pages of every group the same way and copies them into the fixture pages.
+#
+# Functions measured, each over the corpus pages it applies to:
+#   soup                        BeautifulSoup(html, 'lxml'), which every bs4 parse starts with
+#   pokemon/trainers/energy.parse
+#   pokemon/trainers/energy.check_card_number
+#   make_cardID                 on the parsed Pokémon records (the other supertypes just return the name)
+# Every call gets a fresh CardPage, so the lookups remembered by CardPage are never reused between calls.
+# Reported per function:
+#   us_per_call  best of REPEAT passes (like timeit), gc off while timing
+#   peak_kb      mean tracemalloc peak of one call, in a separate pass (gc off too)
+#
+# --save-baseline stores the results with a hash of the corpus (URLs and page bodies); later runs on the same corpus flag
+# functions slower than the baseline by more than TOLERANCE, or allocating more than ALLOC_TOLERANCE
+# over it, and exit with code 1.
+#   python bench_parsers.py --make-corpus
+#   python bench_parsers.py --save-baseline
+#   python bench_parsers.py
+#   python bench_parsers.py --fixtures --save-baseline
+
+CORPUS_FILE = './bench_parsers_corpus.json'
+BASELINE_FILE = './bench_parsers_baseline.json'
+PER_GROUP = 2
+FIXTURE_PER_GROUP = 1
+REPEAT = 5
+TOLERANCE = 0.15
+# tracemalloc peaks hardly vary between runs, so a smaller change is already a regression
+ALLOC_TOLERANCE = 0.05
+REQUIRED_LAYOUTS = ['V-UNION', 'prism star', 'attack tool']
+REQUIRED_ERAS = ['DP', 'BW', 'XY', 'SM', 'S', 'SV']
+
+# Regulation mark -> era. Promos and basic energy have no mark ('?')
+ERAS = {
+    'DP' : 'DP', 'BW' : 'BW', 'XY' : 'XY',
+    'A' : 'SM', 'B' : 'SM', 'C' : 'SM',
+    'D' : 'S', 'E' : 'S', 'F' : 'S',
+    'G' : 'SV', 'H' : 'SV', 'I' : 'SV',
+}
+
+PARSERS = {
+    '포켓몬' : pokemon_ptcg_kr,
+    '트레이너스' : trainers_ptcg_kr,
+    '에너지' : energy_ptcg_kr,
+}
+MODULE_NAMES = {
+    '포켓몬' : 'pokemon',
+    '트레이너스' : 'trainers',
+    '에너지' : 'energy',
+}
+
+def url_year(url):
+    match = re.search(r'(\d{4})\d{6}$', url)
+    return match.group(1) if match else '?'
+
+def page_era(data):
+    return ERAS.get(data.get('regulationMark', ''), '?')
+
+def page_layout(data):
+    subtypes = data.get('subtypes', [])
+    if 'V-UNION' in subtypes:
+        return 'V-UNION'
+    if '프리즘스타' in subtypes or '◇' in data.get('name', ''):
+        return 'prism star'
+    if 'attack' in data:
+        return 'attack tool'
+    return 'regular'
+
+def page_group(url, data):
+    return f"{url_year(url)} {page_era(data)} {MODULE_NAMES[data['supertype']]} {page_layout(data)}"
+
+# Card pages, parsed once: [(url, html, soup, data)]
+# get_html : url -> html or None (HtmlCache.get, or dict.get over the fixture pages)
+def load_pages(get_html, urls):
+    pages = []
+    for url in urls:
+        html = get_html(url)
+        if html is None:
+            print(f'Not in the cache : {url}')
+            continue
+        data, state = do_scraping.parse_ptcg_kr(html, url, 'bs4')
+        if state != "success" or data.get('supertype') not in PARSERS:
+            continue
+        pages.append((url, html, BeautifulSoup(html, 'lxml'), data))
+    return pages
+
+def make_corpus(cache_dir=do_scraping.HTML_CACHE_DIR, per_group=PER_GROUP):
+    cache = html_cache.HtmlCache(cache_dir)
+    groups = {}
+    for url, html, soup, data in load_pages(cache.get, sorted(cache.urls())):
+        key = page_group(url, data)
+        if len(groups.setdefault(key, [])) < per_group:
+            groups[key].append(url)
+    return {key : groups[key] for key in sorted(groups)}
+
+# Capture per_group pages of every group of the cache as fixture pages (fixture_pages.py), described by their group
+def capture_fixtures(cache_dir=do_scraping.HTML_CACHE_DIR, per_group=FIXTURE_PER_GROUP, fixture_dir=fixture_pages.FIXTURE_DIR):
+    corpus = make_corpus(cache_dir, per_group)
+    captured = 0
+    for key, urls in corpus.items():
+        for url in urls:
+            if fixture_pages.capture(url[len(do_scraping.URL_HEAD):], key, cache_dir, fixture_dir):
+                captured += 1
+    return corpus, captured
+
+def corpus_urls(corpus):
+    return [url for urls in corpus.values() for url in urls]
+
+# Eras and layouts none of the group keys has
+def missing_coverage(keys):
+    keys = [key.split(' ') for key in keys]
+    missing_eras = [era for era in REQUIRED_ERAS if not any(key[1] == era for key in keys)]
+    missing_layouts = [layout for layout in REQUIRED_LAYOUTS if not any(' '.join(key[3:]) == layout for key in keys)]
+    return missing_eras, missing_layouts
+
+def print_missing_coverage(keys):
+    missing_eras, missing_layouts = missing_coverage(keys)
+    for era in missing_eras:
+        print(f'No {era} page in the corpus')
+    for layout in missing_layouts:
+        print(f'No {layout} page in the corpus')
+
+# URLs and page bodies: a page that changed in the cache is another corpus
+def corpus_hash(pages):
+    lines = sorted(url + ' ' + html_cache.hash_body(html) for url, html, soup, data in pages)
+    return hashlib.sha1('\n'.join(lines).encode('utf-8')).hexdigest()
+
+# name -> list of calls
+def make_cases(pages):
+    cases = {'soup' : []}
+    for supertype, module_name in MODULE_NAMES.items():
+        cases[f'{module_name}.parse'] = []
+        cases[f'{module_name}.check_card_number'] = []
+    cases['make_cardID'] = []
+
+    for url, html, soup, data in pages:
+        module = PARSERS[data['supertype']]
+        module_name = MODULE_NAMES[data['supertype']]
+        cases['soup'].append(lambda html=html: BeautifulSoup(html, 'lxml'))
+        cases[f'{module_name}.parse'].append(lambda module=module, soup=soup, url=url: module.parse(soup, url))
+        cases[f'{module_name}.check_card_number'].append(
+            lambda module=module, soup=soup: module.check_card_number(card_page.CardPage(soup)))
+        if data['supertype'] == '포켓몬':
+            cases['make_cardID'].append(lambda data=data: card_rules.make_cardID(data))
+    return {name : calls for name, calls in cases.items() if calls}
+
+def time_calls(calls, repeat=REPEAT):
+    passes = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for call in calls:
+                call()
+            passes.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return min(passes) / len(calls)
+
+def trace_calls(calls):
+    peaks = []
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        for call in calls:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            call()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return sum(peaks) / len(peaks), max(peaks)
+
+def run_benchmarks(pages, repeat=REPEAT):
+    results = {}
+    for name, calls in make_cases(pages).items():
+        secs_per_call = time_calls(calls, repeat)
+        mean_peak, max_peak = trace_calls(calls)
+        results[name] = {
+            'calls' : len(calls),
+            'us_per_call' : round(secs_per_call * 1e6, 2),
+            'peak_kb' : round(mean_peak / 1024, 2),
+            'max_peak_kb' : round(max_peak / 1024, 2)
+        }
+    return results
+
+def find_regressions(results, baseline, tolerance=TOLERANCE, alloc_tolerance=ALLOC_TOLERANCE):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['us_per_call'] > base['us_per_call'] * (1 + tolerance):
+            regressions.append(f"{name} : {result['us_per_call']} us/call, baseline {base['us_per_call']}")
+        if result['peak_kb'] > base['peak_kb'] * (1 + alloc_tolerance):
+            regressions.append(f"{name} : {result['peak_kb']} KiB peak, baseline {base['peak_kb']}")
+    return regressions
+
+def print_results(results, baseline=None):
+    baseline = baseline or {}
+    print(f"{'function':>28} | {'calls':>5} | {'us/call':>10} | {'base':>10} | {'peak KiB':>9} | {'max KiB':>9}")
+    for name, r in results.items():
+        base = baseline.get(name, {}).get('us_per_call', '-')
+        print(f"{name:>28} | {r['calls']:>5} | {r['us_per_call']:>10} | {base:>10} | {r['peak_kb']:>9} | {r['max_peak_kb']:>9}")
+
+def load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def save_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Micro-benchmark the card page parsers over a fixed page corpus.')
+    parser.add_argument('--cache-dir', default=do_scraping.HTML_CACHE_DIR)
+    parser.add_argument('--corpus', default=CORPUS_FILE)
+    parser.add_argument('--fixtures', action='store_true', help='benchmark the committed fixture pages instead of a cache corpus')
+    parser.add_argument('--make-corpus', action='store_true')
+    parser.add_argument('--capture-fixtures', action='store_true', help='copy one cached page per group into the fixture pages')
+    parser.add_argument('--per-group', type=int, default=PER_GROUP)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    anomaly_sink.disable()
+
+    if args.make_corpus:
+        corpus = make_corpus(args.cache_dir, args.per_group)
+        save_json(args.corpus, corpus)
+        for key, urls in corpus.items():
+            print(f'{key:>34} : {len(urls)}')
+        print_missing_coverage(corpus)
+        print(f'{len(corpus_urls(corpus))} pages saved to {args.corpus}')
+        sys.exit(0)
+
+    if args.capture_fixtures:
+        corpus, captured = capture_fixtures(args.cache_dir)
+        print_missing_coverage(corpus)
+        print(f'{captured} pages captured to {fixture_pages.FIXTURE_DIR}')
+        sys.exit(0)
+
+    if args.fixtures:
+        fixtures = fixture_pages.load_pages()
+        pages = load_pages(fixtures.get, list(fixtures))
+    else:
+        corpus = load_json(args.corpus)
+        if corpus is None:
+            print(f'No corpus at {args.corpus}, run with --make-corpus first')
+            sys.exit(1)
+        pages = load_pages(html_cache.HtmlCache(args.cache_dir).get, corpus_urls(corpus))
+    print(f'{len(pages)} pages in the corpus')
+    print_missing_coverage([page_group(url, data) for url, html, soup, data in pages])
+
+    results = run_benchmarks(pages, args.repeat)
+    baseline = load_json(args.baseline)
+    if baseline is not None and baseline['corpus'] != corpus_hash(pages):
+        print('The baseline was measured on another corpus, not comparing')
+        baseline = None
+
+    print_results(results, baseline['functions'] if baseline else None)
+
+    if args.save_baseline:
+        save_json(args.baseline, {'corpus' : corpus_hash(pages), 'functions' : results})
+        print(f'Baseline saved to {args.baseline}')
+    elif baseline is not None:
+        regressions = find_regressions(results, baseline['functions'], args.tolerance)
+        for message in regressions:
+            print(f'REGRESSION {message}')
+        if regressions:
+            sys.exit(1)
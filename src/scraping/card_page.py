@@ -0,0 +1,93 @@
+# Parsed card page shared by pokemon_ptcg_kr, trainers_ptcg_kr and energy_ptcg_kr.
+# Wraps a soup (or one of its tags) and remembers every find / find_all / get_text,
+# so a node looked up by several checks is located once:
+#   page.get_text('div', class_='pokemon-info') is searched once for do_scraping, the subtype and the keywords
+# Blocks inside the page (e.g. one div.ability) get their own CardPage with page.section(tag),
+# and card_rules.check_ability / check_attack / check_rule share its lookups (see AbilityBlock).
+
+class CardPage:
+    def __init__(self, node):
+        self.node = node
+        self.nodes = {}
+        self.texts = {}
+        self.sections = {}
+
+    # Parsers take a soup or a CardPage
+    @classmethod
+    def of(cls, node):
+        if isinstance(node, cls):
+            return node
+        return cls(node)
+
+    def find(self, name, class_=None, id=None):
+        key = ('find', name, class_, id)
+        if key not in self.nodes:
+            self.nodes[key] = self.node.find(name, **find_attrs(class_, id))
+        return self.nodes[key]
+
+    def find_all(self, name, class_=None, id=None):
+        key = ('find_all', name, class_, id)
+        if key not in self.nodes:
+            self.nodes[key] = self.node.find_all(name, **find_attrs(class_, id))
+        return self.nodes[key]
+
+    # get_text() of the first matching node. Fails like find(...).get_text() if there is none
+    def get_text(self, name, class_=None, id=None):
+        key = (name, class_, id)
+        if key not in self.texts:
+            self.texts[key] = self.find(name, class_, id).get_text()
+        return self.texts[key]
+
+    # CardPage of a tag inside this page
+    def section(self, tag):
+        key = id(tag)
+        if key not in self.sections:
+            self.sections[key] = CardPage(tag)
+        return self.sections[key]
+
+def find_attrs(class_, id):
+    attrs = {}
+    if class_ is not None:
+        attrs['class_'] = class_
+    if id is not None:
+        attrs['id'] = id
+    return attrs
+
+# div.ability of a Pokémon as card_rules.check_ability / check_attack / check_rule read it.
+# block: CardPage of the div, so the three checks share its lookups
+class AbilityBlock:
+    def __init__(self, block):
+        self.block = block
+        self.node = block.node
+
+    def skill_label(self):
+        if self.block.find('span', id='skill_label'):
+            return self.block.get_text('span', id='skill_label')
+        return None
+
+    def skill_label_tail(self):
+        return self.block.find('span', id='skill_label').next_sibling
+
+    def skil_name(self):
+        if self.block.find('span', class_='skil_name'):
+            return self.block.get_text('span', class_='skil_name')
+        return None
+
+    def text(self):
+        if self.block.find('p'):
+            return self.block.get_text('p')
+        return None
+
+    def area(self):
+        return self.block.section(self.block.find('div', class_='area-parent'))
+
+    def costs(self):
+        return [img['title'] for img in self.area().find_all('img')]
+
+    def area_plus(self):
+        return self.area().find('span', class_='plus') is not None
+
+    def damage(self):
+        if self.block.find('span', class_='plus'):
+            return self.block.get_text('span', class_='plus')
+        return None
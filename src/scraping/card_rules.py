@@ -0,0 +1,721 @@
+import re
+from urllib.parse import urlparse, unquote
+
+import pokedex_ptcg_kr
+import anomaly_sink
+
+# Card text rules shared by both parser backends:
+# - BeautifulSoup: pokemon_ptcg_kr, trainers_ptcg_kr, energy_ptcg_kr
+# - lxml: lxml_ptcg_kr
+# The backends only select nodes and read their text; what the text means (rule text, subtypes,
+# keywords, card IDs) is decided here, so a fix to a rule applies to both.
+#
+# Functions take the texts a backend read. The card text blocks of a Pokémon (div.ability)
+# go through check_ability / check_attack / check_rule, which read the block through:
+#   block.node              the block, for anomaly records
+#   block.skill_label()     text of span#skill_label, None if there is none
+#   block.skill_label_tail() text right after span#skill_label
+#   block.skil_name()       text of span.skil_name, None if there is none
+#   block.text()            text of the first p, None if there is none
+#   block.costs()           titles of the imgs in div.area-parent
+#   block.area_plus()       whether div.area-parent has a span.plus
+#   block.damage()          text of span.plus, None if there is none
+
+# Stages of the parsers in the anomaly records
+POKEMON_STAGE = 'pokemon'
+TRAINERS_STAGE = 'trainers'
+ENERGY_STAGE = 'energy'
+
+# Supertype from the text of div.pokemon-info, checked in this order
+TRAINERS_KEYWORDS = ['아이템', '포켓몬의 도구', '서포트', '서포터', '스타디움']
+ENERGY_KEYWORDS = ['기본 에너지', '특수 에너지']
+POKEMON_KEYWORDS = ['포켓몬', '복원','V-UNION','레벨업']
+
+TYPES_ORI = ['풀','불꽃','물','번개','초','격투','악','강철','드래곤','페어리','무색','0코스트','플러스']
+TYPES = ['(풀)','(불꽃)','(물)','(번개)','(초)','(격투)','(악)','(강철)','(드래곤)','(페어리)','(무색)','(0코)','(플러스)']
+TYPES_DICT = dict(zip(TYPES_ORI, TYPES))
+
+# Pokémon cards may have the following rules:
+# Level-Up, EX, Mega Evolution, BREAK, GX, TAG TEAM, Prism Star, V, VMAX, V-UNION, VSTAR, Radiant, ex
+POKEMON_RULE_TEXT = {
+    '레벨업' : [
+        "이 카드는 배틀필드의 포켓몬에 겹쳐서 레벨업시킨다.",
+        "레벨업 전의 기술 포켓파워도 사용할 수 있고 포켓바디도 작용한다."],
+    'EX' : ["포켓몬 EX가 기절한 경우 상대는 프라이즈를 2장 가져간다."],
+    'M진화' : ["M진화 포켓몬으로 진화하면 자신의 차례는 끝난다."],
+    'BREAK' : ["BREAK진화 전의 제르네아스가 가진 「기술 ･ 특성 ･ 약점 ･ 저항력 ･ 후퇴」를 이어받는다."],
+    'GX' : ["포켓몬 GX가 기절한 경우 상대는 프라이즈를 2장 가져간다."],
+    'TAG' : ["TAG TEAM이 기절한 경우 상대는 프라이즈를 3장 가져간다."],
+    '프리즘스타' : [
+        "같은 이름의 (프리즘스타) (프리즘스타)의 카드는 덱에 1장만 넣을 수 있다.",
+        "트래쉬가 아닌 로스트존에 둔다."],
+    'V' : ["포켓몬 V가 기절한 경우 상대는 프라이즈를 2장 가져간다."],
+    'VMAX' : ["포켓몬 VMAX가 기절한 경우 상대는 프라이즈를 3장 가져간다."],
+    'V-UNION' : [
+        "포켓몬 [V-UNION]이 기절한 경우 상대는 프라이즈를 3장 가져간다.",
+        "대전 중에 1번 자신의 차례에 자신의 트래쉬에 있는 4종류의 V-UNION 포켓몬을 조합하여 벤치로 내보낸다."],
+    'VSTAR' : ["포켓몬 VSTAR가 기절한 경우 상대는 프라이즈를 2장 가져간다."],
+    '찬란한' : ["찬란한 포켓몬은 덱에 1장만 넣을 수 있다."],
+    'ex' : ["포켓몬 ex가 기절한 경우 상대는 프라이즈를 2장 가져간다."]
+}
+
+# Canonical rule text used for display
+POKEMON_RULE_TEXT_SHOW = POKEMON_RULE_TEXT
+
+RULE_KEYWORDS = ['레벨업', 'EX', 'M진화', 'BREAK', 'GX', 'TAG TEAM', '프리즘스타', 'V', 'VMAX', 'V-UNION', 'VSTAR', '찬란한', 'ex']
+
+# The card page format varies wildly card to card!
+# Collected rule text found in card text sections
+# These are used to determine the subtype from card text
+TRAINERS_RULE_TEXT = {
+    '아이템' : ["아이템은 자신의 차례에 몇 장이라도 사용할 수 있다."],
+    '포켓몬의 도구' : [
+        "포켓몬의 도구는 자신의 포켓몬에게 붙여서 사용한다.",
+        "포켓몬 1마리에게 1장만 붙일 수 있고 붙인 채로 둔다.",
+        "포켓몬의 도구는 자신의 차례에 몇 장이라도 자신의 포켓몬에게 붙일 수 있다.",
+        "포켓몬은 이 카드에 적혀 있는 기술을 사용할 수 있다",
+        "이 카드를 붙이고 있는"
+    ],
+    '서포트' : ["서포트는 자신의 차례에 1장만 사용할 수 있다."],
+    '스타디움' : [
+        "스타디움은 자신의 차례에 1장 배틀필드 옆에 내놓을 수 있다.",
+        "다른 스타디움이 필드에 나오면 이 카드를 트래쉬한다.",
+        "같은 이름의 스타디움은 필드에 내보낼 수 없다.",
+        "다른 이름의 스타디움이 필드에 나오면 이 카드를 트래쉬한다.",
+        "스타디움은 자신의 차례에 1장만 배틀필드 옆에 내놓을 수 있다."],
+    'ACE SPEC' : ['ACE SPEC 카드는 덱에 1장만 넣을 수 있다.'],
+    '프리즘스타' : [
+        "같은 이름의 (프리즘스타) (프리즘스타)의 카드는 덱에 1장만 넣을 수 있다.",
+        "트래쉬가 아닌 로스트존에 둔다."]
+}
+
+# Canonical rule text used for display
+TRAINERS_RULE_TEXT_SHOW = {
+    '아이템' : ["아이템은 자신의 차례에 몇 장이라도 사용할 수 있다."],
+    '포켓몬의 도구' : [
+        "포켓몬의 도구는 자신의 포켓몬에게 붙여서 사용한다.",
+        "포켓몬 1마리에게 1장만 붙일 수 있고 붙인 채로 둔다.",
+    ],
+    '서포트' : ["서포트는 자신의 차례에 1장만 사용할 수 있다."],
+    '스타디움' : [
+        "스타디움은 자신의 차례에 1장 배틀필드 옆에 내놓을 수 있다.",
+        "다른 스타디움이 필드에 나오면 이 카드를 트래쉬한다.",
+        "같은 이름의 스타디움은 필드에 내보낼 수 없다.",
+    ],
+    'ACE SPEC' : ['ACE SPEC 카드는 덱에 1장만 넣을 수 있다'],
+    '프리즘스타' : [
+        "같은 이름의 ◇ (프리즘스타) 의 카드는 덱에 1장만 넣을 수 있다.",
+        "트래쉬가 아닌 로스트존에 둔다."]
+}
+
+# Energy cards only carry the ACE SPEC and Prism Star rules
+ENERGY_RULE_TEXT = {key : TRAINERS_RULE_TEXT[key] for key in ['ACE SPEC', '프리즘스타']}
+ENERGY_RULE_TEXT_SHOW = {key : TRAINERS_RULE_TEXT_SHOW[key] for key in ['ACE SPEC', '프리즘스타']}
+
+# Seal Stone tools: the site shows no attack for them, so the VSTAR power is written out here
+SEAL_STONE_TEXTS = ['이 카드를 붙이고 있는 「포켓몬 V」는 이 VSTAR 파워를 사용할 수 있다.']
+SEAL_STONE_ATTACKS = {
+    '숲의 봉인석' : {
+        'name' : '스타알케미',
+        'text' : '자신의 차례에 사용할 수 있다. 자신의 덱에서 원하는 카드를 1장 선택해서 패로 가져온다. 그리고 덱을 섞는다. (대전 중 자신은 VSTAR 파워를 1번만 사용할 수 있다.)'
+    },
+    '하늘의 봉인석' : {
+        'name' : '스타오더',
+        'text' : '자신의 차례에 사용할 수 있다. 이 차례에 자신의 기본 포켓몬인 「포켓몬 V」가 사용하는 기술의 데미지로 상대 배틀필드의 「포켓몬 VSTAR ・ VMAX」가 기절했다면 프라이즈를 1장 더 가져온다. (대전 중 자신은 VSTAR 파워를 1번만 사용할 수 있다.)'
+    }
+}
+
+def type_format(type_):
+    if type_ in TYPES_ORI:
+        return TYPES_DICT[type_]
+    else:
+        return '(?)'
+
+# Parser module name of the card type text, None for an invalid card type
+def card_supertype(card_type):
+    if any(keyword in card_type for keyword in TRAINERS_KEYWORDS):
+        return 'trainers'
+    elif any(keyword in card_type for keyword in ENERGY_KEYWORDS):
+        return 'energy'
+    elif any(keyword in card_type for keyword in POKEMON_KEYWORDS):
+        return 'pokemon'
+    return None
+
+# Fields every supertype has
+
+# Product code or regulation mark from its symbol image URL
+def symbol_code(symbol_url):
+    return unquote(urlparse(symbol_url).path.split('/')[-1]).split('.')[0]
+
+def split_card_number(collectionInfo):
+    # case1: 011/034 -> ['011','034']
+    # case2: 011/SV-P -> ['011','SV-P']
+    # case3: SV-P -> ['000','SV-P']
+    pattern = r'(\d+)/(\d+)'
+    match = re.search(pattern, collectionInfo)
+    if match:
+        number = match.group(1)
+        prodNumber = match.group(2)
+    else:
+        collectionInfo_list = collectionInfo.split('/')
+        if len(collectionInfo_list) == 2:
+            number = collectionInfo_list[0].strip()
+            prodNumber = collectionInfo_list[1].strip().split()[0]
+        else:
+            number = '000'
+            prodNumber = collectionInfo_list[0].strip().split()[0]
+
+    return number, prodNumber
+
+def is_promo(prodCode, prodName):
+    if 'promo' in prodCode:
+        return True
+    elif '프로모' in prodName:
+        return True
+    else:
+        return False
+
+# Returns (id, prodCode)
+def card_id(prodCode, prodName, number, prodNumber):
+    # Promo cards have a different classification on the website
+    # id_ = prodNumber + "-" + number
+    # prodCode = prodNumber fix
+    if is_promo(prodCode, prodName):
+        return prodNumber + "-" + number, prodNumber
+    return prodCode + "-" + number, prodCode
+
+def artist_name(artist_text):
+    return artist_text.strip().split(' ', 1)[-1]
+
+def rarity(rare_text):
+    if rare_text.strip() == "":
+        return 'N'
+    return rare_text.strip()
+
+# Card name of a Pokémon; remove anything in [brackets] including the brackets
+def pokemon_name(name_text):
+    name = name_text.replace('(프리즘스타)',' ◇').replace('플라스마단','').replace('\n',' ')
+    return re.sub(r'\[.*?\]', '', name).strip()
+
+# Card name of a Trainers or Energy card
+def card_name(name_text):
+    return name_text.replace('(프리즘스타)','◇').replace('플라스마단','')
+
+# Card text of Trainers and Energy cards as a list of sentences, from the texts of the p tags
+# Join split lines that end with ')'
+# e.g. "(Hello.)" -> "(Hello", ")" -> "(Hello)"
+def split_card_texts(p_texts):
+    texts = []
+    for p_text in p_texts:
+        lines = p_text.split('.')
+        for i in range(len(lines)):
+            line = lines[i].strip()
+            if line.startswith(')'):
+                line = line.lstrip(')')
+                texts[-1] = texts[-1] + ')'
+            if line.strip():
+                texts.append(line.strip() + '.')
+    return texts
+
+# Keywords: Future, Ancient, Fusion, Single Strike, Rapid Strike, Team Plasma, TAG TEAM
+# Future and Ancient appear in div.pokemon-info
+## Exceptions: Awakened Drum / Ancient, Reboot Pod / Future
+# Fusion, Single Strike, Rapid Strike appear in:
+## 1. div.pokemon-info
+## 2. Card name
+# Team Plasma appears in div.pokemon-info
+# Some Plasma energy cards do not contain '플라스마단'
+# TAG TEAM: 1. div.pokemon-info contains "TAG"
+# tag_team_once: TAG TEAM is not added again if the rules already added it (Pokémon)
+def check_keyword(subtypes, info_text, name_text, tag_team_once=False):
+    keyword_list_info = ['미래','고대','퓨전','일격','연격','TAG','플라스마단']
+
+    # 1. Check div.pokemon-info
+    for keyword in keyword_list_info:
+        if keyword in info_text:
+            if keyword != 'TAG':
+                subtypes.append(keyword)
+            elif not tag_team_once or 'TAG TEAM' not in subtypes:
+                subtypes.append('TAG TEAM')
+
+    # 2. Check span.card-hp title
+    keyword_list_name = ['퓨전','일격','연격','플라스마단']
+    for keyword in keyword_list_name:
+        if keyword in name_text:
+            if keyword not in subtypes:
+                subtypes.append(keyword)
+
+def check_pokemon_keyword(subtypes, info_text, name_text):
+    check_keyword(subtypes, info_text, name_text, tag_team_once=True)
+
+def check_trainers_keyword(subtypes, info_text, name_text):
+    check_keyword(subtypes, info_text, name_text)
+
+    # 3. Handle two special exception cards
+    keyword_name_exception = ['각성의 드럼', '리부트 포드']
+    if keyword_name_exception[0] in name_text:
+        subtypes.append('고대')
+    elif keyword_name_exception[1] in name_text:
+        subtypes.append('미래')
+
+def check_energy_keyword(subtypes, info_text, name_text):
+    check_keyword(subtypes, info_text, name_text)
+
+    # 3. Edge cases
+    if '플라스마단' not in subtypes:
+        if '플라스마 에너지' in name_text:
+            subtypes.append('플라스마단')
+    if '일격' not in subtypes:
+        if '임팩트 에너지' in name_text:
+            subtypes.append('일격')
+
+# Pokémon
+
+# Evolution stage from the text of div.pokemon-info, None if not found
+def evo_subtype(info_text):
+    evo_list = ['기본','1진화','2진화','V진화','복원','레벨업','M진화','BREAK진화','V-UNION']
+    for subtype in evo_list:
+        if subtype in info_text:
+            return subtype
+    return None
+
+def hp_value(hp_text):
+    return int(hp_text.replace('HP', '').strip())
+
+def flavor_text(text):
+    ## Exception handling
+    if text == 'n/a':
+        return ''
+    return text
+
+def check_ability(block, abilities, url):
+    type_ = block.skill_label()
+    if type_ is not None:
+        ability_ = {}
+
+        name = ''
+        text = block.text()
+        if text is not None:
+            text = text.replace('\n', ' ').strip()
+        else:
+            text = ''
+            anomaly_sink.log(POKEMON_STAGE, 'ability text', url, block.node)
+        special = ''
+
+        if type_ == '포켓파워' or type_ == '포켓바디':
+            name = block.skill_label_tail().strip()
+        elif type_ == '특성':
+            name = block.skil_name().replace('[특성]','').strip()
+            if 'VSTAR' in name:
+                name = name.split('\n')[1].strip()
+                special = 'VSTAR'
+
+        ability_['name'] = name
+        ability_['text'] = text
+        ability_['type'] = type_
+        if special:
+            ability_['special'] = special
+
+        abilities.append(ability_)
+        return True
+
+    skil_name = block.skil_name()
+    if skil_name is None:
+        return False
+
+    if '고대능력' in skil_name:
+        type_ = '고대능력'
+        name = skil_name.replace('[고대능력]','').strip()
+    elif '테라스탈' in skil_name:
+        type_ = '테라스탈'
+        name = '테라스탈'
+    else:
+        return None
+
+    abilities.append({
+        'name' : name,
+        'text' : block.text().replace('\n', ' ').strip(),
+        'type' : type_
+    })
+    return True
+
+def check_attack(block, attacks):
+    cost_titles = block.costs()
+    if not cost_titles and not block.area_plus():
+        return False
+
+    name = block.skil_name()
+    # Prism Star rule text gets categorized as an attack on the website
+    if '프리즘스타' in name:
+        return False
+
+    attack = {}
+
+    name = name.strip()
+    cost = ''
+    damage = ''
+    text = ''
+    special = ''
+
+    if block.text() is not None:
+        text = block.text()
+
+    if not cost_titles:
+        cost += '정보없음'
+    for cost_title in cost_titles:
+        cost += type_format(cost_title)
+
+    damage_text = block.damage()
+    if damage_text is not None:
+        damage = damage_text.strip()
+
+    if 'VSTAR' in name:
+        special = 'VSTAR'
+        # VSTAR Power removal needed but not possible due to website issue
+    if 'GX' in name:
+        special = 'GX'
+
+    # Sometimes rules get parsed as attacks due to website issues
+    for RULE_KEY in RULE_KEYWORDS:
+        if RULE_KEY in name:
+            if text == POKEMON_RULE_TEXT[RULE_KEY][0]:
+                return False
+
+    attack['name'] = name
+    attack['cost'] = cost
+    attack['damage'] = damage
+    attack['text'] = text
+    if special:
+        attack['special'] = special
+
+    attacks.append(attack)
+    return True
+
+def check_rule(block, rules, subtypes):
+    # No img in 'area-parent' and certain text found in span tag, or Prism Star Pokémon
+    rule_name = block.skil_name().strip()
+    rule_shortpath = any(RULE_KEY in rule_name for RULE_KEY in RULE_KEYWORDS)
+
+    if not (rule_shortpath or (not block.costs() and (
+        '룰' in rule_name or
+        'V-UNION' in rule_name
+    )) or '프리즘스타' in rule_name):
+        return False
+
+    rule = 'not found'
+    if block.text() is not None:
+        rule = block.text().replace('\n', ' ')
+    else:
+        for keyword in RULE_KEYWORDS:
+            if keyword in rule_name:
+                rule = ' '.join(POKEMON_RULE_TEXT[keyword])
+
+    if rule == 'not found':
+        return False
+    rules.append(rule)
+
+    # 'V' appears in VMAX, V-UNION, and VSTAR, so handle separately
+    if 'V가' in rule:
+        subtypes.append('V')
+
+    # M-Evolution and BREAK Evolution are already added
+    subtype_exceptions = ['V','M진화','BREAK','V-UNION']
+    for KEYWORD in RULE_KEYWORDS:
+        if KEYWORD in subtype_exceptions:
+            continue
+        elif KEYWORD in rule:
+            if KEYWORD not in subtypes:
+                subtypes.append(KEYWORD)
+
+    return True
+
+# POKEDEX['pokemon_name'] = pokedex_number
+def check_pokemons(pokemons, name):
+    # Prefixes
+    prefixs = ['찬란한','빛나는','M','오리진','원시','연격','일격','블랙','화이트','마그마단의','아쿠아단의','백마','흑마','지우','EX','로켓단의','V','울트라','GX','아머드']
+    for prefix in prefixs:
+        name = name.replace(prefix, '')
+    name = name.strip()
+
+    # Regional form prefixes
+    regions = ['가라르','팔데아','알로라','히스이']
+    region = ''
+    for item in regions:
+        if item in name:
+            name = name.replace(item, '').strip()
+            region = item
+
+    # Suffixes, TAG TEAM
+    poke_names = name.split(' ')[0].split('&')
+
+    # Whether a Pokémon name was found in the card name
+    result = False
+
+    for poke_name in poke_names:
+        if poke_name in pokedex_ptcg_kr.POKEDEX:
+            pokemon = {}
+            pokemon['name'] = poke_name
+            pokemon['pokedexNumber'] = pokedex_ptcg_kr.POKEDEX[poke_name]
+            if region:
+                pokemon['region'] = region
+            pokemons.append(pokemon)
+            result = True
+
+    # Special handling for Rotom
+    if '로토무' in name:
+        pokemon = {}
+        pokemon['name'] = '로토무'
+        pokemon['pokedexNumber'] = pokedex_ptcg_kr.POKEDEX['로토무']
+        pokemons.append(pokemon)
+        result = True
+
+    # Special handling for Pikachu
+    if '피카츄' in name:
+        pokemon = {}
+        pokemon['name'] = '피카츄'
+        pokemon['pokedexNumber'] = pokedex_ptcg_kr.POKEDEX['피카츄']
+        pokemons.append(pokemon)
+        result = True
+
+    # Special handling for Koko
+    if '코코' in name:
+        pokemon = {}
+        pokemon['name'] = '코코'
+        pokemon['pokedexNumber'] = -1
+        pokemons.append(pokemon)
+        result = True
+
+    return result
+
+def to_three_digit(x):
+    if x >= 100 :
+        return str(x)
+    elif x >= 10 :
+        return "0" + str(x)
+    else :
+        return "00" + str(x)
+
+# Assign Pokémon card ID
+# Cards may be reprints or high-rarity variants with the same stats but different physical prints.
+# id : unique identifier for a physical card print
+# cardID : unique identifier for a card's abstract stats/effect
+# Format: first 2 chars of Pokémon name + first char of type + HP (3 digits) + first 2 chars of first attack + damage (3 digits, including 0)
+def make_cardID_old(pokemons, type_, hp, attacks):
+    cardID = ''
+
+    # First 2 chars of Pokémon name
+    # Special cases for 1-character names (Mew and Togepi only)
+    pokemon_name = pokemons[0]['name']
+    if len(pokemon_name) == 1:
+        if pokemon_name == '뮤':
+            cardID += '뮤우'
+        elif pokemon_name == '삐':
+            cardID += '삐이'
+        else:
+            cardID += pokemon_name + pokemon_name
+    else:
+        cardID += pokemon_name[:2]
+
+    # First char of type
+    cardID += re.sub(r'\((.*?)\)', lambda m: m.group(1)[0], type_)
+
+    # HP as 3 digits
+    cardID += to_three_digit(hp)
+
+    # First 2 chars of first attack name + damage as 3 digits
+    # Handle case of no attacks
+    if len(attacks) != 0:
+        attack_name = attacks[0]['name']
+        cardID += attack_name[:2]
+
+        attack_damage = attacks[0]['damage']
+        if attack_damage:
+            cardID += to_three_digit(int(re.findall(r'\d+', attack_damage)[0]))
+        else:
+            cardID += to_three_digit(0)
+    else:
+        cardID += '없음'
+        cardID += '000'
+
+    return cardID
+
+def make_cardID(item):
+    supertype = item.get('supertype', '?')
+    if supertype == '?':
+        print("ERROR : supertype")
+        print(item['url'])
+    elif supertype != '포켓몬':
+        return item['name']
+    else:
+        cardID = ''
+        pokemons = item['pokemons']
+        type_ = item['type']
+        hp = item['hp']
+        attacks = item['attacks']
+        abilitites = item['abilities']
+
+        # Handle case where no Pokémon was identified
+        if not pokemons or len(pokemons) == 0:
+            return 'UNKNOWN_POKEMON'
+
+        # First 2 chars of Pokémon name
+        # Special cases for 1-character names (Mew and Togepi only)
+        pokemon_name = pokemons[0]['name']
+        if len(pokemon_name) == 1:
+            if pokemon_name == '뮤':
+                cardID += '뮤우'
+            elif pokemon_name == '삐':
+                cardID += '삐이'
+            else:
+                cardID += pokemon_name + pokemon_name
+        else:
+            cardID += pokemon_name[:2]
+
+        # First char of type
+        cardID += re.sub(r'\((.*?)\)', lambda m: m.group(1)[0], type_)
+
+        # HP as 3 digits
+        cardID += to_three_digit(hp)
+
+        # If ability exists, first 2 chars of the first ability name
+        if len(abilitites) != 0:
+            abil_name = abilitites[0]['name'].replace(' ', '').strip()
+            if len(abil_name) == 1:
+                cardID += abil_name + abil_name
+            else:
+                cardID += abil_name[:2]
+
+        # First 2 chars of each attack name + damage as 3 digits
+        # Handle case of no attacks
+        # Repeat 1-char attack names, strip spaces
+        if len(attacks) != 0:
+            for i in range(len(attacks)):
+                attack_name = attacks[i]['name'].replace(' ', '').strip()
+                if len(attack_name) == 1:
+                    cardID += attack_name + attack_name
+                else:
+                    cardID += attack_name[:2]
+
+                attack_damage = attacks[i]['damage']
+                if attack_damage:
+                    cardID += to_three_digit(int(re.findall(r'\d+', attack_damage)[0]))
+                else:
+                    cardID += to_three_digit(0)
+        else:
+            cardID += '없음'
+            cardID += '000'
+
+        return cardID
+
+# Trainers
+
+def trainers_subtype(texts, info_text):
+    subtype_list = ['포켓몬의 도구','서포트','스타디움','아이템']
+
+    for text in texts:
+        for subtype in subtype_list:
+            for keyphrase in TRAINERS_RULE_TEXT[subtype]:
+                if keyphrase in text:
+                    return subtype
+
+    # If only effects are present in texts, check <div class="pokemon-info">
+    for subtype in subtype_list:
+        if subtype in info_text:
+            return subtype
+
+    # If still not found, default to Item
+    return '아이템'
+
+def texts_and_rules(texts, rules, subtypes, rule_text, rule_text_show):
+    # Check for ACE SPEC and Prism Star rule text and remove from texts
+    for key in ['ACE SPEC','프리즘스타']:
+        if rule_text[key][0] in texts:
+            subtypes.append(key)
+            texts = [item for item in texts if item not in rule_text[key]]
+            rules.extend(rule_text_show[key])
+
+    return texts, rules, subtypes
+
+def trainers_texts_and_rules(texts, rules, subtypes):
+    # Remove rule text for the primary subtype from texts
+    texts = [item for item in texts if item not in TRAINERS_RULE_TEXT[subtypes[0]]]
+    rules.extend(TRAINERS_RULE_TEXT_SHOW[subtypes[0]])
+
+    # For Pokémon Tool, also remove Item rule text
+    if subtypes[0] == '포켓몬의 도구':
+        texts = [item for item in texts if item not in TRAINERS_RULE_TEXT['아이템']]
+        rules.extend(TRAINERS_RULE_TEXT_SHOW['아이템'])
+
+    return texts_and_rules(texts, rules, subtypes, TRAINERS_RULE_TEXT, TRAINERS_RULE_TEXT_SHOW)
+
+def is_attack_tool(subtypes, texts, name):
+    if subtypes[0] != '포켓몬의 도구':
+        return False
+
+    ATTACK_KEYPHRASE = '이 카드에 적혀 있는 기술을 사용할 수 있다'
+    SEAL = '봉인석'
+    Z_CRYS = 'Z'
+
+    for text in texts:
+        if ATTACK_KEYPHRASE in text:
+            return True
+
+    if SEAL in name:
+        return True
+    elif Z_CRYS in name:
+        return True
+
+    return False
+
+# Attack of a Pokémon Tool. labels: (text of h4.left label, titles of its imgs, text of the first p or None)
+# for every div.ability whose label has cost imgs. Returns (attack, whether one was found, texts)
+def tool_attack(labels, texts, name_text):
+    attack = {}
+    attack['name'] = ''
+    attack['cost'] = ''
+    attack['damage'] = ''
+    attack['text'] = ''
+    result = False
+
+    for label_text, cost_titles, text in labels:
+        label_words = label_text.strip().split(' ')
+        name = label_words[-2]
+        cost = ''
+
+        for cost_title in cost_titles:
+            cost += type_format(cost_title)
+
+        attack['name'] = name
+        attack['cost'] = cost
+        attack['damage'] = label_words[-1]
+        attack['text'] = text if text is not None else ''
+        if 'VSTAR' in name:
+            attack['special'] = 'VSTAR'
+            # VSTAR Power removal needed but not possible due to website issue
+
+        result = True
+
+    # Handle Seal Stone items
+    if name_text in SEAL_STONE_ATTACKS:
+        attack.update(SEAL_STONE_ATTACKS[name_text])
+        attack['special'] = 'VSTAR'
+        texts = list(SEAL_STONE_TEXTS)
+        result = True
+
+    return attack, result, texts
+
+# Energy
+
+def energy_subtype(info_text):
+    subtype_list = ['특수 에너지','기본 에너지']
+
+    # Check <div class="pokemon-info"> for subtype
+    for subtype in subtype_list:
+        if subtype in info_text:
+            return subtype
+
+    # Default to Basic Energy if not found
+    return '기본 에너지'
+
+def energy_texts_and_rules(texts, rules, subtypes):
+    return texts_and_rules(texts, rules, subtypes, ENERGY_RULE_TEXT, ENERGY_RULE_TEXT_SHOW)
@@ -0,0 +1,81 @@
+import sys
+import json
+import time
+import argparse
+
+import do_scraping
+import html_cache
+import fixture_pages
+import anomaly_sink
+
+# Equivalence check of the card page parsers over the saved page corpus (the HTML cache),
+# or over the committed fixture pages with --fixtures (see fixture_pages.py):
+# every page is parsed by each backend, and the records must be exactly the same
+# (compared as dumped JSON, so key order counts too). Parse time of each backend is printed,
+# the best of REPEAT parses of every page.
+#   python compare_parser_backends.py --fixtures
+
+BACKENDS = ['bs4', 'lxml']
+REPEAT = 1
+
+def dump_result(result):
+    return json.dumps(result, ensure_ascii=False, sort_keys=False)
+
+# Pages of the HTML cache: (url, html)
+def cache_pages(cache_dir=do_scraping.HTML_CACHE_DIR):
+    cache = html_cache.HtmlCache(cache_dir)
+    for url in cache.urls():
+        html = cache.get(url)
+        if html is not None:
+            yield url, html
+
+def compare_backends(pages_iter, backends=BACKENDS, repeat=REPEAT):
+    parse_times = {backend : 0.0 for backend in backends}
+    pages = 0
+    mismatch_urls = []
+
+    for url, html in pages_iter:
+        pages += 1
+
+        results = []
+        for backend in backends:
+            best_time = None
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                result = do_scraping.parse_ptcg_kr(html, url, backend)
+                elapsed = time.perf_counter() - start_time
+                if best_time is None or elapsed < best_time:
+                    best_time = elapsed
+            parse_times[backend] += best_time
+            results.append(dump_result(result))
+
+        if any(result != results[0] for result in results[1:]):
+            mismatch_urls.append(url)
+            print(f"MISMATCH : {url}")
+
+    return pages, mismatch_urls, parse_times
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Check that every parser backend gives the same records.')
+    parser.add_argument('--cache-dir', default=do_scraping.HTML_CACHE_DIR)
+    parser.add_argument('--fixtures', action='store_true', help='use the committed fixture pages instead of the cache')
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    args = parser.parse_args()
+
+    if args.fixtures:
+        # The fixtures hold an invalid card type page on purpose; keep it out of the anomaly files
+        anomaly_sink.disable()
+        pages_iter = fixture_pages.load_pages().items()
+    else:
+        pages_iter = cache_pages(args.cache_dir)
+
+    pages, mismatch_urls, parse_times = compare_backends(pages_iter, repeat=args.repeat)
+
+    print(f"Pages : {pages}")
+    print(f"Mismatches : {len(mismatch_urls)}")
+    for backend, parse_time in parse_times.items():
+        per_page = parse_time / pages * 1000 if pages else 0
+        print(f"{backend} : {round(parse_time, 2)} secs, {round(per_page, 3)} ms/page")
+
+    if mismatch_urls:
+        sys.exit(1)
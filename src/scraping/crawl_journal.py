@@ -0,0 +1,98 @@
+import os
+import json
+import threading
+
+# Append-only JSONL journal of a crawl.
+# Every scraped page is written as one line as soon as it is parsed:
+#   {"category", "year", "ver", "num", "url", "state", "card"}
+# Error pages ("fail") are journaled too, so a resumed crawl also knows where each ver ended.
+# With resume=True the journal is read back and get() returns the journaled result,
+# so an interrupted crawl skips every URL it already did.
+# Per-ver card lists are read back with ver_cards(); the crawlers save them with do_scraping.save_ver_json.
+#
+# The journal does not import the crawler: scrape() calls the scrape_func it was given,
+#   journal = CrawlJournal(JOURNAL_FILE, resume=RESUME, scrape_func=lambda url: do_scraping.scrape_ptcg_kr(url, cache))
+
+# Every parsed page is appended to the journal at once.
+# RESUME = True continues an interrupted crawl, skipping every URL already journaled
+JOURNAL_FILE = './crawl_journal.jsonl'
+RESUME = False
+
+class CrawlJournal:
+    def __init__(self, path=JOURNAL_FILE, resume=False, scrape_func=None):
+        self.path = path
+        self.scrape_func = scrape_func
+        self.entries = {}
+        # (category, year, ver) -> {num : entry}
+        self.ver_entries = {}
+        self.lock = threading.Lock()
+
+        if resume and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Last line cut off by the crash
+                        continue
+                    self.add_entry(entry)
+            print(f"Resume : {len(self.entries)} pages already journaled")
+
+        self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def add_entry(self, entry):
+        self.entries[entry['url']] = entry
+        key = (entry['category'], entry['year'], entry['ver'])
+        self.ver_entries.setdefault(key, {})[entry['num']] = entry
+
+    # Journaled (card_data, state) of url, or None
+    def get(self, url):
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        return entry['card'], entry['state']
+
+    def append(self, category, year, ver, num, url, card_data, state):
+        entry = {
+            'category' : category,
+            'year' : year,
+            'ver' : ver,
+            'num' : num,
+            'url' : url,
+            'state' : state,
+            'card' : card_data
+        }
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            self.add_entry(entry)
+
+    # Journaled result if present, otherwise scrape and journal it
+    def scrape(self, category, year, ver, num, url):
+        result = self.get(url)
+        if result is not None:
+            return result
+        card_data, state = self.scrape_func(url)
+        self.append(category, year, ver, num, url, card_data, state)
+        return card_data, state
+
+    # Every journaled (category, year, ver)
+    def vers(self):
+        return sorted(self.ver_entries)
+
+    # Cards of a ver in num order, up to the first error page like the crawl loop.
+    # Pages fetched past the end by the async crawl's window are left out
+    def ver_cards(self, category, year, ver):
+        entries = self.ver_entries.get((category, year, ver), {})
+
+        data_json = []
+        for num in sorted(entries):
+            entry = entries[num]
+            if entry['state'] != "success":
+                break
+            data_json.append(entry['card'])
+        return data_json
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,143 @@
+import os
+import re
+import json
+import hashlib
+from datetime import datetime
+
+import do_scraping
+
+# Persistent record of every known (category, year, ver):
+#   cardNum : cards saved for the ver
+#   lastNum : last valid num of the ver
+#   gaps : holes in the num range, [first missing num, last missing num]
+#   lastCrawl : when the ver was last crawled
+#   pageHashes : {num : hash of the page}, used to tell whether a re-crawl changed anything
+#   file : per-ver JSON file holding the cards
+# An empty manifest can be filled from the existing ptcg_kr_card_data tree with bootstrap().
+
+MANIFEST_FILE = './crawl_manifest.json'
+
+# {category}_{year}_{ver}_{card num}.json, as written by do_scraping.save_ver_json
+VER_FILE_PATTERN = re.compile(r'^([A-Z]+)_(\d+)_(\d{3})_(\d{3})\.json$')
+
+def ver_key(category, year, ver):
+    return category + '_' + str(year) + '_' + do_scraping.to_three_digit(ver)
+
+# Hash of the raw page if it is in the HTML cache, otherwise of the parsed card
+def page_hash(url, card_data, cache=None):
+    if cache is not None:
+        meta = cache.get_meta(url)
+        if meta:
+            return meta['hash']
+    card_text = json.dumps(card_data, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(card_text.encode('utf-8')).hexdigest()
+
+class CrawlManifest:
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = path
+        self.vers = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.vers = json.load(f)
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.vers, f, ensure_ascii=False, indent=4, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def get(self, category, year, ver):
+        return self.vers.get(ver_key(category, year, ver))
+
+    def known_years(self, category):
+        return sorted(set(item['year'] for item in self.vers.values() if item['category'] == category))
+
+    def known_vers(self, category, year):
+        return sorted(item['ver'] for item in self.vers.values() if item['category'] == category and item['year'] == year)
+
+    # Sets are numbered by release year, so no ver is added to a year once a later year has vers.
+    # Year 0000 is never closed
+    def is_closed_year(self, category, year):
+        years = self.known_years(category)
+        return year != 0 and year in years and years[-1] > year
+
+    # Returns True if the ver is new or its cards changed since the last crawl
+    def update(self, category, year, ver, card_num, last_num, gaps, page_hashes, file_path):
+        key = ver_key(category, year, ver)
+        old = self.vers.get(key)
+
+        changed = (
+            old is None or
+            old['cardNum'] != card_num or
+            old['pageHashes'] != page_hashes
+        )
+
+        self.vers[key] = {
+            'category' : category,
+            'year' : year,
+            'ver' : ver,
+            'cardNum' : card_num,
+            'lastNum' : last_num,
+            'gaps' : gaps,
+            'lastCrawl' : datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'pageHashes' : page_hashes,
+            'file' : file_path
+        }
+
+        return changed
+
+    # Record a crawl that found no cards, so stalest() moves on to the other vers.
+    # Nothing else changes: the saved cards are kept as they are
+    def touch(self, category, year, ver):
+        item = self.vers.get(ver_key(category, year, ver))
+        if item is not None:
+            item['lastCrawl'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # The n least recently crawled vers of the given categories
+    def stalest(self, n, exclude=(), category_list=None):
+        items = [item for key, item in self.vers.items() if key not in exclude]
+        if category_list is not None:
+            items = [item for item in items if item['category'] in category_list]
+        items = sorted(items, key=lambda x: (x['lastCrawl'], x['category'], x['year'], x['ver']))
+        return items[:n]
+
+    # Register every per-ver file under json_root that is not in the manifest yet.
+    # Files written by do_scraping_exceptions with other names are left out
+    def bootstrap(self, json_root=do_scraping.JSON_ROOT):
+        added = 0
+        for root, dirs, files in os.walk(json_root):
+            for file in sorted(files):
+                match = VER_FILE_PATTERN.match(file)
+                if not match:
+                    continue
+
+                category, year, ver = match.group(1), int(match.group(2)), int(match.group(3))
+                year_dir = os.path.basename(root)
+                category_dir = os.path.basename(os.path.dirname(root))
+                if category != category_dir or str(year) != year_dir:
+                    continue
+
+                file_path = os.path.join(root, file)
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data_json = json.load(f)
+
+                # Crawled vers are already up to date. Keep the larger file if a ver was saved twice
+                key = ver_key(category, year, ver)
+                if key in self.vers and (self.vers[key]['lastCrawl'] or self.vers[key]['cardNum'] >= len(data_json)):
+                    continue
+
+                last_num = max([int(item['cardPageURL'][-3:]) for item in data_json if item['cardPageURL'][-3:].isdigit()], default=0)
+                self.vers[key] = {
+                    'category' : category,
+                    'year' : year,
+                    'ver' : ver,
+                    'cardNum' : len(data_json),
+                    'lastNum' : last_num,
+                    'gaps' : [],
+                    'lastCrawl' : '',
+                    'pageHashes' : {},
+                    'file' : file_path
+                }
+                added += 1
+
+        return added
@@ -0,0 +1,220 @@
+import os
+import json
+import time
+import threading
+from datetime import datetime
+
+# Crawl telemetry: where the time of a crawl goes.
+# Telemetry.fetch / parse / scrape wrap the fetch and parse functions it is given
+# (do_scraping.fetch_ptcg_kr / parse_ptcg_kr) and record
+# - fetch latency and response size of every page (cache revalidations included)
+# - BeautifulSoup build time and total parse time, per supertype ("fail" for error pages, "invalid" for unknown card types)
+# - pages per state, cards per ver, cards/sec over the whole crawl
+# Output:
+# - TELEMETRY_FILE : JSONL, one line per event, appended as it happens
+#     {"event": "fetch", "url", "secs", "bytes"}
+#     {"event": "parse", "url", "state", "supertype", "soup_secs", "secs"}
+#     {"event": "ver", "category", "year", "ver", "cards", "secs"}
+#     {"event": "summary", "pages", "cards", "secs", "cards_per_sec"}   (on close)
+# - PROM_FILE : Prometheus textfile (node_exporter textfile collector) with histograms and counters,
+#   rewritten after every ver and on close
+# The crawlers take a Telemetry with telemetry=...; without one nothing is measured.
+
+TELEMETRY_FILE = './crawl_telemetry.jsonl'
+PROM_FILE = './crawl_telemetry.prom'
+METRIC_PREFIX = 'ptcg_crawl_'
+
+# Label values of parse_seconds; other supertypes (invalid card type pages) are counted as "invalid"
+SUPERTYPES = ['포켓몬', '트레이너스', '에너지']
+
+# Histogram upper bounds
+LATENCY_BUCKETS = [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+PARSE_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1]
+SIZE_BUCKETS = [1024, 4096, 16384, 32768, 65536, 131072, 262144, 524288, 1048576]
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    # Prometheus lines of this histogram, buckets cumulative
+    def prom_lines(self, name, labels=None):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ['+Inf'], self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{prom_labels(labels, le=bound)} {cumulative}')
+        lines.append(f'{name}_sum{prom_labels(labels)} {self.sum}')
+        lines.append(f'{name}_count{prom_labels(labels)} {self.count}')
+        return lines
+
+def prom_escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def prom_labels(labels=None, **extra):
+    labels = dict(labels or {}, **extra)
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{prom_escape(value)}"' for key, value in labels.items()) + '}'
+
+class Telemetry:
+    # fetch_func(url, cache) -> html, parse_func(html, url, backend, timings=) -> (card_data, state)
+    def __init__(self, fetch_func, parse_func, path=TELEMETRY_FILE, prom_path=PROM_FILE):
+        self.fetch_func = fetch_func
+        self.parse_func = parse_func
+        self.path = path
+        self.prom_path = prom_path
+        self.start_time = time.time()
+        self.lock = threading.Lock()
+
+        self.fetch_secs = Histogram(LATENCY_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.soup_secs = Histogram(PARSE_BUCKETS)
+        # supertype -> Histogram
+        self.parse_secs = {}
+        # state -> pages
+        self.pages = {}
+        self.cards = 0
+
+        self.file = open(path, 'a', encoding='utf-8') if path else None
+
+    def write(self, event):
+        if self.file is None:
+            return
+        event['time'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        line = json.dumps(event, ensure_ascii=False) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+
+    def fetch(self, url, cache=None):
+        start = time.perf_counter()
+        html = self.fetch_func(url, cache)
+        secs = time.perf_counter() - start
+        size = len(html.encode('utf-8'))
+
+        with self.lock:
+            self.fetch_secs.observe(secs)
+            self.response_bytes.observe(size)
+        self.write({'event' : 'fetch', 'url' : url, 'secs' : round(secs, 6), 'bytes' : size})
+        return html
+
+    def parse(self, html, url, backend=None):
+        timings = {}
+        start = time.perf_counter()
+        card_data, state = self.parse_func(html, url, backend, timings=timings)
+        secs = time.perf_counter() - start
+        if state != "success":
+            supertype = "fail"
+        elif card_data.get('supertype') in SUPERTYPES:
+            supertype = card_data['supertype']
+        else:
+            supertype = "invalid"
+        soup_secs = timings.get('soup')
+
+        with self.lock:
+            if supertype not in self.parse_secs:
+                self.parse_secs[supertype] = Histogram(PARSE_BUCKETS)
+            self.parse_secs[supertype].observe(secs)
+            if soup_secs is not None:
+                self.soup_secs.observe(soup_secs)
+            self.pages[state] = self.pages.get(state, 0) + 1
+            if state == "success":
+                self.cards += 1
+
+        self.write({
+            'event' : 'parse',
+            'url' : url,
+            'state' : state,
+            'supertype' : supertype,
+            'soup_secs' : round(soup_secs, 6) if soup_secs is not None else None,
+            'secs' : round(secs, 6)
+        })
+        return card_data, state
+
+    def scrape(self, url, cache=None):
+        return self.parse(self.fetch(url, cache), url)
+
+    # Called once a ver is saved; also refreshes the Prometheus file
+    def record_ver(self, category, year, ver, cards, secs):
+        self.write({'event' : 'ver', 'category' : category, 'year' : year, 'ver' : ver, 'cards' : cards, 'secs' : round(secs, 3)})
+        self.write_prom()
+
+    def cards_per_sec(self):
+        elapsed = time.time() - self.start_time
+        return self.cards / elapsed if elapsed > 0 else 0
+
+    def prom_lines(self):
+        p = METRIC_PREFIX
+        lines = []
+        with self.lock:
+            lines.append(f'# HELP {p}fetch_seconds Card page fetch latency, cache revalidation included')
+            lines.append(f'# TYPE {p}fetch_seconds histogram')
+            lines += self.fetch_secs.prom_lines(f'{p}fetch_seconds')
+
+            lines.append(f'# HELP {p}response_bytes Card page body size')
+            lines.append(f'# TYPE {p}response_bytes histogram')
+            lines += self.response_bytes.prom_lines(f'{p}response_bytes')
+
+            lines.append(f'# HELP {p}soup_seconds BeautifulSoup build time per page')
+            lines.append(f'# TYPE {p}soup_seconds histogram')
+            lines += self.soup_secs.prom_lines(f'{p}soup_seconds')
+
+            lines.append(f'# HELP {p}parse_seconds Total parse time per page, by supertype')
+            lines.append(f'# TYPE {p}parse_seconds histogram')
+            for supertype, histogram in sorted(self.parse_secs.items()):
+                lines += histogram.prom_lines(f'{p}parse_seconds', {'supertype' : supertype})
+
+            lines.append(f'# HELP {p}pages_total Parsed pages by state')
+            lines.append(f'# TYPE {p}pages_total counter')
+            for state, count in sorted(self.pages.items()):
+                lines.append(f'{p}pages_total{prom_labels(state=state)} {count}')
+
+            lines.append(f'# HELP {p}cards_total Parsed cards')
+            lines.append(f'# TYPE {p}cards_total counter')
+            lines.append(f'{p}cards_total {self.cards}')
+
+        lines.append(f'# HELP {p}cards_per_second Parsed cards per second since the crawl started')
+        lines.append(f'# TYPE {p}cards_per_second gauge')
+        lines.append(f'{p}cards_per_second {self.cards_per_sec()}')
+        return lines
+
+    def write_prom(self):
+        if not self.prom_path:
+            return
+        # The textfile collector may read at any time, so replace the file at once
+        tmp_path = self.prom_path + '.' + str(os.getpid()) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.prom_lines()) + '\n')
+        os.replace(tmp_path, self.prom_path)
+
+    def summary(self):
+        return {
+            'pages' : sum(self.pages.values()),
+            'cards' : self.cards,
+            'secs' : round(time.time() - self.start_time, 3),
+            'cards_per_sec' : round(self.cards_per_sec(), 3),
+            'fetch_secs' : round(self.fetch_secs.sum, 3),
+            'soup_secs' : round(self.soup_secs.sum, 3),
+            'parse_secs' : {supertype : round(histogram.sum, 3) for supertype, histogram in self.parse_secs.items()}
+        }
+
+    def close(self):
+        summary = self.summary()
+        self.write(dict(summary, event='summary'))
+        self.write_prom()
+        if self.file is not None:
+            self.file.close()
+        return summary
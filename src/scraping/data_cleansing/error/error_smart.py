@@ -1,123 +1,17 @@
 import json
-import csv
-
-error_text = '''
-card text,https://pokemoncard.co.kr/cards/detail/BS2010001045
-card text,https://pokemoncard.co.kr/cards/detail/BS2010002009
-card text,https://pokemoncard.co.kr/cards/detail/BS2010002019
-card text,https://pokemoncard.co.kr/cards/detail/BS2010002026
-card text,https://pokemoncard.co.kr/cards/detail/BS2010002032
-card text,https://pokemoncard.co.kr/cards/detail/BS2010002033
-card text,https://pokemoncard.co.kr/cards/detail/BS2010003006
-card text,https://pokemoncard.co.kr/cards/detail/BS2010004003
-card text,https://pokemoncard.co.kr/cards/detail/BS2010004032
-card text,https://pokemoncard.co.kr/cards/detail/BS2010004035
-card text,https://pokemoncard.co.kr/cards/detail/BS2010005009
-card text,https://pokemoncard.co.kr/cards/detail/BS2010005014
-card text,https://pokemoncard.co.kr/cards/detail/BS2010005033
-card text,https://pokemoncard.co.kr/cards/detail/BS2010006033
-card text,https://pokemoncard.co.kr/cards/detail/BS2010006042
-card text,https://pokemoncard.co.kr/cards/detail/BS2010007019
-card text,https://pokemoncard.co.kr/cards/detail/BS2010007036
-card text,https://pokemoncard.co.kr/cards/detail/BS2010009006
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002001
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002002
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002003
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002004
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002005
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002031
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002032
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002033
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002034
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002035
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002036
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002037
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002043
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013002044
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003004
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003005
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003006
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003028
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003031
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003032
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003033
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003034
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003035
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003036
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003037
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003043
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003044
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003045
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003046
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013003054
-attack tool,https://pokemoncard.co.kr/cards/detail/BS2013005073
-attack tool,https://pokemoncard.co.kr/cards/detail/BS2013005074
-resi value,https://pokemoncard.co.kr/cards/detail/BS2013006087
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002001
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002002
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002007
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002015
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002016
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002018
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002035
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002049
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002052
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002055
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002057
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002060
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002065
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002066
-card text,https://pokemoncard.co.kr/cards/detail/BS2014002071
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003003
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003005
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003018
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003026
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003035
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003039
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003044
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003050
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003060
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003068
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003069
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003072
-card text,https://pokemoncard.co.kr/cards/detail/BS2014003075
-card text,https://pokemoncard.co.kr/cards/detail/BS2016004023
-card text,https://pokemoncard.co.kr/cards/detail/BS2016004025
-card text,https://pokemoncard.co.kr/cards/detail/BS2016004028
-card text,https://pokemoncard.co.kr/cards/detail/BS2016004071
-card text,https://pokemoncard.co.kr/cards/detail/BS2016004071
-card text,https://pokemoncard.co.kr/cards/detail/BS2016004085
-card text,https://pokemoncard.co.kr/cards/detail/BS2016007044
-card text,https://pokemoncard.co.kr/cards/detail/BS2016020012
-artist info,https://pokemoncard.co.kr/cards/detail/BS2018003066
-resi value,https://pokemoncard.co.kr/cards/detail/BS2018004032
-resi value,https://pokemoncard.co.kr/cards/detail/BS2018004033
-resi value,https://pokemoncard.co.kr/cards/detail/BS2018004034
-resi value,https://pokemoncard.co.kr/cards/detail/BS2018004035
-resi value,https://pokemoncard.co.kr/cards/detail/BS2018004047
-weak value,https://pokemoncard.co.kr/cards/detail/BS2018009017
-card text,https://pokemoncard.co.kr/cards/detail/BS2019010013
-attack tool,https://pokemoncard.co.kr/cards/detail/BS2019011044
-attack tool,https://pokemoncard.co.kr/cards/detail/BS2019011045
-card text,https://pokemoncard.co.kr/cards/detail/BS2019012011
-card text,https://pokemoncard.co.kr/cards/detail/BS2019016051
-card text,https://pokemoncard.co.kr/cards/detail/BS2019017032
-ability text,https://pokemoncard.co.kr/cards/detail/BS2019017033
-prod_name,https://pokemoncard.co.kr/cards/detail/BS2020001054
-check pokemons,https://pokemoncard.co.kr/cards/detail/BS2022014067
-attack tool,https://pokemoncard.co.kr/cards/detail/BS2022017091
-attack tool,https://pokemoncard.co.kr/cards/detail/BS2023020055
-attack tool,https://pokemoncard.co.kr/cards/detail/BS2023020056
-attack tool,https://pokemoncard.co.kr/cards/detail/BS2023021061
-attack tool,https://pokemoncard.co.kr/cards/detail/BS2023022061
-card text,https://pokemoncard.co.kr/cards/detail/ST2011005001
-resi value,https://pokemoncard.co.kr/cards/detail/ST2013005005
-card text,https://pokemoncard.co.kr/cards/detail/BS201707028
-'''
-import io
 import re
+import sys
+from pathlib import Path
 from collections import Counter
 
+# 파싱 중 기록된 이상 기록은 src/scraping/anomaly_sink 에서 읽는다
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+import anomaly_sink
+
+# 이 폴더에서 실행할 때의 anomaly_sink 경로
+ANOMALY_DIR = './anomalies/'
+ANOMALY_REPORT = './anomaly_report.json'
+
 def to_three_digit(x):
     if x >= 100 :
         return str(x)
@@ -127,11 +21,8 @@ def to_three_digit(x):
         return "00" + str(x)
     
 def make_error_edit():
-    # error_text를 CSV 데이터로 변환
-    csv_reader = csv.reader(io.StringIO(error_text.strip()))
-
-    # CSV 데이터를 리스트로 변환
-    error_data = list(csv_reader)
+    # 크롤링 중 anomaly_sink 에 쌓인 (code, url). 같은 페이지의 같은 이상은 한번만
+    error_data = sorted(set((record['code'], record['url']) for record in anomaly_sink.load_anomalies(ANOMALY_DIR)))
     json_data = []
     
     for item in error_data:
@@ -226,6 +117,12 @@ ERROR_URLS = {
 'https://pokemoncard.co.kr/cards/detail/SMP000000194' : '일러레 정보 없음, 원래 없음'
 }
 
+# anomaly_sink 의 기록을 (stage, code) 별로 모은 보고서. 이미 아는 에러(ERROR_URLS)는 이유를 같이 적는다
+def make_anomaly_report():
+    report = anomaly_sink.write_report(ANOMALY_DIR, ANOMALY_REPORT, known=ERROR_URLS)
+    anomaly_sink.print_report(report)
+    return report
+
 def make_error_edit2():
     json_data = []
     
@@ -648,6 +545,7 @@ def download_SUN_images():
                 img_f.write(img_res.content)
 
 if __name__ == "__main__":
+    #make_anomaly_report()
     #make_error_edit()
     #make_error_edit2()
     #make_error_edit3()
@@ -0,0 +1,228 @@
+import os
+import re
+import json
+import time
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+
+import do_scraping
+import html_cache
+import http_client
+import crawl_manifest
+import do_scraping_offline
+
+# Card discovery from the site's card search listing, instead of probing detail URLs built from
+# {category}{year}{ver}{num}. The promo ranges (SVP, SMP, SP, PR) and the sets with holes or odd
+# numbering (see do_scraping_exceptions) are listed like every other card, so they need no special case.
+#
+# 1. discover : listing pages LIST_URL?page=1, 2, ... are fetched PAGE_WINDOW at a time, and every
+#               /cards/detail/{id} link on them is collected. Paging stops at the first page that
+#               lists no card not seen before (past the last page the site shows an empty or repeated page)
+# 2. diff     : the listed ids are compared with the cardPageURLs already in ptcg_kr_card_data
+# 3. fetch    : only the new ids are scraped, so no request is spent on a card that does not exist
+# 4. save     : new cards of a ver that already has a per-ver file are merged into it (renamed to the new
+#               card count); new vers get their own file (do_scraping.save_ver_json); ids that are not
+#               {category}{year}{ver}{num} go to {root}{category}/0/{category}_listing.json
+# The ids of each stage are written to DISCOVERY_FILE.
+#
+# The listing address and its query are settings: LIST_URL, LIST_PARAMS, PAGE_PARAM.
+# Only the detail links are read from a listing page, so a change in its layout does not matter.
+# A listing that cannot be right stops the run with ListingError instead of reporting "no new card":
+# page 1 without any detail link (LIST_URL or the link format changed), or page 2 listing exactly
+# the cards of page 1 (PAGE_PARAM is ignored). A listing far shorter than the saved cards
+# (under MIN_LISTED_RATIO of them) is printed as a warning, as the search may have been narrowed.
+
+LIST_URL = "https://pokemoncard.co.kr/cards"
+LIST_PARAMS = {}
+PAGE_PARAM = 'page'
+PAGE_WINDOW = 8
+MAX_PAGES = 5000
+MAX_WORKERS = 8
+DISCOVERY_FILE = './listing_discovery.json'
+MIN_LISTED_RATIO = 0.5
+
+DETAIL_LINK = re.compile(r'/cards/detail/([A-Za-z0-9]+)')
+CARD_ID = re.compile(r'^([A-Z]+)(\d{4})(\d{3})(\d{3})$')
+
+def list_page_url(page, list_url=LIST_URL, params=LIST_PARAMS):
+    return list_url + '?' + urlencode(dict(params, **{PAGE_PARAM : page}))
+
+# Card ids linked from a listing page, in page order, without repeats
+def parse_listing(html):
+    return list(dict.fromkeys(DETAIL_LINK.findall(html)))
+
+def card_id_of(url, url_head=do_scraping.URL_HEAD):
+    return url[len(url_head):] if url.startswith(url_head) else None
+
+# (category, year, ver, num) of a {category}{year}{ver}{num} id, None for the other formats
+def split_card_id(card_id):
+    match = CARD_ID.match(card_id)
+    if not match:
+        return None
+    return match.group(1), int(match.group(2)), int(match.group(3)), int(match.group(4))
+
+class ListingError(RuntimeError):
+    pass
+
+class ListingDiscovery:
+    def __init__(self, list_url=LIST_URL, params=LIST_PARAMS, page_window=PAGE_WINDOW):
+        self.list_url = list_url
+        self.params = params
+        self.page_window = page_window
+        self.executor = ThreadPoolExecutor(max_workers=page_window)
+        self.pages = 0
+
+    # Listing pages change with every new card and are not card pages, so they are kept out of the HTML cache
+    def fetch_page(self, page):
+        return http_client.get(list_page_url(page, self.list_url, self.params)).text
+
+    # Every listed card id, in listing order
+    def discover(self, max_pages=MAX_PAGES):
+        card_ids = {}
+        first_page_ids = None
+        page = 1
+        while page <= max_pages:
+            pages = list(range(page, min(page + self.page_window, max_pages + 1)))
+            for num, html in zip(pages, self.executor.map(self.fetch_page, pages)):
+                self.pages += 1
+                page_ids = parse_listing(html)
+                if num == 1:
+                    if not page_ids:
+                        raise ListingError(f"no card detail link on {list_page_url(1, self.list_url, self.params)}")
+                    first_page_ids = page_ids
+                elif num == 2 and page_ids == first_page_ids:
+                    raise ListingError(f"page 2 lists the same cards as page 1, '{PAGE_PARAM}' is not paging the listing")
+
+                new_ids = [card_id for card_id in page_ids if card_id not in card_ids]
+                if not new_ids:
+                    print(f"listing page {num} : no new card, stop")
+                    return list(card_ids)
+                card_ids.update(dict.fromkeys(new_ids))
+            print(f"listing page {pages[-1]} : {len(card_ids)} cards")
+            page += self.page_window
+        return list(card_ids)
+
+    def close(self):
+        self.executor.shutdown()
+
+# Card ids already saved, and the per-ver file of every ver: ({card id : file}, {ver key : file})
+def load_known_ids(json_root=do_scraping.JSON_ROOT):
+    known = {}
+    ver_files = {}
+    for json_file_path in do_scraping_offline.find_card_data_files(json_root):
+        with open(json_file_path, 'r', encoding='utf-8') as f:
+            data_json = json.load(f)
+        for card_data in data_json:
+            card_id = card_id_of(card_data.get('cardPageURL', ''))
+            if card_id:
+                known.setdefault(card_id, json_file_path)
+
+        match = crawl_manifest.VER_FILE_PATTERN.match(os.path.basename(json_file_path))
+        if match:
+            ver_files[crawl_manifest.ver_key(match.group(1), int(match.group(2)), int(match.group(3)))] = json_file_path
+    return known, ver_files
+
+def scrape_ids(card_ids, cache=None, max_workers=MAX_WORKERS):
+    urls = [do_scraping.URL_HEAD + card_id for card_id in card_ids]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda url: do_scraping.scrape_ptcg_kr(url, cache), urls))
+
+    cards = {}
+    failed = []
+    for card_id, (card_data, state) in zip(card_ids, results):
+        if state == "success":
+            cards[card_id] = card_data
+        else:
+            failed.append(card_id)
+    return cards, failed
+
+def load_json(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_json(path, data_json):
+    json_dir = os.path.dirname(path)
+    if json_dir and not os.path.exists(json_dir):
+        os.makedirs(json_dir)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data_json, f, ensure_ascii=False, indent=4)
+
+# Cards are kept in num order, like a crawl of the ver (sets that borrow nums of another ver stay in place)
+def card_num(card_data):
+    num = card_data['cardPageURL'][-3:]
+    return int(num) if num.isdigit() else 0
+
+# Writes the new cards into ptcg_kr_card_data. Returns the written files
+def save_cards(cards, ver_files, json_root=do_scraping.JSON_ROOT):
+    groups = {}
+    for card_id, card_data in cards.items():
+        parts = split_card_id(card_id)
+        if parts:
+            category, year, ver, num = parts
+            key = ('ver', category, year, ver)
+        else:
+            key = ('other', re.match(r'^[A-Z]*', card_id).group(0) or 'ETC')
+        groups.setdefault(key, []).append(card_data)
+
+    written = []
+    for key, new_cards in sorted(groups.items()):
+        if key[0] == 'other':
+            category = key[1]
+            json_file_path = json_root + category + '/0/' + category + '_listing.json'
+            save_json(json_file_path, load_json(json_file_path) + new_cards)
+            written.append(json_file_path)
+            continue
+
+        _, category, year, ver = key
+        old_path = ver_files.get(crawl_manifest.ver_key(category, year, ver))
+        data_json = sorted(load_json(old_path) + new_cards if old_path else new_cards, key=card_num)
+        json_file_path = do_scraping.save_ver_json(json_root, category, year, ver, data_json)
+        # The card count is part of the file name, so the old file is replaced
+        if old_path and os.path.abspath(old_path) != os.path.abspath(json_file_path):
+            os.remove(old_path)
+        written.append(json_file_path)
+    return written
+
+def discover_new_cards(json_root=do_scraping.JSON_ROOT, cache_dir=do_scraping.HTML_CACHE_DIR,
+                       max_pages=MAX_PAGES, max_workers=MAX_WORKERS, dry_run=False, discovery_file=DISCOVERY_FILE):
+    discovery = ListingDiscovery()
+    try:
+        listed = discovery.discover(max_pages)
+    finally:
+        discovery.close()
+
+    known, ver_files = load_known_ids(json_root)
+    new_ids = [card_id for card_id in listed if card_id not in known]
+    print(f"Listed : {len(listed)} cards on {discovery.pages} pages, known : {len(known)}, new : {len(new_ids)}")
+    if len(listed) < len(known) * MIN_LISTED_RATIO:
+        print(f"WARNING : the listing shows {len(listed)} cards but {len(known)} are saved, check LIST_PARAMS")
+
+    report = {
+        'listed' : len(listed),
+        'known' : len(known),
+        'new' : new_ids,
+        # Saved cards the listing does not show (removed from the site, or not searchable)
+        'unlisted' : sorted(set(known) - set(listed)),
+        'failed' : [],
+        'files' : []
+    }
+    if new_ids and not dry_run:
+        cache = html_cache.HtmlCache(cache_dir)
+        cards, report['failed'] = scrape_ids(new_ids, cache, max_workers)
+        report['files'] = save_cards(cards, ver_files, json_root)
+        for json_file_path in report['files']:
+            print(f"Data has been successfully saved to {json_file_path}")
+        for card_id in report['failed']:
+            print(f"FAIL : {do_scraping.URL_HEAD + card_id}")
+
+    with open(discovery_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    return report
+
+if __name__ == "__main__":
+    start_time = time.time()
+    report = discover_new_cards()
+    print(f"New cards : {len(report['new'])}, failed : {len(report['failed'])}, files : {len(report['files'])}")
+    print(f"Total time : {round(time.time() - start_time, 2)} secs")
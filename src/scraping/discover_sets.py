@@ -0,0 +1,248 @@
+import json
+import time
+from datetime import datetime
+
+import do_scraping
+import html_cache
+import crawl_manifest
+
+# Finds where each set (ver) ends without walking it card by card, and which vers exist in a year.
+#
+# Last num of a ver: galloping search (1, 2, 4, 8, ... until an error page), then binary search
+# between the last valid num and the first error page. About 2*log2(n) probes instead of n+1.
+# The binary search assumes every num up to the end is valid. Sets with holes in their URLs
+# (see parse_alola, parse_VMAXCLIMAX in do_scraping_exceptions) are handled in two ways:
+# - after the end is found, GAP_LOOKAHEAD more nums are probed; a valid one means a hole, and the search continues past it
+# - holes inside the found range show up as error pages when the ver is crawled
+# Both kinds are recorded in the boundary file.
+#
+# Galloping only pays off when the ver is not crawled afterwards: its log2(n) error-page probes are dead
+# requests, while a crawl fetches every num anyway. When a crawl follows, walk_ver_range() walks
+# num 1, 2, 3, ... like do_scraping.py does, and only the first error page (plus GAP_LOOKAHEAD) is extra.
+#
+# Vers of a year: as in do_scraping.py, a year ends once more than VER_TERMI_COUNT vers in a row are missing.
+# Every ver in that run is probed, since set numbers can skip any amount.
+#
+# What a previous run already knows (a CrawlManifest, filled from the per-ver files by bootstrap()) is not probed again:
+# - known vers count as valid without probing their num 1
+# - a known ver is walked at least up to its lastNum, and without GAP_LOOKAHEAD if it had no gaps
+#
+# Probe results are memoized per ver, so pages seen while searching are not fetched again by the crawl.
+# They are dropped once the ver is crawled (or found missing), so a run keeps only the ver in hand.
+
+GAP_LOOKAHEAD = 2
+BOUNDARY_FILE = './set_boundaries.json'
+
+# is_valid(num) -> bool, lo: a num known to be valid (0 if none)
+# Returns the last valid num reached by galloping from lo, 0 if num lo+1 is already invalid
+def find_last_num(is_valid, lo=0):
+    step = 1
+    hi = lo + step
+    while is_valid(hi):
+        lo = hi
+        step *= 2
+        hi = lo + step
+
+    # lo is valid (or 0), hi is invalid
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if is_valid(mid):
+            lo = mid
+        else:
+            hi = mid
+
+    return lo
+
+# Returns (last num, gaps found past the first end), gaps as [first missing num, last missing num]
+def find_ver_range(is_valid, gap_lookahead=GAP_LOOKAHEAD):
+    gaps = []
+    last = find_last_num(is_valid)
+    if last == 0:
+        return 0, gaps
+
+    while True:
+        next_valid = None
+        for num in range(last + 2, last + 2 + gap_lookahead):
+            if is_valid(num):
+                next_valid = num
+                break
+
+        if next_valid is None:
+            return last, gaps
+
+        gaps.append([last + 1, next_valid - 1])
+        last = find_last_num(is_valid, next_valid)
+
+# Like find_ver_range, but walks num 1, 2, 3, ... one by one: every valid num is probed
+# (and reused by the crawl), so only 1 + gap_lookahead probes per ver are dead.
+# known_last: nums up to it are crawled anyway, so an error page among them does not end the walk
+def walk_ver_range(is_valid, gap_lookahead=GAP_LOOKAHEAD, known_last=0):
+    gaps = []
+    last = 0
+    num = 1
+    while True:
+        while True:
+            if is_valid(num):
+                last = num
+            elif num > known_last:
+                break
+            num += 1
+        if last == 0:
+            return 0, gaps
+
+        next_valid = None
+        for probe in range(last + 2, last + 2 + gap_lookahead):
+            if is_valid(probe):
+                next_valid = probe
+                break
+
+        if next_valid is None:
+            return last, gaps
+
+        gaps.append([last + 1, next_valid - 1])
+        last = next_valid
+        num = next_valid + 1
+
+# is_valid_ver(ver) -> bool, known_vers: vers known to be valid, not probed
+# Returns the valid vers from start_ver, stopping once more than termi_count vers in a row are missing
+def find_vers(is_valid_ver, start_ver=0, termi_count=do_scraping.VER_TERMI_COUNT, known_vers=()):
+    vers = []
+    ver = start_ver
+    missing = 0
+
+    while missing <= termi_count:
+        if ver in known_vers or is_valid_ver(ver):
+            vers.append(ver)
+            missing = 0
+        else:
+            missing += 1
+        ver += 1
+
+    return vers
+
+class SetDiscovery:
+    # manifest: CrawlManifest of a previous run, whose vers are not probed again (see above)
+    def __init__(self, url_head=do_scraping.URL_HEAD, cache=None, gap_lookahead=GAP_LOOKAHEAD, manifest=None):
+        self.url_head = url_head
+        self.cache = cache
+        self.gap_lookahead = gap_lookahead
+        self.manifest = manifest
+        # {(category, year, ver) : {num : scrape result}}
+        self.results = {}
+        self.requests = 0
+
+    def scrape(self, category, year, ver, num):
+        url = do_scraping.build_url(self.url_head, category, year, ver, num)
+        ver_results = self.results.setdefault((category, year, ver), {})
+        if num not in ver_results:
+            self.requests += 1
+            ver_results[num] = do_scraping.scrape_ptcg_kr(url, self.cache)
+        return url, ver_results[num]
+
+    # Drop the probe results of a ver once they are no longer needed
+    def forget(self, category, year, ver):
+        self.results.pop((category, year, ver), None)
+
+    def is_valid(self, category, year, ver, num):
+        _, (_, state) = self.scrape(category, year, ver, num)
+        return state == "success"
+
+    def known(self, category, year, ver):
+        if self.manifest is None:
+            return None
+        return self.manifest.get(category, year, ver)
+
+    # crawl: the ver's nums are all crawled next, so walk them instead of galloping
+    def find_ver_range(self, category, year, ver, crawl=False):
+        is_valid = lambda num: self.is_valid(category, year, ver, num)
+        if crawl:
+            item = self.known(category, year, ver)
+            if item is None:
+                return walk_ver_range(is_valid, self.gap_lookahead)
+            gap_lookahead = self.gap_lookahead if item['gaps'] else 0
+            return walk_ver_range(is_valid, gap_lookahead, item['lastNum'])
+        return find_ver_range(is_valid, self.gap_lookahead)
+
+    def find_vers(self, category, year, start_ver=0):
+        known_vers = self.manifest.known_vers(category, year) if self.manifest is not None else []
+
+        def is_valid_ver(ver):
+            if self.is_valid(category, year, ver, 1):
+                return True
+            self.forget(category, year, ver)
+            return False
+
+        return find_vers(is_valid_ver, start_ver, known_vers=set(known_vers))
+
+    # Crawl nums 1..last of a ver, reusing probe results. Error pages inside the range are added to gaps
+    def crawl_ver(self, category, year, ver, last, gaps):
+        data_json = []
+        gap_start = None
+        for num in range(1, last + 1):
+            _, (card_data, state) = self.scrape(category, year, ver, num)
+            if state == "success":
+                data_json.append(card_data)
+                # Holes walk_ver_range found past an end are already in gaps
+                if gap_start is not None:
+                    if [gap_start, num - 1] not in gaps:
+                        gaps.append([gap_start, num - 1])
+                    gap_start = None
+            elif gap_start is None:
+                gap_start = num
+
+        self.forget(category, year, ver)
+        gaps.sort()
+        return data_json
+
+    def discover_year(self, category, year, start_ver=0, json_root=None):
+        boundaries = []
+        for ver in self.find_vers(category, year, start_ver):
+            last, gaps = self.find_ver_range(category, year, ver, crawl=json_root is not None)
+            record = {
+                'category' : category,
+                'year' : year,
+                'ver' : ver,
+                'lastNum' : last,
+                'gaps' : gaps
+            }
+
+            if json_root is not None:
+                data_json = self.crawl_ver(category, year, ver, last, gaps)
+                record['cardNum'] = len(data_json)
+                if data_json:
+                    json_file_path = do_scraping.save_ver_json(json_root, category, year, ver, data_json)
+                    print(f"Data has been successfully saved to {json_file_path}")
+            else:
+                self.forget(category, year, ver)
+
+            print(f"{category}{year} ver{ver} : last num {last}, gaps {gaps}")
+            boundaries.append(record)
+
+        return boundaries
+
+if __name__ == "__main__":
+    parsing_start_time = time.time()
+
+    category_list = ["BS", "ST"]
+    year_list = list(range(2026, datetime.now().year + 1)) + [0000]
+    start_ver = 0
+
+    cache = html_cache.HtmlCache(do_scraping.HTML_CACHE_DIR)
+    # Seeded from the crawl manifest and the existing per-ver files. Not saved: that is do_scraping_incremental's job
+    manifest = crawl_manifest.CrawlManifest()
+    manifest.bootstrap(do_scraping.JSON_ROOT)
+    discovery = SetDiscovery(cache=cache, manifest=manifest)
+
+    boundaries = []
+    for category in category_list:
+        for year in year_list:
+            if do_scraping.is_skipped_year(category, year):
+                continue
+            boundaries.extend(discovery.discover_year(category, year, start_ver, json_root=do_scraping.JSON_ROOT))
+
+    with open(BOUNDARY_FILE, 'w', encoding='utf-8') as f:
+        json.dump(boundaries, f, ensure_ascii=False, indent=4)
+
+    print(f"Found vers : {len(boundaries)}")
+    print(f"Requests : {discovery.requests}")
+    print(f"Total time : {round(time.time() - parsing_start_time, 2)} secs")
@@ -1,6 +1,5 @@
 import sys
 import re
-import requests
 from urllib.parse import urlparse
 import time
 import os
@@ -11,6 +10,14 @@ import json
 import pokemon_ptcg_kr
 import energy_ptcg_kr
 import trainers_ptcg_kr
+import card_rules
+import lxml_ptcg_kr
+import card_page
+import html_cache
+import http_client
+import anomaly_sink
+import crawl_journal
+import crawl_telemetry
 
 def to_three_digit(x):
     if x >= 100 :
@@ -42,66 +49,157 @@ def check_success(soup):
     # No warning message found, return True
     return True
 
-def log_error_message(where, url):
-    print(f'ERROR! {where}')
-    print(f'URL : {url}')
+NOT_FOUND_MARKER = '없는 카드데이터 입니다.'
+NOT_FOUND_BYTES = NOT_FOUND_MARKER.encode('utf-8')
+# Only card pages have div.pokemon-info
+CARD_PAGE_BYTES = b'pokemon-info'
+STREAM_CHUNK_SIZE = 8192
 
-    error_csv_dir = './data_cleansing/error/'
-    error_csv_path = './data_cleansing/error/error_m.csv'
-
-    # Create directory if it does not exist
-    if not os.path.exists(error_csv_dir):
-        os.makedirs(error_csv_dir)
+# Same check as check_success, on the raw text: the marker inside a <script> block
+def is_not_found_html(html):
+    pos = html.find(NOT_FOUND_MARKER)
+    if pos == -1:
+        return False
+    script_start = html.rfind('<script', 0, pos)
+    return script_start != -1 and html.rfind('</script', script_start, pos) == -1
+
+# Read a streamed response. Stops downloading as soon as the not-found marker is seen,
+# and stops looking for it once the page is known to be a card page
+def read_card_page(res):
+    encoding = res.encoding or 'utf-8'
+    body = bytearray()
+    scanning = True
+
+    for chunk in res.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        prev_len = len(body)
+        body.extend(chunk)
+        if not scanning:
+            continue
+
+        if body.find(NOT_FOUND_BYTES, max(0, prev_len - len(NOT_FOUND_BYTES))) != -1:
+            html = body.decode(encoding, errors='replace')
+            if is_not_found_html(html):
+                res.close()
+                return html
+            scanning = False
+        elif body.find(CARD_PAGE_BYTES, max(0, prev_len - len(CARD_PAGE_BYTES))) != -1:
+            scanning = False
+
+    return body.decode(encoding, errors='replace')
+
+# With an html_cache.HtmlCache, the page is revalidated with a conditional GET
+# and only downloaded again if it changed
+def fetch_ptcg_kr(url, cache=None):
+    if cache is not None:
+        return cache.fetch(url, read=read_card_page)
+    res = http_client.get(url, stream=True)
+    return read_card_page(res)
+
+# With a timings dict, the BeautifulSoup build time is stored in timings['soup'] (see crawl_telemetry)
+def parse_ptcg_kr(html, url, backend=None, timings=None):
+    # Dead pages are caught on the raw text, without building a soup
+    if is_not_found_html(html):
+        return None, "fail"
 
-    with open(error_csv_path, mode='a', encoding='utf-8') as f:
-        f.write(where + ',' + url + '\n')
+    if (backend or PARSER_BACKEND) == 'lxml':
+        return lxml_ptcg_kr.parse_ptcg_kr(html, url)
 
-def scrape_ptcg_kr(url):
-    res = requests.get(url)
-    soup = BeautifulSoup(res.text, 'lxml')
+    soup_start = time.perf_counter()
+    soup = BeautifulSoup(html, 'lxml')
+    if timings is not None:
+        timings['soup'] = time.perf_counter() - soup_start
 
     # Return fail if URL is invalid
     if not check_success(soup):
         return None, "fail"
 
+    # Nodes found here are reused by the parsers
+    page = card_page.CardPage(soup)
+
     # Valid URL: begin scraping
     data = {}
-    card_type = soup.find('div', class_ = 'pokemon-info').get_text()
-
-    TRAINERS_KEYWORDS = ['아이템', '포켓몬의 도구', '서포트', '서포터', '스타디움']
-    POKEMON_KEYWORDS = ['포켓몬', '복원','V-UNION','레벨업']
-    ENERGY_KEYWORDS = ['기본 에너지', '특수 에너지']
-
-    if any(keyword in card_type for keyword in TRAINERS_KEYWORDS):
-        data = trainers_ptcg_kr.parse(soup, url)
-    elif any(keyword in card_type for keyword in ENERGY_KEYWORDS):
-        data = energy_ptcg_kr.parse(soup, url)
-    elif any(keyword in card_type for keyword in  POKEMON_KEYWORDS):
-        data = pokemon_ptcg_kr.parse(soup, url)
+    card_type = page.get_text('div', class_ = 'pokemon-info')
+
+    supertype = card_rules.card_supertype(card_type)
+
+    if supertype == 'trainers':
+        data = trainers_ptcg_kr.parse(page, url)
+    elif supertype == 'energy':
+        data = energy_ptcg_kr.parse(page, url)
+    elif supertype == 'pokemon':
+        data = pokemon_ptcg_kr.parse(page, url)
     else:
-        log_error_message('invalid card type', url)
+        anomaly_sink.log('do_scraping', 'invalid card type', url, page.find('div', class_ = 'pokemon-info'))
         data['supertype'] = card_type
         data['info'] = str(soup.find('div', class_='container', id='heaer_top'))
         data['cardPageURL'] = url
 
     return data, "success"
 
+# With a crawl_telemetry.Telemetry, fetch and parse are measured
+def scrape_ptcg_kr(url, cache=None, telemetry=None):
+    if telemetry is not None:
+        return telemetry.scrape(url, cache)
+    return parse_ptcg_kr(fetch_ptcg_kr(url, cache), url)
+
+# Save path: {json_root}/{category}/str(year)/
+# File name: {category}_str(year)_str(to_three_digit(ver))_str(to_three_digit(card_num))
+def get_ver_json_path(json_root, category, year, ver, card_num):
+    json_path = json_root + category + '/' + str(year) + '/'
+    json_file_name = category + '_' + str(year) + '_' + str(to_three_digit(ver)) + '_' + str(to_three_digit(card_num)) + '.json'
+    return json_path, json_path + json_file_name
+
+def save_ver_json(json_root, category, year, ver, data_json):
+    json_path, json_file_path = get_ver_json_path(json_root, category, year, ver, len(data_json))
+
+    if not os.path.exists(json_path):
+        os.makedirs(json_path)
+
+    with open(json_file_path, 'w', encoding='utf-8') as f:
+        json.dump(data_json, f, ensure_ascii=False, indent=4)
+
+    return json_file_path
+
+# BS cards before 2019 use a different URL scheme (see do_scraping_exceptions)
+def is_skipped_year(category, year):
+    return category == 'BS' and year < 2019 and year > 2000
+
+URL_HEAD = "https://pokemoncard.co.kr/cards/detail/"
+JSON_ROOT = '../ptcg_kr_card_data/'
+HTML_CACHE_DIR = html_cache.CACHE_DIR
+
+# Card page parser: 'bs4' (BeautifulSoup, pokemon/trainers/energy_ptcg_kr)
+# or 'lxml' (lxml_ptcg_kr, same records; compare_parser_backends.py times both on the HTML cache)
+PARSER_BACKEND = 'bs4'
+
+# If num == 1 for a given ver and an error page is returned,
+# check 10 more before terminating
+VER_TERMI_COUNT = 10
+
+# Every parsed page is appended to the journal (crawl_journal.JOURNAL_FILE) at once.
+# crawl_journal.RESUME = True continues an interrupted crawl, skipping every URL already journaled
+
+# Fetch/parse timings of the crawl (see crawl_telemetry). TELEMETRY = False turns them off
+TELEMETRY = True
+
 if __name__ == "__main__":
-    url_head = "https://pokemoncard.co.kr/cards/detail/"
+    url_head = URL_HEAD
     parsing_start_time = time.time()
     parsed_files = 0
     parsed_cards = 0
 
-    # If num == 1 for a given ver and an error page is returned,
-    # check 10 more before terminating
-    VER_TERMI_COUNT = 10
-
     # Full range to scrape
     #category_list = ["BS", "ST", "SVP", "SP", "SMP", "PR"]
     category_list = ["BS", "ST"]  # Promo cards use a different method
     year_list = list(range(2026, datetime.now().year + 1)) + [0000]
     start_ver = 0
 
+    # Keep raw pages so parser fixes can be re-run without the network
+    cache = html_cache.HtmlCache(HTML_CACHE_DIR)
+    telemetry = crawl_telemetry.Telemetry(fetch_ptcg_kr, parse_ptcg_kr) if TELEMETRY else None
+    journal = crawl_journal.CrawlJournal(crawl_journal.JOURNAL_FILE, resume=crawl_journal.RESUME,
+                                         scrape_func=lambda url: scrape_ptcg_kr(url, cache, telemetry))
+
     for category in category_list:  # loop category
         for year in year_list:  # loop year
             # The num-th card of the ver-th product in the given year
@@ -110,7 +208,7 @@ if __name__ == "__main__":
             ver_flag = True
             ver_error_count = 0
 
-            if category == 'BS' and year < 2019 and year > 2000:
+            if is_skipped_year(category, year):
                 continue
 
             while ver_flag:  # loop ver
@@ -127,7 +225,7 @@ if __name__ == "__main__":
                     if num == 1 or num % 5 == 0:
                         print(url)
 
-                    card_data, state = scrape_ptcg_kr(url)
+                    card_data, state = journal.scrape(category, year, ver, num, url)
 
                     if state == "success":
                         data_json.append(card_data)
@@ -157,18 +255,8 @@ if __name__ == "__main__":
                     # Nothing to save, skip
                     pass
 
-                # Save path: ../ptcg_kr_card_data/{category}/str(year)/
-                # File name: {category}_str(year)_str(to_three_digit(ver))_str(to_three_digit(num-1))
                 else:  # After checking the card after the last card of each ver, save to file
-                    json_path = '../ptcg_kr_card_data/' + category + '/' + str(year) + '/'
-                    json_file_name = category + '_' + str(year) + '_' + str(to_three_digit(ver)) + '_' + str(to_three_digit(parsed_cards_num)) + '.json'
-                    json_file_path = json_path + json_file_name
-
-                    if not os.path.exists(json_path):
-                        os.makedirs(json_path)
-
-                    with open(json_file_path, 'w', encoding='utf-8') as f:
-                        json.dump(data_json, f, ensure_ascii=False, indent=4)
+                    json_file_path = save_ver_json(JSON_ROOT, category, year, ver, journal.ver_cards(category, year, ver))
                     ver += 1
                     parsed_files += 1
 
@@ -177,8 +265,17 @@ if __name__ == "__main__":
                     print(f"Data has been successfully saved to {json_file_path}")
                     print(f"It takes {ver_end_time - ver_start_time} seconds")
                     print(f"{parsed_cards_num} cards saved")
+                    if telemetry is not None:
+                        telemetry.record_ver(category, year, ver - 1, parsed_cards_num, ver_end_time - ver_start_time)
+
+    journal.close()
+    if telemetry is not None:
+        summary = telemetry.close()
+        print(f"Fetch : {summary['fetch_secs']} secs, soup : {summary['soup_secs']} secs, parse by supertype : {summary['parse_secs']}")
+        print(f"Cards/sec : {summary['cards_per_sec']}")
 
     print("Finish parsing ptcg-kr data")
     print(f"Created files : {parsed_files}")
     print(f"Parsed cards : {parsed_cards}")
     print(f"Total time : {round(time.time() - parsing_start_time, 2)} secs")
+    print(f"Downloaded pages : {cache.misses}, not modified : {cache.not_modified}")
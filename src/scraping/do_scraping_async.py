@@ -0,0 +1,184 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+import do_scraping
+import html_cache
+import crawl_journal
+import crawl_telemetry
+
+# Concurrent version of the do_scraping.py crawl.
+# Fetching and parsing are the same as the serial crawl (do_scraping.fetch_ptcg_kr, do_scraping.parse_ptcg_kr),
+# only the order of requests changes:
+# - every (category, year) is walked at the same time
+# - inside a ver, NUM_WINDOW card pages are requested at once
+# The same per-ver JSON files are written.
+#
+# To test against a local stand-in server that replays saved pages,
+# pass url_head='http://127.0.0.1:8000/cards/detail/' and a scratch json_root.
+
+# Requests in flight across all hosts
+MAX_CONCURRENCY = 16
+# Requests in flight to a single host, and the minimum gap (secs) between two requests to it
+PER_HOST_CONCURRENCY = 4
+PER_HOST_INTERVAL = 0.1
+# Card pages requested at once inside a ver.
+# At most NUM_WINDOW - 1 pages past the last card of a ver are wasted
+NUM_WINDOW = 8
+
+class HostLimiter:
+    # Politeness limit per host: bounded concurrency and a minimum interval between requests
+    def __init__(self, concurrency, interval):
+        self.concurrency = concurrency
+        self.interval = interval
+        self.semaphores = {}
+        self.locks = {}
+        self.last_request = {}
+
+    @asynccontextmanager
+    async def limit(self, url):
+        host = urlparse(url).netloc
+        if host not in self.semaphores:
+            self.semaphores[host] = asyncio.Semaphore(self.concurrency)
+            self.locks[host] = asyncio.Lock()
+            self.last_request[host] = 0.0
+
+        async with self.semaphores[host]:
+            async with self.locks[host]:
+                wait = self.last_request[host] + self.interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self.last_request[host] = time.monotonic()
+            yield
+
+class AsyncCrawler:
+    def __init__(self, url_head=do_scraping.URL_HEAD, json_root=do_scraping.JSON_ROOT,
+                 max_concurrency=MAX_CONCURRENCY, per_host_concurrency=PER_HOST_CONCURRENCY,
+                 per_host_interval=PER_HOST_INTERVAL, num_window=NUM_WINDOW, cache=None, journal=None, telemetry=None):
+        self.url_head = url_head
+        self.cache = cache
+        self.journal = journal
+        self.telemetry = telemetry
+        self.json_root = json_root
+        self.num_window = num_window
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.host_limiter = HostLimiter(per_host_concurrency, per_host_interval)
+        # requests and BeautifulSoup are blocking, so they run in worker threads
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+        self.parsed_files = 0
+        self.parsed_cards = 0
+
+    async def scrape(self, category, year, ver, num):
+        url = do_scraping.build_url(self.url_head, category, year, ver, num)
+        if self.journal is not None:
+            result = self.journal.get(url)
+            if result is not None:
+                return result
+
+        fetch = do_scraping.fetch_ptcg_kr
+        parse = do_scraping.parse_ptcg_kr
+        if self.telemetry is not None:
+            fetch = self.telemetry.fetch
+            parse = self.telemetry.parse
+
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            async with self.host_limiter.limit(url):
+                html = await loop.run_in_executor(self.executor, fetch, url, self.cache)
+            card_data, state = await loop.run_in_executor(self.executor, parse, html, url)
+
+        if self.journal is not None:
+            self.journal.append(category, year, ver, num, url, card_data, state)
+        return card_data, state
+
+    # Same result as the serial num loop: every card up to the first error page
+    async def crawl_ver(self, category, year, ver):
+        data_json = []
+        num = 1
+
+        while True:
+            print(do_scraping.build_url(self.url_head, category, year, ver, num))
+
+            results = await asyncio.gather(*(self.scrape(category, year, ver, num + i) for i in range(self.num_window)))
+            for card_data, state in results:
+                if state == "fail":
+                    return data_json
+                data_json.append(card_data)
+
+            num += self.num_window
+
+    # Same termination rule as the serial ver loop: stop after VER_TERMI_COUNT invalid vers in a row
+    async def crawl_year(self, category, year, start_ver=0):
+        ver = start_ver
+        ver_error_count = 0
+
+        while True:
+            ver_start_time = time.time()
+            data_json = await self.crawl_ver(category, year, ver)
+
+            if data_json == []:
+                print(f"invalid ver{ver}")
+                if ver_error_count < do_scraping.VER_TERMI_COUNT:
+                    ver_error_count += 1
+                    ver += 1
+                    continue
+                print(f"error count {ver_error_count}, stop searching {category}{year}")
+                return
+
+            ver_error_count = 0
+            json_file_path = do_scraping.save_ver_json(self.json_root, category, year, ver, data_json)
+            self.parsed_files += 1
+            self.parsed_cards += len(data_json)
+
+            print(f"Data has been successfully saved to {json_file_path}")
+            print(f"It takes {time.time() - ver_start_time} seconds")
+            print(f"{len(data_json)} cards saved")
+            if self.telemetry is not None:
+                self.telemetry.record_ver(category, year, ver, len(data_json), time.time() - ver_start_time)
+            ver += 1
+
+    async def crawl(self, category_list, year_list, start_ver=0):
+        tasks = []
+        for category in category_list:
+            for year in year_list:
+                if do_scraping.is_skipped_year(category, year):
+                    continue
+                tasks.append(self.crawl_year(category, year, start_ver))
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            self.executor.shutdown(wait=False)
+
+async def crawl_ptcg_kr(category_list, year_list, start_ver=0, **kwargs):
+    crawler = AsyncCrawler(**kwargs)
+    await crawler.crawl(category_list, year_list, start_ver)
+    return crawler.parsed_files, crawler.parsed_cards
+
+if __name__ == "__main__":
+    parsing_start_time = time.time()
+
+    # Full range to scrape
+    category_list = ["BS", "ST"]  # Promo cards use a different method
+    year_list = list(range(2026, datetime.now().year + 1)) + [0000]
+    start_ver = 0
+
+    cache = html_cache.HtmlCache(do_scraping.HTML_CACHE_DIR)
+    journal = crawl_journal.CrawlJournal(crawl_journal.JOURNAL_FILE, resume=crawl_journal.RESUME)
+    telemetry = crawl_telemetry.Telemetry(do_scraping.fetch_ptcg_kr, do_scraping.parse_ptcg_kr) if do_scraping.TELEMETRY else None
+    parsed_files, parsed_cards = asyncio.run(crawl_ptcg_kr(category_list, year_list, start_ver, cache=cache, journal=journal, telemetry=telemetry))
+    journal.close()
+    if telemetry is not None:
+        summary = telemetry.close()
+        print(f"Fetch : {summary['fetch_secs']} secs, soup : {summary['soup_secs']} secs, parse by supertype : {summary['parse_secs']}")
+        print(f"Cards/sec : {summary['cards_per_sec']}")
+
+    print("Finish parsing ptcg-kr data")
+    print(f"Created files : {parsed_files}")
+    print(f"Parsed cards : {parsed_cards}")
+    print(f"Total time : {round(time.time() - parsing_start_time, 2)} secs")
+    print(f"Downloaded pages : {cache.misses}, not modified : {cache.not_modified}")
@@ -1,767 +1,321 @@
 import json
 import time
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import do_scraping
+import html_cache
 
-# 몇몇 하이클래스팩은 URL구조가 예외적이라 따로 접근한다
-# THE BEST OF XY
-# https://pokemoncard.co.kr/cards/detail/BS201707001
-# https://pokemoncard.co.kr/cards/detail/BS201707186
-# 울트라샤이니의 프로모카드 5장
-# https://pokemoncard.co.kr/cards/detail/BS2019014244
-# https://pokemoncard.co.kr/cards/detail/BS2019014245
-# https://pokemoncard.co.kr/cards/detail/BS2019014246
-# https://pokemoncard.co.kr/cards/detail/BS2019014247
-# https://pokemoncard.co.kr/cards/detail/BS2019014248
+# 몇몇 하이클래스팩, 프로모는 URL구조가 예외적이라 따로 접근한다
+# 세트마다 함수를 따로 두지 않고 SPECIAL_SETS 에 URL 범위/목록과 저장할 파일을 적어둔다
+#   name : 세트 이름, run_special_sets(names) 로 골라서 돌린다
+#   urls : URL 목록. 세트 페이지를 먼저 봐야 범위가 정해지는 경우엔 urls(scrape) 함수
+#   file : 저장 경로. {root} 는 json_root, {count} 는 저장된 카드 수(세자리)
+#   min_cards : 이보다 적게 모이면 저장하지 않는다 (기본 0)
+# run_special_sets 는 고른 세트를 한번에 돌린다
+# - 페이지 요청은 MAX_WORKERS 개까지 동시에
+# - 여러 세트에 겹치는 URL 은 한번만 요청한다
+# - 세트마다 걸린 시간을 출력한다
+# 카드는 URL 순서대로, 성공한 페이지만 저장한다
 
-def parse_bestxy():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS201707'
-    num_list = list(range(1,187))
-    GET_IMG = False
-    
-    data_json = []
-    
-    for num in num_list:
-        url = url_head + do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-            
-        card_data, state = do_scraping.scrape_ptcg_kr(url, get_img=GET_IMG)
-        
-        if state == "success":
-            data_json.append(card_data)
-        elif state == "fail":
-            pass
-    
-    json_file_path = '../ptcg_kr_card_data/BS/2017/BS_2017_07_186.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-            
-def parse_GX_ulti():
-    url_list = [
-        'https://pokemoncard.co.kr/cards/detail/BS2019014244',
-        'https://pokemoncard.co.kr/cards/detail/BS2019014245',
-        'https://pokemoncard.co.kr/cards/detail/BS2019014246',
-        'https://pokemoncard.co.kr/cards/detail/BS2019014247',
-        'https://pokemoncard.co.kr/cards/detail/BS2019014248'
-    ]
-    data_json = []
-    
-    for url in url_list:
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-        
-        if state == "success":
-            data_json.append(card_data)
-        elif state == "fail":
-            pass
-    
-    json_file_path = '../ptcg_kr_card_data/BS/2019/GX_ulti.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-        
-'''
-https://pokemoncard.co.kr/cards/detail/SVP002023003        "2023 코리안리그 시즌2 4강 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023001        "2023 코리안리그 시즌2 우승 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023002        "2023 코리안리그 시즌2 준우승 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023006        "2023 코리안리그 시즌3 4강 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023004        "2023 코리안리그 시즌3 우승 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023005        "2023 코리안리그 시즌3 준우승 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023009        "2023 코리안리그 시즌4 4강 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023007        "2023 코리안리그 시즌4 우승 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023008        "2023 코리안리그 시즌4 준우승 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023012        "2023 코리안리그 파이널 시즌 4강 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023010        "2023 코리안리그 파이널 시즌 우승 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023013        "2023 코리안리그 파이널 시즌 입상 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023014         "2023 코리안리그 파이널 시즌 입상 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002023011        "2023 코리안리그 파이널 시즌 준우승 프로모",
-        "2024 코리안리그 시즌1 4강 프로모",
-https://pokemoncard.co.kr/cards/detail/SVP002024001        "2024 코리안리그 시즌1 우승 프로모",
-        "2024 코리안리그 시즌1 준우승 프로모",
-        "2024 코리안리그 시즌2 4강 프로모",
-        "2024 코리안리그 시즌2 우승 프로모",
-        "2024 코리안리그 시즌2 준우승 프로모",
-        "2024 코리안리그 시즌3 4강 프로모",
-        "2024 코리안리그 시즌3 우승 프로모",
-        "2024 코리안리그 시즌3 준우승 프로모",
-        "2024 코리안리그 파이널 4강 프로모",
-        "2024 코리안리그 파이널 우승 프로모",
-        "2024 코리안리그 파이널 준우승 프로모",
-'''
-def parse_win_medal():
-    data_json = []
-    
-    url_head = 'https://pokemoncard.co.kr/cards/detail/SVP00'
-    years = [2023,2024]
-    
-    for year in years:
-        num = 1
-        num_flag = True
-        while num_flag:
-            url = url_head+str(year)+do_scraping.to_three_digit(num)
-            
-            card_data, state = do_scraping.scrape_ptcg_kr(url)
-        
-            if state == "success":
-                data_json.append(card_data)
-            elif state == "fail":
-                pass
-                        
-            num += 1
-            if year == 2023 and num > 20:
-                num_flag = False
-            elif year == 2024 and num > 12:
-                num_flag = False
-    
-    json_file_path = '../ptcg_kr_card_data/SVP/0/win_medals.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-# 포켓몬 카드 게임 BW 「퍼스트 세트 - 풀의 진화·불꽃의 진화·물의 진화
-# 풀 : https://pokemoncard.co.kr/cards/detail/ST2011001001 ~ https://pokemoncard.co.kr/cards/detail/ST2011001034
-# 불꽃 : https://pokemoncard.co.kr/cards/detail/ST2011002004 ~ https://pokemoncard.co.kr/cards/detail/ST2011002034
-# 물 : https://pokemoncard.co.kr/cards/detail/ST2011003009 ~ https://pokemoncard.co.kr/cards/detail/ST2011003034
+# 동시에 요청하는 페이지 수
+MAX_WORKERS = 8
+# 동시에 돌리는 세트 수
+MAX_SETS = 32
 
-def parse_bw_first():    
-    url_head = 'https://pokemoncard.co.kr/cards/detail/ST2011'
-    vers = [1,2,3]
-    nums = list(range(35))
-    
-    for ver in vers:
-        parsed_card_num = 0
-        data_json = []
-        for num in nums:
-            url = url_head+do_scraping.to_three_digit(ver)+do_scraping.to_three_digit(num)
-            if num == 1 or num % 5 == 0:
-                print(url)
-            
-            card_data, state = do_scraping.scrape_ptcg_kr(url)
-        
-            if state == "success":
-                data_json.append(card_data)
-                parsed_card_num += 1
-            elif state == "fail":
-                pass
-             
-        json_file_path = '../ptcg_kr_card_data/ST/2011/ST_2011_'+do_scraping.to_three_digit(ver)+'_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-        with open(json_file_path,mode='w',encoding='utf-8') as file:
-            json.dump(data_json,file,ensure_ascii=False, indent=4)
-            
-# "XY 확장팩 제1탄 「Y컬렉션」"
-# https://pokemoncard.co.kr/cards/detail/BS2014501001 ~ https://pokemoncard.co.kr/cards/detail/BS2014501063
+def url_range(code, start, stop):
+    return [do_scraping.URL_HEAD + code + do_scraping.to_three_digit(num) for num in range(start, stop)]
 
-def parse_ycollection():    
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2014501'
-    vers = [0]
-    nums = list(range(64))
-    
-    for ver in vers:
-        parsed_card_num = 0
-        data_json = []
-        for num in nums:
-            url = url_head+do_scraping.to_three_digit(num)
-            if num == 1 or num % 5 == 0:
-                print(url)
-            
-            card_data, state = do_scraping.scrape_ptcg_kr(url)
-        
-            if state == "success":
-                data_json.append(card_data)
-                parsed_card_num += 1
-            elif state == "fail":
-                pass
-             
-        json_file_path = '../ptcg_kr_card_data/BS/2014/BS_2014_501_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-        with open(json_file_path,mode='w',encoding='utf-8') as file:
-            json.dump(data_json,file,ensure_ascii=False, indent=4)
+def url_list(codes):
+    return [do_scraping.URL_HEAD + code for code in codes]
+
+# SV 확팩들이 묘하게 UR만! 없다
+# prodNum이 56 이상인걸 팩이라 간주하고 끝번호 다음부터 40개 파싱
+def sv_rare_urls(year, ver):
+    code = 'BS' + str(year) + do_scraping.to_three_digit(ver)
+
+    def urls(scrape):
+        # 일단 하나 봐서 전체 몇개인지 체크
+        card_data, state = scrape(do_scraping.URL_HEAD + code + '010')
+        if state != "success" or int(card_data['prodNumber']) < 56:
+            return []
+        last_num = int(card_data['prodNumber'])
+        return url_range(code, last_num + 1, last_num + 41)
+
+    return urls
+
+def sv_rare_sets():
+    sets = []
+    for year in range(2023, datetime.now().year + 1):
+        for ver in range(1, 24):
+            sets.append({
+                'name' : 'SV_Rares',
+                'urls' : sv_rare_urls(year, ver),
+                'file' : '{root}BS/' + str(year) + '/BS_' + str(year) + '_' + do_scraping.to_three_digit(ver) + '_{count}.json',
+                'min_cards' : 2
+            })
+    return sets
 
-'''
-https://pokemoncard.co.kr/cards/detail/SP000000000202208        "포켓몬 월드챔피언십2022 개최 기념 참가 프로모 카드",
-https://pokemoncard.co.kr/cards/detail/SVP002023000        "포켓몬 월드챔피언십2023 개최 기념 참가 프로모 카드"
-https://pokemoncard.co.kr/cards/detail/SMP0000000022
-https://pokemoncard.co.kr/cards/detail/SMP0000000023
-https://pokemoncard.co.kr/cards/detail/SMP0000000021
-https://pokemoncard.co.kr/cards/detail/SMP0000000020
-https://pokemoncard.co.kr/cards/detail/SMP0000000019     "썬&문 프로모 카드 포켓몬 월드챔피언십2017 대한민국 대표 선발전 개최 기념 프로모 팩",
-https://pokemoncard.co.kr/cards/detail/SMP0000000027        "썬&문 프로모 카드 포켓몬 월드챔피언십2017 개최 기념 참가 프로모 카드",
-https://pokemoncard.co.kr/cards/detail/SMP0000000026     "썬&문 프로모 카드 포켓몬 월드챔피언십2017 대한민국 대표 선발전 카드 게임 부문 4강 진출자 선물",
-https://pokemoncard.co.kr/cards/detail/SMP0000000024        "썬&문 프로모 카드 포켓몬 월드챔피언십2017 대한민국 대표 선발전 카드 게임 부문 우승자 선물",
-https://pokemoncard.co.kr/cards/detail/SMP0000000025        "썬&문 프로모 카드 포켓몬 월드챔피언십2017 대한민국 대표 선발전 카드 게임 부문 준우승자 선물",
-'''
-def parse_worlds():
-    url_list = [
-        'https://pokemoncard.co.kr/cards/detail/SP000000000202208',
-        'https://pokemoncard.co.kr/cards/detail/SVP002023000',
-        'https://pokemoncard.co.kr/cards/detail/SMP0000000022',
-        'https://pokemoncard.co.kr/cards/detail/SMP0000000023',
-        'https://pokemoncard.co.kr/cards/detail/SMP0000000021',
-        'https://pokemoncard.co.kr/cards/detail/SMP0000000020',
-        'https://pokemoncard.co.kr/cards/detail/SMP0000000019',
-        'https://pokemoncard.co.kr/cards/detail/SMP0000000027',
-        'https://pokemoncard.co.kr/cards/detail/SMP0000000026',
-        'https://pokemoncard.co.kr/cards/detail/SMP0000000024',
-        'https://pokemoncard.co.kr/cards/detail/SMP0000000025'
-    ]
-    data_json = []
-    
-    for url in url_list:
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-        
-        if state == "success":
-            data_json.append(card_data)
-        elif state == "fail":
-            pass
-             
-    json_file_path = '../ptcg_kr_card_data/SVP/0/win_medals2.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-              
-# 썬문 프로모에는 
-# https://pokemoncard.co.kr/cards/detail/SMP0000000001 같이
-# SMP 0000 000 001 ~ nnn 의 형식도 존재한다
-# 일단 nnn = 100 까지 해보자
-def parse_SM_promos():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/SMP0000000'
-    vers = [0]
-    nums = list(range(105))
-    
-    for ver in vers:
-        parsed_card_num = 0
+SPECIAL_SETS = [
+    # THE BEST OF XY
+    # https://pokemoncard.co.kr/cards/detail/BS201707001 ~ https://pokemoncard.co.kr/cards/detail/BS201707186
+    {
+        'name' : 'bestxy',
+        'urls' : url_range('BS201707', 1, 187),
+        'file' : '{root}BS/2017/BS_2017_07_186.json'
+    },
+    # 울트라샤이니의 프로모카드 5장
+    {
+        'name' : 'GX_ulti',
+        'urls' : url_range('BS2019014', 244, 249),
+        'file' : '{root}BS/2019/GX_ulti.json'
+    },
+    # 코리안리그 입상 프로모
+    # https://pokemoncard.co.kr/cards/detail/SVP002023001 ~ SVP002023020, SVP002024001 ~ SVP002024012
+    {
+        'name' : 'win_medal',
+        'urls' : url_range('SVP002023', 1, 21) + url_range('SVP002024', 1, 13),
+        'file' : '{root}SVP/0/win_medals.json'
+    },
+    # 포켓몬 카드 게임 BW 「퍼스트 세트 - 풀의 진화·불꽃의 진화·물의 진화
+    # 풀 : https://pokemoncard.co.kr/cards/detail/ST2011001001 ~ https://pokemoncard.co.kr/cards/detail/ST2011001034
+    # 불꽃 : https://pokemoncard.co.kr/cards/detail/ST2011002004 ~ https://pokemoncard.co.kr/cards/detail/ST2011002034
+    # 물 : https://pokemoncard.co.kr/cards/detail/ST2011003009 ~ https://pokemoncard.co.kr/cards/detail/ST2011003034
+    {
+        'name' : 'bw_first',
+        'urls' : url_range('ST2011001', 0, 35),
+        'file' : '{root}ST/2011/ST_2011_001_{count}.json'
+    },
+    {
+        'name' : 'bw_first',
+        'urls' : url_range('ST2011002', 0, 35),
+        'file' : '{root}ST/2011/ST_2011_002_{count}.json'
+    },
+    {
+        'name' : 'bw_first',
+        'urls' : url_range('ST2011003', 0, 35),
+        'file' : '{root}ST/2011/ST_2011_003_{count}.json'
+    },
+    # "XY 확장팩 제1탄 「Y컬렉션」"
+    # https://pokemoncard.co.kr/cards/detail/BS2014501001 ~ https://pokemoncard.co.kr/cards/detail/BS2014501063
+    {
+        'name' : 'ycollection',
+        'urls' : url_range('BS2014501', 0, 64),
+        'file' : '{root}BS/2014/BS_2014_501_{count}.json'
+    },
+    # 월드챔피언십 개최 기념, 대표 선발전 프로모
+    {
+        'name' : 'worlds',
+        'urls' : url_list([
+            'SP000000000202208',
+            'SVP002023000',
+            'SMP0000000022',
+            'SMP0000000023',
+            'SMP0000000021',
+            'SMP0000000020',
+            'SMP0000000019',
+            'SMP0000000027',
+            'SMP0000000026',
+            'SMP0000000024',
+            'SMP0000000025'
+        ]),
+        'file' : '{root}SVP/0/win_medals2.json'
+    },
+    # 썬문 프로모에는 https://pokemoncard.co.kr/cards/detail/SMP0000000001 같이
+    # SMP 0000 000 001 ~ nnn 의 형식도 존재한다
+    {
+        'name' : 'SM_promos',
+        'urls' : url_range('SMP0000000', 0, 105),
+        'file' : '{root}SMP/0/SMP_0_0000_{count}.json'
+    },
+    # 프로모 한장
+    {
+        'name' : 'a_medal',
+        'urls' : url_list(['SMP0000000957']),
+        'file' : './last_medal.json'
+    },
+    # 중간에 url하나가 건너뛰어져있음. 109번까지 봐야한다
+    {
+        'name' : 'ultra_force',
+        'urls' : url_range('BS2018003', 0, 110),
+        'file' : '{root}BS/2018/BS_2018_003_{count}.json'
+    },
+    # 알로라의 햇빛 확팩 중간에 url끊겨있음
+    {
+        'name' : 'alola',
+        'urls' : url_range('BS2017004', 0, 56),
+        'file' : '{root}BS/2017/BS_2017_004_{count}.json'
+    },
+    # 소드&실드 하이클래스팩 「VMAX 클라이맥스」277에 에너지8종까지. 56-59를 모르페코vunion이 차지해서 60번 보질 못함. 285까지 볼것
+    # 226 ~ 229 행방불명 -> 모르페코 Vunion
+    {
+        'name' : 'VMAXCLIMAX',
+        'urls' : url_range('BS2022001', 0, 286),
+        'file' : '{root}BS/2022/BS_2022_001_{count}.json'
+    },
+    # 소드&실드 확장팩 「창공스트림」 67까지는 BS2021012xxx를 따르다가 68~79에서 BS2021009xxx를 따름. 이건 인텔vmax덱인데 다행히 충돌은 없음
+    {
+        'name' : 'ChangGong',
+        'urls' : url_range('BS2021012', 0, 68) + url_range('BS2021009', 68, 80),
+        'file' : '{root}BS/2021/BS_2021_012_{count}.json'
+    },
+    # 소드&실드 확장팩 「마천퍼펙트」창공스트림과 동일. 67까지는 BS2021011xxx를 따르다가 68~79에서 BS2021008xxx를 따름. 이건 팬텀vmax덱인데 다행히 충돌은 없음
+    {
+        'name' : 'MaCheon',
+        'urls' : url_range('BS2021011', 0, 68) + url_range('BS2021008', 68, 80),
+        'file' : '{root}BS/2021/BS_2021_011_{count}.json'
+    },
+    # 소드&실드 하이클래스팩 「VSTAR 유니버스」173에서 링크가 끊김. 250까지 있고, 에너지 8종도 있음. 258까지 볼것
+    {
+        'name' : 'VSTARUni',
+        'urls' : url_range('BS2023001', 0, 260),
+        'file' : '{root}BS/2023/BS_2023_001_{count}.json'
+    },
+    # 끝에있는 UR들
+    {
+        'name' : 'VSTARUni2',
+        'urls' : url_range('BS2023001', 255, 270),
+        'file' : './vstar_universe_ur.json'
+    },
+    # 소드&실드 확장팩 「25th ANNIVERSARY COLLECTION」25가 피카츄vunion. 38까지 있음
+    {
+        'name' : '25th',
+        'urls' : url_range('BS2021015', 0, 40),
+        'file' : '{root}BS/2021/BS_2021_015_{count}.json'
+    },
+    # 스칼렛&바이올렛 확장팩 「변환의 가면」 133까지 다시보기
+    {
+        'name' : 'Mask',
+        'urls' : url_range('BS2024008', 0, 134),
+        'file' : '{root}BS/2024/BS_2024_008_{count}.json'
+    },
+    # 스칼렛&바이올렛 확장팩 「나이트 원더러」 64까지 BS2024011064
+    {
+        'name' : 'Night',
+        'urls' : url_range('BS2024011', 0, 65),
+        'file' : '{root}BS/2024/BS_2024_011_{count}.json'
+    },
+    # 스칼렛&바이올렛 확장팩 「포켓몬 카드 151」 240까지 BS2023014240
+    {
+        'name' : '151',
+        'urls' : url_range('BS2023014', 0, 241),
+        'file' : '{root}BS/2023/BS_2023_014_{count}.json'
+    },
+    # 스칼렛&바이올렛 확장팩 「샤이니 트레저 ex」 400 까지 BS2024001400
+    {
+        'name' : 'ShinyTrea',
+        'urls' : url_range('BS2024001', 0, 401),
+        'file' : '{root}BS/2024/BS_2024_001_{count}.json'
+    },
+    {
+        'name' : 'banditUR',
+        'urls' : url_range('BS2015005', 90, 100),
+        'file' : './bandit_ring_ur.json'
+    },
+    # 스텔라미라클 카드정보 추가
+    {
+        'name' : 'stella',
+        'urls' : url_range('BS2024012', 0, 110),
+        'file' : '{root}BS/2024/BS_2024_012_{count}.json'
+    },
+    # 나이트 원더러 고레어 카드 추가
+    {
+        'name' : 'Night2',
+        'urls' : url_range('BS2024011', 0, 100),
+        'file' : '{root}BS/2024/BS_2024_011_{count}.json'
+    },
+    # 누락 데이터 추가
+    {
+        'name' : 'Parukia',
+        'urls' : url_range('ST2015006', 0, 80),
+        'file' : '{root}ST/2015/ST_2015_006_{count}.json'
+    },
+] + sv_rare_sets()
+
+class SpecialSetRunner:
+    def __init__(self, json_root=do_scraping.JSON_ROOT, max_workers=MAX_WORKERS, cache=None):
+        self.json_root = json_root
+        self.cache = cache
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # URL 하나당 future 하나. 겹치는 URL 은 먼저 요청한 세트의 결과를 같이 쓴다
+        self.futures = {}
+        self.requested = 0
+        self.lock = threading.Lock()
+
+    def submit(self, url):
+        with self.lock:
+            self.requested += 1
+            if url not in self.futures:
+                self.futures[url] = self.executor.submit(do_scraping.scrape_ptcg_kr, url, self.cache)
+            return self.futures[url]
+
+    def scrape(self, url):
+        return self.submit(url).result()
+
+    def run_set(self, special_set):
+        start_time = time.time()
+
+        urls = special_set['urls']
+        if callable(urls):
+            urls = urls(self.scrape)
+
+        futures = [self.submit(url) for url in urls]
         data_json = []
-        for num in nums:
-            url = url_head+do_scraping.to_three_digit(num)
-            if num == 1 or num % 5 == 0:
-                print(url)
-            
-            card_data, state = do_scraping.scrape_ptcg_kr(url)
-        
+        for future in futures:
+            card_data, state = future.result()
             if state == "success":
                 data_json.append(card_data)
-                parsed_card_num += 1
-            elif state == "fail":
-                print(f"FAIL : {url}")
-                pass
-             
-        json_file_path = '../ptcg_kr_card_data/SMP/0/SMP_0_0000_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-        with open(json_file_path,mode='w',encoding='utf-8') as file:
-            json.dump(data_json,file,ensure_ascii=False, indent=4)
-            
-# 프로모 한장
-# https://pokemoncard.co.kr/cards/detail/SMP0000000957
-def parse_a_medal():
-    url = 'https://pokemoncard.co.kr/cards/detail/SMP0000000957'
-    data_json = []
-    card_data, _ = do_scraping.scrape_ptcg_kr(url)
-    data_json.append(card_data)
-    
-    json_file_path = './last_medal.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-    
-# 중간에 url하나가 건너뛰어져있음
-# 109번까지 봐야한다
 
-def parse_ultra_force():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2018003'
-    nums = list(range(110))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2018/BS_2018_003_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-# 알로라의 햇빛 확팩 중간에 url끊겨있음
-def parse_alola():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2017004'
-    nums = list(range(56))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2017/BS_2017_004_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-#소드&실드 하이클래스팩 「VMAX 클라이맥스」277에 에너지8종까지. 56-59를 모르페코vunion이 차지해서 60번 보질 못함. 285까지 볼것
-# https://pokemoncard.co.kr/cards/detail/BS2022001257
-# 226 ~ 229 행방불명 -> 모르페코 Vunion
-def parse_VMAXCLIMAX():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2022001'
-    nums = list(range(286))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2022/BS_2022_001_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
+        json_file_path = None
+        if len(data_json) >= special_set.get('min_cards', 0):
+            json_file_path = special_set['file'].format(root=self.json_root, count=do_scraping.to_three_digit(len(data_json)))
+            json_dir = os.path.dirname(json_file_path)
+            if json_dir and not os.path.exists(json_dir):
+                os.makedirs(json_dir)
+            with open(json_file_path, mode='w', encoding='utf-8') as file:
+                json.dump(data_json, file, ensure_ascii=False, indent=4)
 
-#소드&실드 확장팩 「창공스트림」 67까지는 BS2021012xxx를 따르다가 68~79에서 BS2021009xxx를 따름. 이건 인텔vmax덱인데 다행히 충돌은 없음
-# https://pokemoncard.co.kr/cards/detail/BS2021012050
-def parse_ChangGong():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2021012'
-    nums = list(range(68))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-        
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2021009'
-    nums = list(range(68,80))
-    
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2021/BS_2021_012_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-#소드&실드 확장팩 「마천퍼펙트」창공스트림과 동일. 67까지는 BS2021011xxx를 따르다가 68~79에서 BS2021008xxx를 따름. 이건 팬텀vmax덱인데 다행히 충돌은 없음
-#https://pokemoncard.co.kr/cards/detail/BS2021011050
-def parse_MaCheon():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2021011'
-    nums = list(range(68))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-        
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2021008'
-    nums = list(range(68,80))
-    
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2021/BS_2021_011_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
+        secs = round(time.time() - start_time, 2)
+        print(f"{special_set['name']} : {len(data_json)} cards / {len(urls)} pages, {secs} secs -> {json_file_path}")
 
-#소드&실드 하이클래스팩 「VSTAR 유니버스」173에서 링크가 끊김. 250까지 있고, 에너지 8종도 있음. 258까지 볼것
-#https://pokemoncard.co.kr/cards/detail/BS2023001245
-def parse_VSTARUni():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2023001'
-    nums = list(range(260))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2023/BS_2023_001_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-# 끝에있는 UR들
-def parse_VSTARUni2():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2023001'
-    nums = list(range(255,270))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = './'+'uni.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
+        return {
+            'name' : special_set['name'],
+            'pages' : len(urls),
+            'cards' : len(data_json),
+            'secs' : secs,
+            'file' : json_file_path
+        }
 
-#소드&실드 확장팩 「25th ANNIVERSARY COLLECTION」25가 피카츄vunion.  38까지 있음
-#https://pokemoncard.co.kr/cards/detail/BS2021015020
-def parse_25th():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2021015'
-    nums = list(range(40))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2021/BS_2021_015_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
+    # 세트들을 한번에 돌린다. 세트마다 스레드 하나가 결과를 기다리고, 요청은 executor 가 MAX_WORKERS 개까지만 보낸다
+    def run(self, special_sets):
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_SETS, len(special_sets)))) as set_executor:
+            reports = list(set_executor.map(self.run_set, special_sets))
+        self.executor.shutdown()
+        return reports
 
-#스칼렛&바이올렛 확장팩 「변환의 가면」	133까지 다시보기
-#https://pokemoncard.co.kr/cards/detail/BS2024008025
-def parse_Mask():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2024008'
-    nums = list(range(134))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2024/BS_2024_008_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-
-#스칼렛&바이올렛 확장팩 「나이트 원더러」	64까지 BS2024011064
-def parse_Night():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2024011'
-    nums = list(range(65))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2024/BS_2024_011_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-# SV 확팩들이 묘하게 UR만! 없다
-# 뒤에 번호들 파싱해야함.
-# prodNum이 50넘는걸 팩이라 간주하고 이것들의 끝번호부터 시작해서 파싱
-def parse_SV_Rares():
-    url_head_ori = 'https://pokemoncard.co.kr/cards/detail/BS'
-    years = [str(y) for y in range(2023, datetime.now().year + 1)]
-    vers = list(range(1,24))
-    
-    for year in years:
-        for ver in vers:
-            url_head = url_head_ori + year + do_scraping.to_three_digit(ver)
-            
-            # 일단 하나 봐서 전체 몇개인지 체크
-            url_test = url_head + '010'
-            card_data, state = do_scraping.scrape_ptcg_kr(url_test)
-            test_rst = True
-    
-            if state == "success":
-                if int(card_data['prodNumber']) < 56:
-                    test_rst = False
-            elif state == "fail":
-                test_rst = False
-                
-            if not test_rst:
-                continue
-            
-            # 끝번호부터 40개 파싱
-            lastNum = int(card_data['prodNumber'])
-            parsed_card_num = 0
-            data_json = []
-            for num in range(1,41):
-                url = url_head+do_scraping.to_three_digit(lastNum + num)
-                if num == 1 or num % 5 == 0:
-                    print(url)
-        
-                card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-                if state == "success":
-                    data_json.append(card_data)
-                    parsed_card_num += 1
-                elif state == "fail":
-                    pass
-            
-            if parsed_card_num > 1:
-                json_file_path = '../ptcg_kr_card_data/BS/'+year+'/BS_'+year +'_'+do_scraping.to_three_digit(ver)+'_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-                with open(json_file_path,mode='w',encoding='utf-8') as file:
-                    json.dump(data_json,file,ensure_ascii=False, indent=4)
-                    
-#스칼렛&바이올렛 확장팩 「포켓몬 카드 151」	240까지 BS2023014240
-def parse_151():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2023014'
-    nums = list(range(241))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2023/BBS_2024_014_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-#스칼렛&바이올렛 확장팩 「샤트」	400 까지 BS2024001400
-def parse_ShinyTrea():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2024001'
-    nums = list(range(401))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2024/BBS_2024_001_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-def parse_banditUR():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2015005'
-    nums = list(range(90,100))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = './'+'uni.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-def parse_stella():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2024012'
-    nums = list(range(110))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2024/BS_2024_012_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-def parse_Night2():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/BS2024011'
-    nums = list(range(100))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/BS/2024/BS_2024_011_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
-        
-def parse_Parukia():
-    url_head = 'https://pokemoncard.co.kr/cards/detail/ST2015006'
-    nums = list(range(80))
-    
-    parsed_card_num = 0
-    data_json = []
-    for num in nums:
-        url = url_head+do_scraping.to_three_digit(num)
-        if num == 1 or num % 5 == 0:
-            print(url)
-        
-        card_data, state = do_scraping.scrape_ptcg_kr(url)
-    
-        if state == "success":
-            data_json.append(card_data)
-            parsed_card_num += 1
-        elif state == "fail":
-            pass
-         
-    json_file_path = '../ptcg_kr_card_data/ST/2015/ST_2015_006_'+do_scraping.to_three_digit(parsed_card_num)+'.json'
-    with open(json_file_path,mode='w',encoding='utf-8') as file:
-        json.dump(data_json,file,ensure_ascii=False, indent=4)
+# names 가 None 이면 전부 돌린다
+def run_special_sets(names=None, json_root=do_scraping.JSON_ROOT, max_workers=MAX_WORKERS, cache=None):
+    special_sets = [item for item in SPECIAL_SETS if names is None or item['name'] in names]
+    runner = SpecialSetRunner(json_root, max_workers, cache)
+    reports = runner.run(special_sets)
+    return reports, runner.requested, len(runner.futures)
 
 if __name__ == "__main__":
-    #parse_bestxy()
-    #parse_GX_ulti()
-    #parse_win_medal()
-    #parse_bw_first()
-    #parse_ycollection()
-    #parse_worlds()
-    #parse_SM_promos()
-    #parse_a_medal()
-    #parse_ultra_force()
-    #parse_alola()
-    
+    parsing_start_time = time.time()
+
     # ver 1.1을 위해
-    #parse_VMAXCLIMAX()
-    #parse_ChangGong()
-    #parse_MaCheon()
-    #parse_25th()
-    #parse_Mask()
-    #parse_Night()
-    #parse_VSTARUni()
-    
+    # names = ['VMAXCLIMAX', 'ChangGong', 'MaCheon', '25th', 'Mask', 'Night', 'VSTARUni']
     # ver 1.2 위해
-    #parse_SV_Rares()
-    #parse_151()
-    #parse_ShinyTrea()
-    #parse_VSTARUni2()
-    #parse_banditUR()
-    
+    # names = ['SV_Rares', '151', 'ShinyTrea', 'VSTARUni2', 'banditUR']
     # ver 2.0 위해
-    #스텔라미라클 카드정보 추가
-    parse_stella()
-    #나이트 원더러 고레어 카드 추가
-    parse_Night2()
-    #누락 데이터 추가
-    parse_Parukia()
-    
\ No newline at end of file
+    names = ['stella', 'Night2', 'Parukia']
+
+    cache = html_cache.HtmlCache(do_scraping.HTML_CACHE_DIR)
+    reports, requested, fetched = run_special_sets(names, cache=cache)
+
+    print("Finish parsing special sets")
+    print(f"Sets : {len(reports)}")
+    print(f"Pages : {requested} requested, {fetched} fetched")
+    print(f"Total time : {round(time.time() - parsing_start_time, 2)} secs")
@@ -0,0 +1,94 @@
+import os
+import time
+from datetime import datetime
+
+import do_scraping
+import html_cache
+import crawl_manifest
+import discover_sets
+
+# Weekly refresh driven by the crawl manifest, instead of hand-editing year_list in do_scraping.py:
+# 1. new vers: for recent years, vers after the last known one are probed (discover_sets.find_vers).
+#    A recent year that is already closed (see CrawlManifest.is_closed_year) is not probed
+# 2. a sample of old vers: the SAMPLE_SIZE least recently crawled vers are crawled again
+# A ver's file is rewritten only if its pages changed since the last crawl.
+
+# Vers of these many past years are probed for new sets, plus year 0000
+RECENT_YEARS = 1
+# Old vers re-crawled per run
+SAMPLE_SIZE = 10
+
+# Crawl one ver and record it. Returns True if its file was (re)written
+def refresh_ver(discovery, manifest, category, year, ver, json_root):
+    last, gaps = discovery.find_ver_range(category, year, ver, crawl=True)
+    data_json = discovery.crawl_ver(category, year, ver, last, gaps)
+    if not data_json:
+        # Still a crawl: otherwise the same dead ver is the stalest on every run
+        manifest.touch(category, year, ver)
+        return False
+
+    page_hashes = {}
+    for card_data in data_json:
+        url = card_data['cardPageURL']
+        page_hashes[str(int(url[-3:]))] = crawl_manifest.page_hash(url, card_data, discovery.cache)
+
+    old = manifest.get(category, year, ver)
+    _, json_file_path = do_scraping.get_ver_json_path(json_root, category, year, ver, len(data_json))
+    if not manifest.update(category, year, ver, len(data_json), last, gaps, page_hashes, json_file_path):
+        return False
+
+    # The card count is part of the file name, so a grown ver leaves its old file behind
+    if old and old['file'] != json_file_path and os.path.exists(old['file']):
+        os.remove(old['file'])
+    do_scraping.save_ver_json(json_root, category, year, ver, data_json)
+    print(f"Data has been successfully saved to {json_file_path}")
+    return True
+
+def incremental_crawl(category_list, json_root=do_scraping.JSON_ROOT, manifest_path=crawl_manifest.MANIFEST_FILE,
+                      cache_dir=do_scraping.HTML_CACHE_DIR, recent_years=RECENT_YEARS, sample_size=SAMPLE_SIZE):
+    manifest = crawl_manifest.CrawlManifest(manifest_path)
+    if manifest.bootstrap(json_root):
+        manifest.save()
+
+    cache = html_cache.HtmlCache(cache_dir)
+    discovery = discover_sets.SetDiscovery(cache=cache, manifest=manifest)
+
+    this_year = datetime.now().year
+    refreshed = set()
+    new_vers = 0
+    changed_vers = 0
+
+    # 1. New vers
+    for category in category_list:
+        year_list = list(range(this_year - recent_years, this_year + 1)) + [0000]
+        for year in year_list:
+            if do_scraping.is_skipped_year(category, year) or manifest.is_closed_year(category, year):
+                continue
+
+            known_vers = manifest.known_vers(category, year)
+            start_ver = known_vers[-1] + 1 if known_vers else 0
+            for ver in discovery.find_vers(category, year, start_ver):
+                if refresh_ver(discovery, manifest, category, year, ver, json_root):
+                    new_vers += 1
+                refreshed.add(crawl_manifest.ver_key(category, year, ver))
+        manifest.save()
+
+    # 2. Sample of old vers
+    for item in manifest.stalest(sample_size, exclude=refreshed, category_list=category_list):
+        if refresh_ver(discovery, manifest, item['category'], item['year'], item['ver'], json_root):
+            changed_vers += 1
+        manifest.save()
+
+    return new_vers, changed_vers, discovery.requests
+
+if __name__ == "__main__":
+    parsing_start_time = time.time()
+
+    category_list = ["BS", "ST"]  # Promo cards use a different method
+    new_vers, changed_vers, requests = incremental_crawl(category_list)
+
+    print("Finish incremental crawl")
+    print(f"New vers : {new_vers}")
+    print(f"Changed vers : {changed_vers}")
+    print(f"Requests : {requests}")
+    print(f"Total time : {round(time.time() - parsing_start_time, 2)} secs")
@@ -0,0 +1,129 @@
+import os
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import do_scraping
+import html_cache
+import crawl_journal
+
+# Rebuild the ptcg_kr_card_data tree from pages saved in the HTML cache, without the network.
+# Every JSON file under the card data root is re-parsed card by card from its cardPageURLs,
+# so the files written by do_scraping_exceptions are rebuilt as well.
+# BeautifulSoup + parse() are CPU-bound, so pages are parsed in a process pool.
+# Cards keep their order inside each file and files are dumped exactly like do_scraping.save_ver_json,
+# so the output is byte-identical to a serial run over the same pages.
+#
+# FROM_JOURNAL = True instead builds the per-ver files of an interrupted crawl from its journal
+# (crawl_journal.JOURNAL_FILE), without crawling or parsing again.
+
+# Number of parser processes. None means os.cpu_count()
+MAX_WORKERS = None
+# Pages handed to a worker at once
+CHUNK_SIZE = 64
+FROM_JOURNAL = False
+
+def find_card_data_files(json_root):
+    json_files = []
+    for root, dirs, files in os.walk(json_root):
+        for file in files:
+            if file.endswith('.json'):
+                json_files.append(os.path.join(root, file))
+    return sorted(json_files)
+
+# Runs in a worker process
+def parse_cached_page(args):
+    url, cache_dir = args
+    html = html_cache.HtmlCache(cache_dir).get(url)
+    if html is None:
+        return None, "missing"
+    return do_scraping.parse_ptcg_kr(html, url)
+
+def dump_json(data_json):
+    return json.dumps(data_json, ensure_ascii=False, indent=4)
+
+def reparse_card_data(json_root=do_scraping.JSON_ROOT, out_root=None, cache_dir=do_scraping.HTML_CACHE_DIR,
+                      max_workers=MAX_WORKERS, chunk_size=CHUNK_SIZE):
+    if out_root is None:
+        out_root = json_root
+
+    # Collect every card page of every file, in file order
+    file_list = []
+    jobs = []
+    for file_path in find_card_data_files(json_root):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            old_json = json.load(f)
+        file_list.append((file_path, old_json))
+        for item in old_json:
+            jobs.append((item['cardPageURL'], cache_dir))
+
+    print(f"{len(file_list)} files, {len(jobs)} cards to re-parse")
+
+    # map keeps the job order, so results can be cut back into files in order
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(parse_cached_page, jobs, chunksize=chunk_size))
+
+    written_files = 0
+    changed_files = 0
+    missing_urls = []
+    failed_urls = []
+    pos = 0
+    for file_path, old_json in file_list:
+        data_json = []
+        for old_item in old_json:
+            card_data, state = results[pos]
+            pos += 1
+            if state == "success":
+                data_json.append(card_data)
+            else:
+                # Keep the old record rather than dropping a card
+                if state == "missing":
+                    missing_urls.append(old_item['cardPageURL'])
+                else:
+                    failed_urls.append(old_item['cardPageURL'])
+                data_json.append(old_item)
+
+        new_text = dump_json(data_json)
+        if new_text != dump_json(old_json):
+            changed_files += 1
+
+        out_path = os.path.join(out_root, os.path.relpath(file_path, json_root))
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with open(out_path, 'w', encoding='utf-8') as f:
+            f.write(new_text)
+        written_files += 1
+
+    return written_files, changed_files, missing_urls, failed_urls
+
+# Rebuild every per-ver file in the journal. Returns the written file paths
+def build_ver_files(journal_path=crawl_journal.JOURNAL_FILE, json_root=do_scraping.JSON_ROOT):
+    journal = crawl_journal.CrawlJournal(journal_path, resume=True)
+    json_file_paths = []
+    for category, year, ver in journal.vers():
+        data_json = journal.ver_cards(category, year, ver)
+        if data_json:
+            json_file_paths.append(do_scraping.save_ver_json(json_root, category, year, ver, data_json))
+    journal.close()
+    return json_file_paths
+
+if __name__ == "__main__":
+    parsing_start_time = time.time()
+
+    if FROM_JOURNAL:
+        json_file_paths = build_ver_files()
+        for json_file_path in json_file_paths:
+            print(f"Data has been successfully saved to {json_file_path}")
+        print(f"Written files : {len(json_file_paths)}")
+    else:
+        written_files, changed_files, missing_urls, failed_urls = reparse_card_data()
+
+        for url in missing_urls:
+            print(f"not in cache : {url}")
+        for url in failed_urls:
+            print(f"parse failed : {url}")
+
+        print("Finish re-parsing ptcg-kr data")
+        print(f"Written files : {written_files}")
+        print(f"Changed files : {changed_files}")
+        print(f"Missing pages : {len(missing_urls)}, failed pages : {len(failed_urls)}")
+    print(f"Total time : {round(time.time() - parsing_start_time, 2)} secs")
@@ -0,0 +1,76 @@
+import os
+import sys
+import gzip
+import json
+import argparse
+
+import do_scraping
+import html_cache
+
+# Small committed corpus of card detail pages, so the parser checks can run without the HTML cache.
+# Layout:
+#   fixtures/card_pages/{card id}.html.gz      : page of URL_HEAD + {card id} captured from the HTML cache, gzip compressed
+#   fixtures/card_pages/index.json             : {card id : what the page covers (year era module layout)}
+#   fixtures/synthetic_pages/{card id}.html.gz : pages written after the site's markup, as the parsers read it
+#   fixtures/synthetic_pages/index.json
+# The synthetic pages cover every supertype of every era (DP, BW, XY, SM, S, SV) with the odd layouts
+# (V-UNION, prism star, attack tools, 고대능력, 테라스탈, 포켓파워/포켓바디, VSTAR, ACE SPEC, promo),
+# an invalid card type page and a not-found page. They are not real cards: their ids use the category FX
+# (promo FXP), which the site does not have, so they never stand in for a real page.
+# The captured pages are the real markup, one per (year, era, supertype, layout) group of the cache:
+#   python bench_parsers.py --capture-fixtures
+# or one card at a time:
+#   python fixture_pages.py --capture BS2023003009 "2023 S pokemon regular"
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'card_pages')
+SYNTHETIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'synthetic_pages')
+FIXTURE_DIRS = [FIXTURE_DIR, SYNTHETIC_DIR]
+INDEX_FILE = 'index.json'
+
+def load_index(fixture_dir=FIXTURE_DIR):
+    with open(os.path.join(fixture_dir, INDEX_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def read_page(card_id, fixture_dir=FIXTURE_DIR):
+    with gzip.open(os.path.join(fixture_dir, card_id + '.html.gz'), 'rt', encoding='utf-8') as f:
+        return f.read()
+
+# {url : html} of every fixture page, captured ones first, in index order
+def load_pages(fixture_dirs=FIXTURE_DIRS, url_head=do_scraping.URL_HEAD):
+    pages = {}
+    for fixture_dir in fixture_dirs:
+        for card_id in load_index(fixture_dir):
+            pages[url_head + card_id] = read_page(card_id, fixture_dir)
+    return pages
+
+# Copy the cached page of a card id into the fixtures
+def capture(card_id, description, cache_dir=do_scraping.HTML_CACHE_DIR, fixture_dir=FIXTURE_DIR):
+    html = html_cache.HtmlCache(cache_dir).get(do_scraping.URL_HEAD + card_id)
+    if html is None:
+        print(f'Not in the cache : {card_id}')
+        return False
+
+    # mtime=0 keeps the .gz the same for the same page
+    with open(os.path.join(fixture_dir, card_id + '.html.gz'), 'wb') as f:
+        f.write(gzip.compress(html.encode('utf-8'), mtime=0))
+
+    index = load_index(fixture_dir)
+    index[card_id] = description
+    with open(os.path.join(fixture_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=4)
+        f.write('\n')
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='List the fixture card pages, or capture one from the HTML cache.')
+    parser.add_argument('--cache-dir', default=do_scraping.HTML_CACHE_DIR)
+    parser.add_argument('--capture', nargs=2, metavar=('CARD_ID', 'DESCRIPTION'))
+    args = parser.parse_args()
+
+    if args.capture:
+        if not capture(args.capture[0], args.capture[1], args.cache_dir):
+            sys.exit(1)
+    else:
+        for fixture_dir in FIXTURE_DIRS:
+            for card_id, description in load_index(fixture_dir).items():
+                print(f'{card_id} : {description}')
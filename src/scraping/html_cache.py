@@ -0,0 +1,146 @@
+import os
+import gzip
+import json
+import hashlib
+import threading
+from datetime import datetime
+
+import http_client
+
+# On-disk cache of raw card detail pages
+# Layout:
+#   {cache_dir}/objects/{sha[:2]}/{sha}.html.gz : page bodies, gzip compressed, keyed by sha256 of the body
+#   {cache_dir}/urls/{sha1(url)[:2]}/{sha1(url)}.json : per-URL metadata (body hash, ETag, Last-Modified, fetch time)
+# Identical bodies are stored once. Every URL has its own metadata file,
+# so concurrent crawls never write the same file at the same time.
+#
+# fetch() revalidates cached pages with If-None-Match / If-Modified-Since,
+# so a re-crawl only downloads pages that changed on the site.
+# get() never touches the network; re-parsing works from the cache alone.
+
+CACHE_DIR = './html_cache/'
+
+def hash_body(html):
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+def hash_url(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+# Write to a temp file and rename, so a crash never leaves a half-written file
+def write_atomic(path, data):
+    tmp_path = path + '.' + str(os.getpid()) + '_' + str(threading.get_ident()) + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class HtmlCache:
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        # Counters are shared by the crawler's worker threads
+        self.lock = threading.Lock()
+
+    def count(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def object_path(self, body_hash):
+        return os.path.join(self.cache_dir, 'objects', body_hash[:2], body_hash + '.html.gz')
+
+    def meta_path(self, url):
+        url_hash = hash_url(url)
+        return os.path.join(self.cache_dir, 'urls', url_hash[:2], url_hash + '.json')
+
+    def get_meta(self, url):
+        meta_path = self.meta_path(url)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def read_object(self, body_hash):
+        object_path = self.object_path(body_hash)
+        if not os.path.exists(object_path):
+            return None
+        with gzip.open(object_path, 'rb') as f:
+            return f.read().decode('utf-8')
+
+    # URL of every cached page
+    def urls(self):
+        for root, dirs, files in os.walk(os.path.join(self.cache_dir, 'urls')):
+            dirs.sort()
+            for file in sorted(files):
+                if not file.endswith('.json'):
+                    continue
+                with open(os.path.join(root, file), 'r', encoding='utf-8') as f:
+                    yield json.load(f)['url']
+
+    # Cached page body of url, or None. Never uses the network
+    def get(self, url):
+        meta = self.get_meta(url)
+        if not meta:
+            return None
+        return self.read_object(meta['hash'])
+
+    def put(self, url, html, etag=None, last_modified=None):
+        body_hash = hash_body(html)
+
+        object_path = self.object_path(body_hash)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            write_atomic(object_path, gzip.compress(html.encode('utf-8')))
+
+        meta = {
+            'url' : url,
+            'hash' : body_hash,
+            'etag' : etag,
+            'lastModified' : last_modified,
+            'fetchedAt' : datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        meta_path = self.meta_path(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+        return body_hash
+
+    # Page body of url, revalidated against the site with a conditional GET
+    # get can be swapped for another client's get.
+    # With read, the response is streamed and read(res) returns the body.
+    # conditional=False always downloads the page, for cached bodies the caller does not trust
+    def fetch(self, url, get=None, read=None, conditional=True):
+        if get is None:
+            get = http_client.get
+        meta = self.get_meta(url) if conditional else None
+        cached = self.read_object(meta['hash']) if meta else None
+
+        headers = {}
+        if cached is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('lastModified'):
+                headers['If-Modified-Since'] = meta['lastModified']
+
+        if read is None:
+            res = get(url, headers=headers)
+        else:
+            res = get(url, headers=headers, stream=True)
+
+        if res.status_code == 304 and cached is not None:
+            res.close()
+            self.count('not_modified')
+            return cached
+
+        self.count('misses')
+        html = res.text if read is None else read(res)
+        self.put(url, html, res.headers.get('ETag'), res.headers.get('Last-Modified'))
+        return html
+
+    # Cached body if present, otherwise fetch. Skips revalidation entirely
+    def get_or_fetch(self, url, get=None, read=None):
+        cached = self.get(url)
+        if cached is not None:
+            self.count('hits')
+            return cached
+        return self.fetch(url, get=get, read=read)
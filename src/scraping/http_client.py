@@ -0,0 +1,135 @@
+import time
+import random
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared HTTP client for every fetcher (card pages, card images, product pages)
+# - one requests.Session, so connections are pooled and kept alive
+# - connect/read timeouts on every request
+# - retries on connection errors, timeouts, 5xx and 429, with jittered exponential backoff
+#   (Retry-After is honoured for 429 and 503)
+# - a circuit breaker per host: after BREAKER_THRESHOLD failures in a row, requests to the host
+#   fail fast with CircuitOpenError for BREAKER_COOLDOWN seconds, then one trial request is let through
+#
+# Use http_client.get(url) like requests.get(url).
+
+TIMEOUT = (5, 30)  # (connect, read) secs
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+RETRY_STATUS = [429, 500, 502, 503, 504]
+POOL_SIZE = 32
+BREAKER_THRESHOLD = 10
+BREAKER_COOLDOWN = 60
+
+class CircuitOpenError(requests.ConnectionError):
+    pass
+
+class CircuitBreaker:
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def before_request(self, host):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.cooldown:
+                raise CircuitOpenError(f'circuit open for {host}')
+            # Half open: let this request through as a trial, and reopen at once if it fails
+            self.opened_at = None
+            self.failures = self.threshold - 1
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+def backoff_delay(attempt, base=BACKOFF_BASE, max_delay=BACKOFF_MAX):
+    # Full jitter: uniform in [0, base * 2^attempt], capped
+    return random.uniform(0, min(max_delay, base * (2 ** attempt)))
+
+def retry_after_delay(res):
+    value = res.headers.get('Retry-After')
+    if value and value.isdigit():
+        return min(BACKOFF_MAX, int(value))
+    return None
+
+class HttpClient:
+    def __init__(self, timeout=TIMEOUT, max_retries=MAX_RETRIES, pool_size=POOL_SIZE,
+                 breaker_threshold=BREAKER_THRESHOLD, breaker_cooldown=BREAKER_COOLDOWN):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.breakers = {}
+        self.lock = threading.Lock()
+
+    def get_breaker(self, host):
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+            return self.breakers[host]
+
+    def get(self, url, headers=None, stream=False):
+        host = urlparse(url).netloc
+        breaker = self.get_breaker(host)
+
+        for attempt in range(self.max_retries + 1):
+            breaker.before_request(host)
+            last_try = attempt == self.max_retries
+
+            try:
+                res = self.session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                breaker.record_failure()
+                if last_try:
+                    raise
+                print(f'RETRY {attempt + 1} : {url} ({type(e).__name__})')
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            if res.status_code in RETRY_STATUS:
+                breaker.record_failure()
+                if last_try:
+                    res.raise_for_status()
+                print(f'RETRY {attempt + 1} : {url} ({res.status_code})')
+                delay = retry_after_delay(res)
+                res.close()
+                time.sleep(delay if delay is not None else backoff_delay(attempt))
+                continue
+
+            breaker.record_success()
+            return res
+
+# One client shared by the whole process
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+def get(url, headers=None, stream=False):
+    return get_client().get(url, headers=headers, stream=stream)
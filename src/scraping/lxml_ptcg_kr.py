@@ -0,0 +1,459 @@
+from lxml import etree
+from bs4 import BeautifulSoup
+
+import card_rules
+import anomaly_sink
+
+# Card page parser on lxml, the fast alternative to the BeautifulSoup parsers
+# in pokemon_ptcg_kr, trainers_ptcg_kr and energy_ptcg_kr. The records are the same.
+# - no soup is built: the page is parsed by lxml and walked once, keeping the first node
+#   of every page-level selector (the soup.find(...) calls of the three parsers)
+# - lookups inside those nodes use XPath compiled at import time
+# - the rules (rule text, keywords, card IDs) are card_rules, shared with the three parser modules;
+#   this module only finds the nodes and reads their text
+# Selected with do_scraping.PARSER_BACKEND = 'lxml'.
+# compare_parser_backends.py checks both backends give the same records over the HTML cache,
+# tests/test_parser_backends.py over the committed fixture pages (fixture_pages.py).
+
+# Strings BeautifulSoup's get_text() returns: no comments, no script/style/template/rt/rp text
+TEXT_NODES = etree.XPath(
+    './/text()[not(parent::script or parent::style or parent::template or parent::rt or parent::rp)]',
+    smart_strings=False
+)
+
+def class_token(name):
+    return "contains(concat(' ', normalize-space(@class), ' '), ' " + name + " ')"
+
+def class_exact(name):
+    return "normalize-space(@class) = '" + name + "'"
+
+def xpath(expr):
+    return etree.XPath(expr, smart_strings=False)
+
+# Lookups inside a node, soup.find(...) / find_all(...) in the BeautifulSoup parsers
+IMGS = xpath('.//img')
+FIRST_IMG = xpath('(.//img)[1]')
+FIRST_P = xpath('(.//p)[1]')
+FIRST_SPAN = xpath('(.//span)[1]')
+PS = xpath('.//p')
+SKILL_LABEL = xpath("(.//span[@id='skill_label'])[1]")
+SKIL_NAME = xpath('(.//span[' + class_token('skil_name') + '])[1]')
+AREA_PARENT = xpath('(.//div[' + class_token('area-parent') + '])[1]')
+PLUS = xpath('(.//span[' + class_token('plus') + '])[1]')
+TXT_RIGHT = xpath('(.//div[' + class_token('txt_right') + '])[1]')
+CARD_HP = xpath('(.//span[' + class_token('card-hp') + '])[1]')
+TYPE_IMGS = xpath('.//img[' + class_token('type_b') + ']')
+STATS = xpath('.//div[' + class_token('stat') + ']')
+CARD_ENERGIES = xpath('(.//div[' + class_token('card-energies') + '])[1]')
+ABILITIES = xpath('.//div[' + class_token('ability') + ']')
+LEFT_LABEL = xpath('(.//h4[' + class_exact('left label') + '])[1]')
+
+# Page-level nodes: key, tag, class token, exact class, id
+PAGE_NODES = [
+    ('info', 'div', 'pokemon-info', None, None),
+    ('name', 'span', None, 'card-hp title', None),
+    ('p_num', 'span', 'p_num', None, None),
+    ('pre_info_wrap', 'div', 'pre_info_wrap', None, None),
+    ('prod_name', 'a', 'search_href', None, None),
+    ('illustrator', 'p', 'illustrator', None, None),
+    ('rarity', 'span', None, None, 'no_wrap_by_admin'),
+    ('card_img', 'img', 'feature_image', None, None),
+    ('hp_num', 'span', 'hp_num', None, None),
+    ('header', 'div', 'header', None, None),
+    ('stats', 'div', 'pokemon-stats', None, None),
+    ('abilities', 'div', 'pokemon-abilities', None, None),
+    ('flavor', 'div', None, 'col-md-8 col-xs-7 colsit', None),
+]
+PAGE_TAGS = sorted(set(node[1] for node in PAGE_NODES)) + ['script']
+
+NOT_FOUND_MARKER = '없는 카드데이터 입니다.'
+
+def get_text(node, separator=''):
+    return separator.join(TEXT_NODES(node))
+
+def first(nodes):
+    return nodes[0] if nodes else None
+
+def find(node, path):
+    return first(path(node))
+
+# len(tag.contents) of BeautifulSoup: text, child and tail nodes
+def count_contents(node):
+    count = 1 if node.text else 0
+    for child in node:
+        count += 2 if child.tail else 1
+    return count
+
+class Page:
+    def __init__(self, html):
+        self.nodes = {}
+        self.not_found = False
+
+        root = etree.HTML(html)
+        if root is None:
+            return
+
+        selectors = {}
+        for key, tag, token, exact, id_ in PAGE_NODES:
+            selectors.setdefault(tag, []).append((key, token, exact, id_))
+
+        # One walk over the page
+        for el in root.iter(*PAGE_TAGS):
+            if el.tag == 'script':
+                if el.text and NOT_FOUND_MARKER in el.text:
+                    self.not_found = True
+                continue
+
+            classes = el.get('class', '').split()
+            for key, token, exact, id_ in selectors[el.tag]:
+                if key in self.nodes:
+                    continue
+                if token is not None and token not in classes:
+                    continue
+                if exact is not None and ' '.join(classes) != exact:
+                    continue
+                if id_ is not None and el.get('id') != id_:
+                    continue
+                self.nodes[key] = el
+
+    def get(self, key):
+        return self.nodes.get(key)
+
+    def text(self, key):
+        return get_text(self.nodes[key])
+
+# Fields every supertype has, read the way the three parsers read them
+def check_card_number(page, allow_missing=False):
+    p_num = page.get('p_num')
+    if p_num is None and allow_missing:
+        return '000', '000'
+    return card_rules.split_card_number(get_text(p_num))
+
+def get_prod_name(page, stage, url):
+    prod_name_obj = page.get('prod_name')
+    if prod_name_obj is not None:
+        return get_text(prod_name_obj)
+    anomaly_sink.log(stage, 'prod_name', url)
+    return ''
+
+def get_artist(page, stage, url):
+    artist_obj = page.get('illustrator')
+    if artist_obj is not None:
+        return card_rules.artist_name(get_text(artist_obj, separator=" "))
+    anomaly_sink.log(stage, 'artist info', url)
+    return '정보없음'
+
+def get_regulation_mark(page):
+    symbol_objs = IMGS(page.get('pre_info_wrap'))
+    if len(symbol_objs) > 1:
+        return card_rules.symbol_code(symbol_objs[1].attrib['src'])
+    return ''
+
+def get_card_texts(page):
+    return card_rules.split_card_texts(get_text(obj) for obj in PS(page.get('abilities')))
+
+# Pokémon
+
+# div.ability as card_rules.check_ability / check_attack / check_rule read it
+class AbilityBlock:
+    def __init__(self, node):
+        self.node = node
+
+    def skill_label(self):
+        label = find(self.node, SKILL_LABEL)
+        return get_text(label) if label is not None else None
+
+    def skill_label_tail(self):
+        return find(self.node, SKILL_LABEL).tail
+
+    def skil_name(self):
+        skil_name = find(self.node, SKIL_NAME)
+        return get_text(skil_name) if skil_name is not None else None
+
+    def text(self):
+        text_obj = find(self.node, FIRST_P)
+        return get_text(text_obj) if text_obj is not None else None
+
+    def costs(self):
+        return [img.attrib['title'] for img in IMGS(find(self.node, AREA_PARENT))]
+
+    def area_plus(self):
+        return find(find(self.node, AREA_PARENT), PLUS) is not None
+
+    def damage(self):
+        damage_obj = find(self.node, PLUS)
+        return get_text(damage_obj) if damage_obj is not None else None
+
+def get_stat(stat_obj, where, url):
+    stat = {}
+    img = find(stat_obj, FIRST_IMG)
+    if img is None:
+        stat['type'] = ''
+        stat['value'] = '--'
+        return stat
+
+    stat['type'] = card_rules.type_format(img.attrib['title'])
+    value_obj = find(stat_obj, FIRST_SPAN)
+    if value_obj is not None:
+        stat['value'] = get_text(value_obj)
+    else:
+        stat['value'] = '정보없음'
+        anomaly_sink.log(card_rules.POKEMON_STAGE, where, url, stat_obj)
+    return stat
+
+def parse_pokemon(page, url):
+    data = {}
+    subtypes = []
+    rules = []
+    pokemons = []
+    attacks = []
+    abilities = []
+    cardID = ''
+    type_ = ''
+    flavorText = ''
+
+    prodSymbolURL = find(page.get('pre_info_wrap'), FIRST_IMG).attrib['src']
+    prodCode = card_rules.symbol_code(prodSymbolURL)
+    prodName = get_prod_name(page, card_rules.POKEMON_STAGE, url)
+    artist = get_artist(page, card_rules.POKEMON_STAGE, url)
+    rarity = card_rules.rarity(page.text('rarity'))
+    regulationMark = get_regulation_mark(page)
+    cardImgURL = page.get('card_img').attrib['src']
+
+    name_text = page.text('name')
+    name = card_rules.pokemon_name(name_text)
+
+    number, prodNumber = check_card_number(page)
+    id_, prodCode = card_rules.card_id(prodCode, prodName, number, prodNumber)
+
+    info_text = page.text('info')
+    evo = card_rules.evo_subtype(info_text)
+    if evo is not None:
+        subtypes.append(evo)
+    else:
+        anomaly_sink.log(card_rules.POKEMON_STAGE, 'check evo', url, page.get('info'))
+
+    hp_obj = page.get('hp_num')
+    if hp_obj is not None:
+        hp = card_rules.hp_value(get_text(hp_obj))
+    else:
+        anomaly_sink.log(card_rules.POKEMON_STAGE, 'no hp_num', url, page.get('header'))
+        hp = -1
+
+    type_objs = TYPE_IMGS(find(find(page.get('header'), TXT_RIGHT), CARD_HP))
+    if len(type_objs) == 1:
+        type_ = card_rules.type_format(type_objs[0].attrib['title'])
+    elif len(type_objs) == 2:
+        type_ = card_rules.type_format(type_objs[0].attrib['title']) + card_rules.type_format(type_objs[1].attrib['title'])
+
+    stat_objs = STATS(page.get('stats'))
+    weakness = get_stat(stat_objs[0], 'weak value', url)
+    resistance = get_stat(stat_objs[1], 'resi value', url)
+    retreatCost = len(IMGS(find(stat_objs[2], CARD_ENERGIES)))
+
+    for obj in ABILITIES(page.get('abilities')):
+        # Skip empty containers (e.g. V-UNION cards)
+        if count_contents(obj) < 3:
+            continue
+
+        block = AbilityBlock(obj)
+        if card_rules.check_ability(block, abilities, url):
+            continue
+        elif card_rules.check_attack(block, attacks):
+            continue
+        elif card_rules.check_rule(block, rules, subtypes):
+            continue
+        else:
+            anomaly_sink.log(card_rules.POKEMON_STAGE, 'card text', url, obj)
+
+    flavorTextObj = find(page.get('flavor'), FIRST_P)
+    if flavorTextObj is not None:
+        flavorText = card_rules.flavor_text(get_text(flavorTextObj))
+
+    card_rules.check_pokemon_keyword(subtypes, info_text, name_text)
+
+    if not card_rules.check_pokemons(pokemons, name):
+        anomaly_sink.log(card_rules.POKEMON_STAGE, 'check pokemons', url)
+    else:
+        cardID = card_rules.make_cardID_old(pokemons, type_, hp, attacks)
+
+    data['id'] = id_
+    data['cardID'] = cardID
+    data['name'] = name
+    data['supertype'] = '포켓몬'
+    data['subtypes'] = subtypes
+    data['rules'] = rules
+
+    data['hp'] = hp
+    data['pokemons'] = pokemons
+    data['type'] = type_
+    data['attacks'] = attacks
+    data['abilities'] = abilities
+    data['weakness'] = weakness
+    data['resistance'] = resistance
+    data['retreatCost'] = retreatCost
+    data['flavorText'] = flavorText
+
+    data['number'] = number
+    data['prodNumber'] = prodNumber
+    data['prodCode'] = prodCode
+    data['prodSymbolURL'] = prodSymbolURL
+    data['prodName'] = prodName
+    data['artist'] = artist
+    data['rarity'] = rarity
+    data['regulationMark'] = regulationMark
+    data['cardImgURL'] = cardImgURL
+    data['cardPageURL'] = url
+
+    data['cardID'] = card_rules.make_cardID(data)
+
+    return data
+
+# Trainers
+
+# Attack labels of a Pokémon Tool for card_rules.tool_attack
+def get_attack_labels(page):
+    labels = []
+    for obj in ABILITIES(page.get('abilities')):
+        label = find(obj, LEFT_LABEL)
+        cost_objs = IMGS(label)
+        if not cost_objs:
+            continue
+
+        text_obj = find(obj, FIRST_P)
+        text = get_text(text_obj) if text_obj is not None else None
+        labels.append((get_text(label), [cost_obj.attrib['title'] for cost_obj in cost_objs], text))
+    return labels
+
+def parse_trainers(page, url):
+    data = {}
+    subtypes = []
+    rules = []
+
+    name_text = page.text('name')
+    name = card_rules.card_name(name_text)
+
+    prodSymbolURL = find(page.get('pre_info_wrap'), FIRST_IMG).attrib['src']
+    prodCode = card_rules.symbol_code(prodSymbolURL)
+    prodName = get_prod_name(page, card_rules.TRAINERS_STAGE, url)
+    artist = get_artist(page, card_rules.TRAINERS_STAGE, url)
+    rarity = card_rules.rarity(page.text('rarity'))
+    regulationMark = get_regulation_mark(page)
+    cardImgURL = page.get('card_img').attrib['src']
+
+    number, prodNumber = check_card_number(page)
+    id_, prodCode = card_rules.card_id(prodCode, prodName, number, prodNumber)
+
+    texts = get_card_texts(page)
+
+    info_text = page.text('info')
+    subtypes.append(card_rules.trainers_subtype(texts, info_text))
+    texts, rules, subtypes = card_rules.trainers_texts_and_rules(texts, rules, subtypes)
+
+    card_rules.check_trainers_keyword(subtypes, info_text, name_text)
+
+    data['id'] = id_
+    data['cardID'] = name
+    data['name'] = name
+    data['supertype'] = '트레이너스'
+    data['subtypes'] = subtypes
+    data['rules'] = rules
+    data['texts'] = texts
+    ## Handle Pokémon Tool cards that grant attacks
+    if card_rules.is_attack_tool(subtypes, texts, name):
+        attack, result, data['texts'] = card_rules.tool_attack(get_attack_labels(page), texts, name_text)
+        if not result:
+            anomaly_sink.log(card_rules.TRAINERS_STAGE, 'attack tool', url, page.get('abilities'))
+        data['attack'] = attack
+    data['number'] = number
+    data['prodNumber'] = prodNumber
+    data['prodCode'] = prodCode
+    data['prodSymbolURL'] = prodSymbolURL
+    data['prodName'] = prodName
+    data['artist'] = artist
+    data['rarity'] = rarity
+    data['regulationMark'] = regulationMark
+    data['cardImgURL'] = cardImgURL
+    data['cardPageURL'] = url
+
+    return data
+
+# Energy
+def parse_energy(page, url):
+    data = {}
+    subtypes = []
+    rules = []
+    prodSymbolURL = ''
+    prodCode = ''
+
+    name_text = page.text('name')
+    name = card_rules.card_name(name_text)
+
+    prodName = get_prod_name(page, card_rules.ENERGY_STAGE, url)
+    rarity = card_rules.rarity(page.text('rarity'))
+    cardImgURL = page.get('card_img').attrib['src']
+
+    number, prodNumber = check_card_number(page, allow_missing=True)
+
+    # Basic energy cards may not have a product symbol
+    prod_symbol_obj = find(page.get('pre_info_wrap'), FIRST_IMG)
+    if prod_symbol_obj is not None:
+        prodSymbolURL = prod_symbol_obj.attrib['src']
+        prodCode = card_rules.symbol_code(prodSymbolURL)
+
+    id_, prodCode = card_rules.card_id(prodCode, prodName, number, prodNumber)
+
+    texts = get_card_texts(page)
+
+    info_text = page.text('info')
+    subtypes.append(card_rules.energy_subtype(info_text))
+
+    regulationMark = get_regulation_mark(page)
+    texts, rules, subtypes = card_rules.energy_texts_and_rules(texts, rules, subtypes)
+
+    card_rules.check_energy_keyword(subtypes, info_text, name_text)
+
+    data['id'] = id_
+    data['cardID'] = name
+    data['name'] = name
+    data['supertype'] = '에너지'
+    data['subtypes'] = subtypes
+    data['rules'] = rules
+    data['texts'] = texts
+    data['number'] = number
+    data['prodNumber'] = prodNumber
+    data['prodCode'] = prodCode
+    data['prodSymbolURL'] = prodSymbolURL
+    data['prodName'] = prodName
+    data['rarity'] = rarity
+    data['regulationMark'] = regulationMark
+    data['cardImgURL'] = cardImgURL
+    data['cardPageURL'] = url
+
+    return data
+
+# Same contract as do_scraping.parse_ptcg_kr: (card data, "success") or (None, "fail")
+def parse_ptcg_kr(html, url):
+    page = Page(html)
+    if page.not_found:
+        return None, "fail"
+
+    card_type = page.text('info')
+    supertype = card_rules.card_supertype(card_type)
+
+    if supertype == 'trainers':
+        data = parse_trainers(page, url)
+    elif supertype == 'energy':
+        data = parse_energy(page, url)
+    elif supertype == 'pokemon':
+        data = parse_pokemon(page, url)
+    else:
+        anomaly_sink.log('do_scraping', 'invalid card type', url, page.get('info'))
+        # Rare: the raw header is kept in BeautifulSoup's serialization
+        soup = BeautifulSoup(html, 'lxml')
+        data = {}
+        data['supertype'] = card_type
+        data['info'] = str(soup.find('div', class_='container', id='heaer_top'))
+        data['cardPageURL'] = url
+
+    return data, "success"
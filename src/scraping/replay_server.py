@@ -0,0 +1,123 @@
+import time
+import random
+import argparse
+import threading
+from urllib.parse import urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import do_scraping
+import html_cache
+
+# Local stand-in for pokemoncard.co.kr that replays card detail pages recorded in the HTML cache.
+# - /cards/detail/{id} returns the cached page of URL_HEAD + {id}
+# - ids that were never recorded get the site's "card data not found" page
+#   (a recorded one if the cache has one, otherwise a minimal page with the same script),
+#   so every ver ends exactly where it ended on the site
+# - slow_rate of the responses wait slow_secs before answering
+# - error_rate of the responses are 503 with Retry-After: 0, so the client's retry path is exercised
+#   without its backoff sleeping
+# Point a crawler at it with url_head=replay_url_head(port).
+# Used by bench_crawl.py; can also be run alone:
+#   python replay_server.py --cache-dir ./html_cache/ --port 8000
+
+PORT = 8000
+DETAIL_PATH = '/cards/detail/'
+NOT_FOUND_HTML = (
+    '<html><head></head><body>'
+    f'<script>alert("{do_scraping.NOT_FOUND_MARKER}"); history.back();</script>'
+    '</body></html>'
+)
+
+def replay_url_head(port=PORT, host='127.0.0.1'):
+    return f'http://{host}:{port}{DETAIL_PATH}'
+
+class ReplayCorpus:
+    def __init__(self, pages, not_found_html=NOT_FOUND_HTML):
+        # card id -> html
+        self.pages = pages
+        self.not_found_html = not_found_html
+
+    @classmethod
+    def from_cache(cls, cache_dir=do_scraping.HTML_CACHE_DIR, url_head=do_scraping.URL_HEAD):
+        cache = html_cache.HtmlCache(cache_dir)
+        pages = {}
+        not_found_html = NOT_FOUND_HTML
+        for url in cache.urls():
+            if not url.startswith(url_head):
+                continue
+            html = cache.get(url)
+            if html is None:
+                continue
+            if do_scraping.is_not_found_html(html):
+                not_found_html = html
+                continue
+            pages[url[len(url_head):]] = html
+        return cls(pages, not_found_html)
+
+    def get(self, card_id):
+        return self.pages.get(card_id, self.not_found_html)
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        path = urlparse(self.path).path
+        if not path.startswith(DETAIL_PATH):
+            self.send_error(404)
+            return
+
+        with server.lock:
+            slow = server.random.random() < server.slow_rate
+            error = server.random.random() < server.error_rate
+        if slow:
+            time.sleep(server.slow_secs)
+        if error:
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = server.corpus.get(path[len(DETAIL_PATH):]).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Quiet: one line per request would drown the benchmark output
+    def log_message(self, format, *args):
+        pass
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, corpus, host='127.0.0.1', port=PORT, slow_rate=0.0, slow_secs=0.0, error_rate=0.0, seed=0):
+        super().__init__((host, port), ReplayHandler)
+        self.corpus = corpus
+        self.slow_rate = slow_rate
+        self.slow_secs = slow_secs
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+def serve(cache_dir=do_scraping.HTML_CACHE_DIR, host='127.0.0.1', port=PORT, slow_rate=0.0, slow_secs=0.0,
+          error_rate=0.0, seed=0, ready=None):
+    corpus = ReplayCorpus.from_cache(cache_dir)
+    server = ReplayServer(corpus, host, port, slow_rate, slow_secs, error_rate, seed)
+    print(f'Replaying {len(corpus.pages)} pages on {replay_url_head(server.server_address[1], host)}')
+    # ready: multiprocessing.Event set once the port is bound
+    if ready is not None:
+        ready.set()
+    server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Replay cached card pages on a local HTTP server.')
+    parser.add_argument('--cache-dir', default=do_scraping.HTML_CACHE_DIR)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--slow-rate', type=float, default=0.0)
+    parser.add_argument('--slow-secs', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    serve(args.cache_dir, args.host, args.port, args.slow_rate, args.slow_secs, args.error_rate, args.seed)
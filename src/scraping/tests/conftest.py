@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The scraping scripts import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import anomaly_sink
+
+# Fixture pages are parsed many times; keep them out of the anomaly files
+anomaly_sink.disable()
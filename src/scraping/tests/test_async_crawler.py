@@ -0,0 +1,63 @@
+import asyncio
+import threading
+
+import pytest
+
+import do_scraping
+import do_scraping_async
+import fixture_pages
+import replay_server
+
+CATEGORY, YEAR, VER = 'BS', 2024, 1
+
+# Every fixture card page, renumbered as the cards of one ver; the not-found page answers the rest
+def make_corpus():
+    cards = []
+    not_found_html = None
+    for html in fixture_pages.load_pages().values():
+        if do_scraping.is_not_found_html(html):
+            not_found_html = html
+        else:
+            cards.append(html)
+
+    card_id_head = do_scraping.build_url('', CATEGORY, YEAR, VER, 0)[:-3]
+    pages = {card_id_head + do_scraping.to_three_digit(num) : html for num, html in enumerate(cards, start=1)}
+    return replay_server.ReplayCorpus(pages, not_found_html)
+
+@pytest.fixture
+def replay():
+    corpus = make_corpus()
+    # Port 0: any free port
+    server = replay_server.ReplayServer(corpus, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield corpus, replay_server.replay_url_head(server.server_address[1])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def crawl_ver(url_head, category, year, ver, num_window):
+    async def crawl():
+        crawler = do_scraping_async.AsyncCrawler(url_head=url_head, per_host_interval=0, num_window=num_window)
+        try:
+            return await crawler.crawl_ver(category, year, ver)
+        finally:
+            crawler.executor.shutdown(wait=False)
+
+    return asyncio.run(crawl())
+
+# With the 25 fixture cards: one page at a time, a window ending exactly on the last card (5) and one past it (8)
+@pytest.mark.parametrize('num_window', [1, 5, 8])
+def test_crawl_ver_returns_every_card_in_num_order(replay, num_window):
+    corpus, url_head = replay
+    data_json = crawl_ver(url_head, CATEGORY, YEAR, VER, num_window)
+
+    urls = [do_scraping.build_url(url_head, CATEGORY, YEAR, VER, num) for num in range(1, len(corpus.pages) + 1)]
+    assert len(data_json) == len(corpus.pages)
+    assert [card['cardPageURL'] for card in data_json] == urls
+    assert data_json == [do_scraping.parse_ptcg_kr(corpus.pages[url[len(url_head):]], url)[0] for url in urls]
+
+def test_crawl_ver_of_a_missing_ver_is_empty(replay):
+    corpus, url_head = replay
+    assert crawl_ver(url_head, CATEGORY, YEAR, VER + 1, 8) == []
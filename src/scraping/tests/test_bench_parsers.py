@@ -0,0 +1,41 @@
+import os
+import json
+
+import bench_parsers
+import fixture_pages
+import html_cache
+
+FIXTURES = fixture_pages.load_pages()
+PAGES = bench_parsers.load_pages(FIXTURES.get, list(FIXTURES))
+
+def test_corpus_hash_covers_page_bodies():
+    url, html, soup, data = PAGES[0]
+    changed = [(url, html.replace('</body>', '<p></p></body>'), soup, data)] + PAGES[1:]
+    assert bench_parsers.corpus_hash(changed) != bench_parsers.corpus_hash(PAGES)
+    assert bench_parsers.corpus_hash(list(reversed(PAGES))) == bench_parsers.corpus_hash(PAGES)
+
+def test_fixtures_cover_every_era_and_layout():
+    keys = [bench_parsers.page_group(url, data) for url, html, soup, data in PAGES]
+    assert bench_parsers.missing_coverage(keys) == ([], [])
+    assert bench_parsers.missing_coverage(['2024 SV pokemon regular']) == (
+        ['DP', 'BW', 'XY', 'SM', 'S'], bench_parsers.REQUIRED_LAYOUTS)
+
+def test_make_cardID_is_timed_on_pokemon_only():
+    cases = bench_parsers.make_cases(PAGES)
+    pokemon = [data for url, html, soup, data in PAGES if data['supertype'] == '포켓몬']
+    assert len(cases['make_cardID']) == len(pokemon) < len(PAGES)
+
+def test_capture_fixtures_copies_one_page_per_group(tmp_path):
+    cache = html_cache.HtmlCache(str(tmp_path / 'cache'))
+    for url, html in FIXTURES.items():
+        cache.put(url, html)
+    fixture_dir = str(tmp_path / 'fixtures')
+    os.makedirs(fixture_dir)
+    with open(os.path.join(fixture_dir, fixture_pages.INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump({}, f)
+
+    corpus, captured = bench_parsers.capture_fixtures(str(tmp_path / 'cache'), fixture_dir=fixture_dir)
+    assert captured == len(corpus) == len(set(bench_parsers.page_group(url, data) for url, html, soup, data in PAGES))
+    assert sorted(fixture_pages.load_index(fixture_dir).values()) == sorted(corpus)
+    for url, html in fixture_pages.load_pages([fixture_dir]).items():
+        assert html == FIXTURES[url]
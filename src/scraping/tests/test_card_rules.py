@@ -0,0 +1,30 @@
+import card_rules
+import lxml_ptcg_kr
+
+def test_lxml_backend_does_not_import_the_bs4_parsers():
+    for module in ['pokemon_ptcg_kr', 'trainers_ptcg_kr', 'energy_ptcg_kr']:
+        assert not hasattr(lxml_ptcg_kr, module)
+
+def test_split_card_texts_joins_closing_parentheses():
+    texts = card_rules.split_card_texts(['(대전 중 1번만 사용할 수 있다.) 코인을 던진다.'])
+    assert texts == ['(대전 중 1번만 사용할 수 있다.)', '코인을 던진다.']
+
+def test_seal_stone_attack_replaces_the_texts():
+    attack, result, texts = card_rules.tool_attack([], ['아무 텍스트.'], '숲의 봉인석')
+    assert result
+    assert attack['name'] == '스타알케미' and attack['special'] == 'VSTAR'
+    assert texts == card_rules.SEAL_STONE_TEXTS and texts is not card_rules.SEAL_STONE_TEXTS
+
+def test_tag_team_is_added_once_for_pokemon_only():
+    pokemon = ['TAG TEAM']
+    card_rules.check_pokemon_keyword(pokemon, 'TAG TEAM 기본', '')
+    trainers = ['서포트', 'TAG TEAM']
+    card_rules.check_trainers_keyword(trainers, 'TAG TEAM 서포트', '')
+    assert pokemon == ['TAG TEAM']
+    assert trainers == ['서포트', 'TAG TEAM', 'TAG TEAM']
+
+def test_card_supertype_checks_trainers_first():
+    assert card_rules.card_supertype('포켓몬의 도구') == 'trainers'
+    assert card_rules.card_supertype('특수 에너지') == 'energy'
+    assert card_rules.card_supertype('1진화 포켓몬') == 'pokemon'
+    assert card_rules.card_supertype('') is None
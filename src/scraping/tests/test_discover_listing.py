@@ -0,0 +1,35 @@
+import pytest
+
+import discover_listing
+
+def listing_html(card_ids):
+    return ''.join(f'<a href="/cards/detail/{card_id}">{card_id}</a>' for card_id in card_ids)
+
+class FakeListing(discover_listing.ListingDiscovery):
+    def __init__(self, pages, page_window=3):
+        super().__init__(page_window=page_window)
+        self.listing_pages = pages
+
+    def fetch_page(self, page):
+        return self.listing_pages.get(page, '')
+
+def discover(pages, page_window=3):
+    discovery = FakeListing(pages, page_window)
+    try:
+        return discovery.discover(max_pages=20)
+    finally:
+        discovery.close()
+
+def test_discover_stops_at_the_first_page_without_new_cards():
+    pages = {1 : listing_html(['BS2024001001', 'BS2024001002']), 2 : listing_html(['BS2024001003', 'SVP002023005'])}
+    assert discover(pages) == ['BS2024001001', 'BS2024001002', 'BS2024001003', 'SVP002023005']
+
+def test_discover_fails_on_a_page_1_without_detail_links():
+    with pytest.raises(discover_listing.ListingError):
+        discover({1 : '<html><body>점검 중</body></html>'})
+
+@pytest.mark.parametrize('page_window', [1, 3])
+def test_discover_fails_when_page_2_repeats_page_1(page_window):
+    page = listing_html(['BS2024001001', 'BS2024001002'])
+    with pytest.raises(discover_listing.ListingError):
+        discover({num : page for num in range(1, 21)}, page_window)
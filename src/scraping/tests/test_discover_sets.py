@@ -0,0 +1,80 @@
+import do_scraping
+import crawl_manifest
+import discover_sets
+
+# Site of BS2024: ver 1 has nums 1..10, ver 3 has nums 1..5 and 8..9, nothing else
+SITE = {1 : set(range(1, 11)), 3 : {1, 2, 3, 4, 5, 8, 9}}
+
+class FakeSite:
+    def __init__(self, site=SITE):
+        self.site = site
+        self.requests = []
+
+    def scrape(self, url, cache=None):
+        ver, num = int(url[-6:-3]), int(url[-3:])
+        self.requests.append((ver, num))
+        if num in self.site.get(ver, ()):
+            return {'cardPageURL' : url}, "success"
+        return None, "error"
+
+def make_discovery(monkeypatch, manifest=None):
+    site = FakeSite()
+    monkeypatch.setattr(do_scraping, 'scrape_ptcg_kr', site.scrape)
+    return site, discover_sets.SetDiscovery(manifest=manifest)
+
+def make_manifest(tmp_path, vers):
+    manifest = crawl_manifest.CrawlManifest(str(tmp_path / 'manifest.json'))
+    for ver, last_num, gaps in vers:
+        manifest.update('BS', 2024, ver, last_num, last_num, gaps, {}, '')
+    return manifest
+
+def test_crawl_without_manifest(monkeypatch):
+    site, discovery = make_discovery(monkeypatch)
+    assert discovery.find_vers('BS', 2024) == [1, 3]
+
+    last, gaps = discovery.find_ver_range('BS', 2024, 3, crawl=True)
+    assert (last, gaps) == (9, [[6, 7]])
+    assert len(discovery.crawl_ver('BS', 2024, 3, last, gaps)) == 7
+    assert gaps == [[6, 7]]
+
+def test_known_ver_without_gaps_skips_the_lookahead(monkeypatch, tmp_path):
+    site, discovery = make_discovery(monkeypatch, make_manifest(tmp_path, [(1, 10, [])]))
+    assert discovery.find_ver_range('BS', 2024, 1, crawl=True) == (10, [])
+    assert site.requests == [(1, num) for num in range(1, 12)]
+
+def test_known_ver_with_gaps_keeps_the_lookahead(monkeypatch, tmp_path):
+    site, discovery = make_discovery(monkeypatch, make_manifest(tmp_path, [(1, 10, [[4, 4]])]))
+    assert discovery.find_ver_range('BS', 2024, 1, crawl=True) == (10, [])
+    assert site.requests[-2:] == [(1, 12), (1, 13)]
+
+def test_known_ver_is_walked_up_to_its_last_num(monkeypatch, tmp_path):
+    # Num 6..7 of ver 3 are holes, but the manifest says the ver goes up to 9
+    site, discovery = make_discovery(monkeypatch, make_manifest(tmp_path, [(3, 9, [])]))
+    last, gaps = discovery.find_ver_range('BS', 2024, 3, crawl=True)
+    assert last == 9
+    discovery.crawl_ver('BS', 2024, 3, last, gaps)
+    assert gaps == [[6, 7]]
+
+def test_known_vers_are_not_probed(monkeypatch, tmp_path):
+    site, discovery = make_discovery(monkeypatch, make_manifest(tmp_path, [(1, 10, []), (3, 9, [[6, 7]])]))
+    assert discovery.find_vers('BS', 2024) == [1, 3]
+    assert (1, 1) not in site.requests and (3, 1) not in site.requests
+
+def test_results_are_dropped_once_consumed(monkeypatch):
+    site, discovery = make_discovery(monkeypatch)
+    vers = discovery.find_vers('BS', 2024)
+    assert list(discovery.results) == [('BS', 2024, ver) for ver in vers]
+
+    for ver in vers:
+        last, gaps = discovery.find_ver_range('BS', 2024, ver, crawl=True)
+        discovery.crawl_ver('BS', 2024, ver, last, gaps)
+    assert discovery.results == {}
+
+def test_past_year_is_closed_once_a_later_year_is_known(tmp_path):
+    manifest = make_manifest(tmp_path, [(1, 10, [])])
+    manifest.update('BS', 2025, 1, 5, 5, [], {}, '')
+    manifest.update('BS', 0, 1, 5, 5, [], {}, '')
+    assert manifest.is_closed_year('BS', 2024)
+    assert not manifest.is_closed_year('BS', 2025)
+    assert not manifest.is_closed_year('BS', 0)
+    assert not manifest.is_closed_year('ST', 2024)
@@ -0,0 +1,40 @@
+import pytest
+
+import do_scraping
+import fixture_pages
+import compare_parser_backends
+
+PAGES = fixture_pages.load_pages()
+
+def parse_all(url, backends=compare_parser_backends.BACKENDS):
+    html = PAGES[url]
+    return [do_scraping.parse_ptcg_kr(html, url, backend) for backend in backends]
+
+@pytest.mark.parametrize('url', list(PAGES), ids=lambda url: url[len(do_scraping.URL_HEAD):])
+def test_backends_give_the_same_record(url):
+    results = parse_all(url)
+    dumps = [compare_parser_backends.dump_result(result) for result in results]
+    assert dumps[1:] == dumps[:1] * (len(dumps) - 1)
+
+def test_compare_backends_over_fixtures():
+    pages, mismatch_urls, parse_times = compare_parser_backends.compare_backends(PAGES.items())
+    assert pages == len(PAGES)
+    assert mismatch_urls == []
+    assert set(parse_times) == set(compare_parser_backends.BACKENDS)
+
+def test_fixtures_cover_every_supertype_and_era():
+    supertypes = set()
+    regulation_marks = set()
+    states = []
+    for url in PAGES:
+        data, state = parse_all(url, ['bs4'])[0]
+        states.append(state)
+        if state == "success" and 'regulationMark' in data:
+            supertypes.add(data['supertype'])
+            regulation_marks.add(data['regulationMark'])
+
+    assert supertypes == {'포켓몬', '트레이너스', '에너지'}
+    assert {'DP', 'BW', 'XY'} <= regulation_marks
+    # SM (C, D), S (E, F), SV (H)
+    assert {'C', 'D', 'E', 'F', 'H'} <= regulation_marks
+    assert states.count("fail") == 1